@@ -20,6 +20,7 @@ from ecl.baremetal.v2 import stock as _stock
 from ecl.baremetal.v2 import nic_physical_port as _port
 from ecl.baremetal.v2 import server as _server
 from ecl.baremetal import version as _version
+from ecl import flavor_catalog
 from ecl import proxy2
 from ecl import session
 
@@ -56,7 +57,7 @@ class VersionSession(session.Session):
         return sc_endpoint
 
 
-class Proxy(proxy2.BaseProxy):
+class Proxy(proxy2.BaseProxy, flavor_catalog.FlavorCatalogMixin):
     def availability_zones(self):
         """Return a list of availability zones for baremetal servers
 
@@ -11,7 +11,6 @@
 # under the License.
 
 from ecl.baremetal import baremetal_service
-from ecl import exceptions
 from ecl import resource2
 
 
@@ -127,13 +126,14 @@ class ServerDetail(Server):
     allow_list = True
 
 
-
 class ServerAction(resource2.Resource):
     resource_key = "console"
     resources_key = None
     base_path = '/servers/%s/action'
     service = baremetal_service.BaremetalService()
 
+    find_by_id = False
+
     # Properties
     #: Type of the remote console. Valid values are IPMI or IMM.
     type = resource2.Body('type')
@@ -225,41 +225,3 @@ class ServerAction(resource2.Resource):
         )
         self._translate_response(resp, has_body=True)
         return self
-
-    @classmethod
-    def find(cls, session, name_or_id, ignore_missing=False, **params):
-        """Find a resource by its name or id.
-
-        :param session: The session to use for making this request.
-        :type session: :class:`~ecl.session.Session`
-        :param name_or_id: This resource's identifier, if needed by
-                           the request. The default is ``None``.
-        :param bool ignore_missing: When set to ``False``
-                    :class:`~ecl.exceptions.ResourceNotFound` will be
-                    raised when the resource does not exist.
-                    When set to ``True``, None will be returned when
-                    attempting to find a nonexistent resource.
-        :param dict params: Any additional parameters to be passed into
-                            underlying methods, such as to
-                            :meth:`~ecl.resource2.Resource.existing`
-                            in order to pass on URI parameters.
-
-        :return: The :class:`Resource` object matching the given name or id
-                 or None if nothing matches.
-        :raises: :class:`ecl.exceptions.DuplicateResource` if more
-                 than one resource is found for this request.
-        :raises: :class:`ecl.exceptions.ResourceNotFound` if nothing
-                 is found and ignore_missing is ``False``.
-        """
-        # Try to short-circuit by looking directly for a matching ID.
-
-        data = cls.list(session, **params)
-
-        result = cls._get_one_match(name_or_id, data)
-        if result is not None:
-            return result
-
-        if ignore_missing:
-            return None
-        raise exceptions.ResourceNotFound(
-            "No %s found for %s" % (cls.__name__, name_or_id))
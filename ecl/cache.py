@@ -0,0 +1,249 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Caches used to avoid repeating API calls whose answers rarely change,
+such as name lookups, or never change, such as usage of past periods.
+"""
+
+import collections
+import copy
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+#: A clock that is not affected by changes to the system time, where the
+#: running Python offers one.
+_clock = getattr(time, "monotonic", time.time)
+
+
+class TTLCache(object):
+    """A thread-safe mapping whose entries expire after a fixed time.
+
+    :param float ttl: The number of seconds an entry stays valid.
+    :param clock: A callable returning the current time in seconds.
+                  It exists so tests can control expiry.
+    """
+
+    def __init__(self, ttl, clock=_clock):
+        self.ttl = ttl
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= self._clock():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        """Store value for key, resetting its expiry"""
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+
+    def pop(self, key, default=None):
+        """Remove key and return its value, or default if it is missing"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        marker = object()
+        return self.get(key, marker) is not marker
+
+    def __len__(self):
+        with self._lock:
+            now = self._clock()
+            return sum(1 for expires, _ in self._data.values()
+                       if expires > now)
+
+
+class ResourceIndex(object):
+    """Resources remembered by ID and by name from API responses.
+
+    Entries are grouped into scopes, which are any hashable values, so
+    that resources of different types or under different parent URIs
+    never shadow each other. A name only resolves while exactly one
+    unexpired resource in the scope is known by it; anything ambiguous
+    is left to the API to decide.
+
+    Expired entries are dropped whenever an entry is added, and beyond
+    ``max_size`` entries the oldest ones are dropped as well.
+
+    :param float ttl: The number of seconds an entry stays valid.
+    :param int max_size: The most entries kept, or ``None`` for no limit.
+    :param clock: A callable returning the current time in seconds.
+                  It exists so tests can control expiry.
+    """
+
+    def __init__(self, ttl, max_size=None, clock=_clock):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        # scope -> ({id: (expires, name, attrs)}, {name: set of ids})
+        self._scopes = {}
+        # (scope, id) -> expires, oldest first. Every entry lives for the
+        # same ttl, so this is also the order entries expire in.
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, scope, id):
+        ids, names = self._scopes[scope]
+        expires, name, attrs = ids.pop(id)
+        self._entries.pop((scope, id), None)
+        if name in names:
+            names[name].discard(id)
+            if not names[name]:
+                del names[name]
+        if not ids:
+            del self._scopes[scope]
+
+    def _prune(self, now):
+        while self._entries:
+            scope, id = next(iter(self._entries))
+            expires = self._entries[(scope, id)]
+            if (expires > now and (self.max_size is None or
+                                   len(self._entries) <= self.max_size)):
+                return
+            self._discard(scope, id)
+
+    def add(self, scope, id, name, attrs):
+        """Remember a resource
+
+        :param scope: The scope the resource belongs to.
+        :param id: The ID of the resource. Nothing is stored when it
+                   is ``None``.
+        :param name: The name of the resource, or ``None``.
+        :param dict attrs: The attributes of the resource. A copy is kept.
+        """
+        if id is None:
+            return
+        attrs = copy.deepcopy(attrs)
+        with self._lock:
+            now = self._clock()
+            if scope in self._scopes and id in self._scopes[scope][0]:
+                self._discard(scope, id)
+            ids, names = self._scopes.setdefault(scope, ({}, {}))
+            ids[id] = (now + self.ttl, name, attrs)
+            self._entries[(scope, id)] = now + self.ttl
+            if name is not None:
+                names.setdefault(name, set()).add(id)
+            self._prune(now)
+
+    def lookup(self, scope, name_or_id):
+        """Return a copy of the attributes known for ``name_or_id``
+
+        :param scope: The scope to look in.
+        :param name_or_id: The ID or name of a resource.
+
+        :return: A dict of attributes, or ``None`` when the value is
+                 unknown, expired or ambiguous.
+        """
+        with self._lock:
+            if scope not in self._scopes:
+                return None
+            ids, names = self._scopes[scope]
+            now = self._clock()
+            candidates = set(names.get(name_or_id, ()))
+            if name_or_id in ids:
+                candidates.add(name_or_id)
+
+            found = []
+            for id in candidates:
+                expires, name, attrs = ids[id]
+                if expires <= now:
+                    self._discard(scope, id)
+                else:
+                    found.append(attrs)
+
+            if len(found) != 1:
+                return None
+            return copy.deepcopy(found[0])
+
+    def invalidate(self, predicate=None):
+        """Forget whole scopes
+
+        :param predicate: A callable given each scope that returns ``True``
+                          for those to forget. Every scope is forgotten
+                          when it is ``None``.
+        """
+        with self._lock:
+            for scope in list(self._scopes):
+                if predicate is None or predicate(scope):
+                    for id in list(self._scopes[scope][0]):
+                        self._discard(scope, id)
+
+
+class DiskCache(object):
+    """JSON documents kept as files in a directory.
+
+    It is meant for answers that never change once known, so entries do
+    not expire. Unreadable entries are treated as missing.
+
+    :param str path: The directory to keep the files in. It is created
+                     when the first entry is stored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, digest + ".json")
+
+    def get(self, key, default=None):
+        """Return the value stored for key, or default"""
+        try:
+            with open(self._file(key)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return default
+
+    def set(self, key, value):
+        """Store a JSON serializable value for key"""
+        try:
+            os.makedirs(self.path)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        # Write to a temporary file first so readers never see a
+        # partially written entry.
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            if os.name == "nt" and os.path.exists(self._file(key)):
+                os.remove(self._file(key))
+            os.rename(tmp, self._file(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
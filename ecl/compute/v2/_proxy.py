@@ -10,10 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+import time
+
+from concurrent import futures
+
 from ecl.compute.v2 import availability_zone as _availability_zone
 from ecl.compute.v2 import extension
 from ecl.compute.v2 import flavor as _flavor
 from ecl.compute.v2 import image as _image
+from ecl.compute.v2 import inventory as _inventory
 from ecl.compute.v2 import keypair as _keypair
 from ecl.compute.v2 import limits
 from ecl.compute.v2 import server as _server
@@ -21,13 +27,31 @@ from ecl.compute.v2 import server_action as _server_action
 from ecl.compute.v2 import server_interface as _server_interface
 from ecl.compute.v2 import server_volume as _server_volume
 from ecl.compute.v2 import quota as _quota
+from ecl.compute.v2 import usage as _usage
 from ecl.compute.v2 import volume as _volume
 
+from ecl import cache
+from ecl import exceptions
+from ecl import flavor_catalog
+from ecl import parallel
 from ecl import proxy2
 from ecl import resource2
 
 
-class Proxy(proxy2.BaseProxy):
+class Proxy(proxy2.BaseProxy, flavor_catalog.FlavorCatalogMixin):
+
+    #: Actions :meth:`batch_action` can take, mapped to the
+    #: :class:`~ecl.compute.v2.server.Server` method that takes them and
+    #: the status a server settles in afterwards, or ``None`` when it
+    #: goes away.
+    _batch_actions = {
+        "start": ("start", "ACTIVE"),
+        "stop": ("stop", "SHUTOFF"),
+        "reboot": ("reboot", "ACTIVE"),
+        "resize": ("resize", "VERIFY_RESIZE"),
+        "rebuild": ("rebuild", "ACTIVE"),
+        "force_delete": ("force_delete", None),
+    }
 
     def servers(self, details=True, **query):
         """Retrieve a list of servers
@@ -53,6 +77,90 @@ class Proxy(proxy2.BaseProxy):
         srv = _server.ServerDetail if details else _server.Server
         return list(self._list(srv, paginated=True, **query))
 
+    def server_inventory(self, **query):
+        """Return a local map of servers that refreshes incrementally
+
+        The first :meth:`~ecl.sync.DeltaSync.refresh` lists every server.
+        Later ones only list servers changed since the previous refresh,
+        using ``changes-since``, and drop those that were deleted.
+
+        :param kwargs \*\*query: Optional ``status`` or
+            ``reservation_id`` to limit the servers being tracked. Other
+            filters of :meth:`servers` can stop matching a server without
+            it showing up in a delta, so they are refused.
+        :returns: A :class:`~ecl.compute.v2.inventory.ServerInventory`
+                  that has not been refreshed yet.
+        :raises: ``ValueError`` for other query parameters.
+        """
+        return _inventory.ServerInventory(self.session, **query)
+
+    def inventory(self, concurrency=parallel.DEFAULT_CONCURRENCY, **query):
+        """Stream servers joined with their flavor, image and attachments
+
+        Server details are listed once. Each distinct flavor and image is
+        then fetched once, and the interfaces and volumes of the servers
+        are fetched concurrently. Metadata comes with the server details.
+
+        :param int concurrency: The maximum number of requests in flight.
+        :param kwargs \*\*query: Optional query parameters, as accepted by
+                                 :meth:`servers`.
+        :returns: A generator of
+                  :class:`~ecl.compute.v2.inventory.ServerRecord`, in the
+                  order their lookups complete.
+        """
+        servers = self.servers(details=True, **query)
+
+        def ref_id(ref):
+            return ref.get("id") if isinstance(ref, dict) else None
+
+        flavors, flavor_errors = self._get_each(
+            self.get_flavor, [ref_id(srv.flavor) for srv in servers],
+            concurrency)
+        images, image_errors = self._get_each(
+            self.get_image, [ref_id(srv.image) for srv in servers],
+            concurrency)
+
+        def describe(server):
+            errors = {}
+            flavor_id, image_id = ref_id(server.flavor), ref_id(server.image)
+            if flavor_id in flavor_errors:
+                errors["flavor"] = flavor_errors[flavor_id]
+            if image_id in image_errors:
+                errors["image"] = image_errors[image_id]
+            attached = {}
+            for name, fetch in (("interfaces", self.server_interfaces),
+                                ("volumes", self.server_volumes)):
+                try:
+                    attached[name] = fetch(server)
+                except exceptions.SDKException as e:
+                    attached[name] = None
+                    errors[name] = e
+            return _inventory.ServerRecord(
+                server, flavors.get(flavor_id), images.get(image_id),
+                attached["interfaces"], attached["volumes"], errors)
+
+        for outcome in parallel.iter_completed(describe, servers,
+                                               concurrency):
+            if outcome.exception is not None:
+                raise outcome.exception
+            yield outcome.result
+
+    def _get_each(self, get, ids, concurrency):
+        """Get each distinct ID once
+
+        :returns: A dict of the resources found by ID and a dict of the
+                  errors by ID. IDs that no longer exist are in neither.
+        """
+        found, errors = {}, {}
+        ids = set(id for id in ids if id)
+        for outcome in parallel.run(get, ids, concurrency):
+            if outcome.exception is None:
+                found[outcome.item] = outcome.result
+            elif not isinstance(outcome.exception,
+                                exceptions.NotFoundException):
+                errors[outcome.item] = outcome.exception
+        return found, errors
+
     def create_server(self, flavor_id, name, disk_config=None, image_id=None,
                       min_count=None, max_count=None, availability_zone=None,
                       config_drive=None, key_name=None, user_data=None,
@@ -116,6 +224,168 @@ class Proxy(proxy2.BaseProxy):
             attrs.update({"admin_pass": admin_pass})
         return self._create(_server.Server, **attrs)
 
+    def check_server_quota(self, specs):
+        """Check that there is quota left to create servers
+
+        :param specs: An iterable of dicts of :meth:`create_server`
+                      arguments, one per server.
+        :returns: ``None``
+        :raises: :class:`~ecl.exceptions.QuotaExceeded` when the servers
+                 would exceed the instance, core or RAM limits.
+        """
+        specs = list(specs)
+        flavors = {}
+        for spec in specs:
+            flavor_id = spec["flavor_id"]
+            if flavor_id not in flavors:
+                flavors[flavor_id] = self.get_flavor(flavor_id)
+
+        needed = {
+            "instances": len(specs),
+            "cores": sum(flavors[spec["flavor_id"]].vcpus or 0
+                         for spec in specs),
+            "ram": sum(flavors[spec["flavor_id"]].ram or 0
+                       for spec in specs),
+        }
+        absolute = self.get_limits().absolute
+        short = []
+        for name in sorted(needed):
+            limit = getattr(absolute, name)
+            if limit is None or limit < 0:
+                continue
+            left = limit - (getattr(absolute, name + "_used") or 0)
+            if needed[name] > left:
+                short.append("%s (%d needed, %d left)" %
+                             (name, needed[name], left))
+        if short:
+            raise exceptions.QuotaExceeded(
+                "Not enough quota to create %d servers: %s" %
+                (len(specs), ", ".join(short)))
+
+    def create_servers(self, specs, concurrency=parallel.DEFAULT_CONCURRENCY,
+                       wait=True, check_quota=True, interval=5, timeout=1800):
+        """Create many servers and stream their progress
+
+        Quota is checked before anything is created. Identical requests
+        are made as one create with ``min_count`` and ``max_count``, the
+        others are created concurrently. Servers are then waited on with
+        a single listing per poll, and volumes and interfaces are attached
+        to each server as soon as it is ``ACTIVE``.
+
+        :param specs: An iterable of dicts, one per server, holding the
+            arguments of :meth:`create_server`. A dict may also hold
+            ``volumes``, a list of volume IDs or of dicts with
+            ``volume_id`` and ``device``, and ``interfaces``, a list of
+            dicts of :meth:`create_server_interface` arguments.
+        :param int concurrency: The maximum number of requests in flight.
+        :param bool wait: Wait for the servers to become ``ACTIVE`` and
+                          attach their volumes and interfaces.
+        :param bool check_quota: Check quota before creating anything.
+        :param interval: Number of seconds to wait between polls.
+        :param timeout: Maximum number of seconds to wait for the servers.
+
+        :returns: A generator of
+                  :class:`~ecl.compute.v2.server.ProvisionEvent`. Servers
+                  are only created as it is consumed.
+        :raises: :class:`~ecl.exceptions.QuotaExceeded` before anything
+                 is created when quota is short.
+        """
+        specs = [dict(spec) for spec in specs]
+        attachments = [(spec.pop("volumes", None) or [],
+                        spec.pop("interfaces", None) or [])
+                       for spec in specs]
+        if check_quota and specs:
+            self.check_server_quota(specs)
+        return self._provision(specs, attachments, concurrency, wait,
+                               interval, timeout)
+
+    def _provision(self, specs, attachments, concurrency, wait, interval,
+                   timeout):
+        # Requests that are the same apart from attachments can be made
+        # as a single create.
+        groups = []
+        for index, spec in enumerate(specs):
+            for group_spec, indexes in groups:
+                if group_spec == spec and not attachments[index][0]:
+                    indexes.append(index)
+                    break
+            else:
+                groups.append((spec, [index]))
+
+        def create(group):
+            spec, indexes = group
+            if len(indexes) == 1:
+                return [self.create_server(**spec)]
+            res = self.create_server(min_count=len(indexes),
+                                     max_count=len(indexes),
+                                     return_reservation_id=True, **spec)
+            servers = []
+            if res.reservation_id is not None:
+                servers = list(self._list(_server.ServerDetail,
+                                          paginated=True,
+                                          reservation_id=res.reservation_id))
+            if len(servers) != len(indexes):
+                raise exceptions.ResourceFailure(
+                    "Expected %d servers from reservation %s, found %d" %
+                    (len(indexes), res.reservation_id, len(servers)))
+            return servers
+
+        created = []
+        for outcome in parallel.iter_completed(create, groups, concurrency):
+            indexes = outcome.item[1]
+            if outcome.exception is not None:
+                for index in indexes:
+                    yield _server.ProvisionEvent("failed", index, None,
+                                                 outcome.exception)
+                continue
+            for index, server in zip(indexes, outcome.result):
+                created.append((index, server))
+                yield _server.ProvisionEvent("created", index, server, None)
+
+        if not wait or not created:
+            return
+
+        index_of = dict((server.id, index) for index, server in created)
+
+        def attach(item):
+            index, server = item
+            volumes, interfaces = attachments[index]
+            for volume in volumes:
+                if not isinstance(volume, dict):
+                    volume = {"volume_id": volume}
+                self.create_server_volume(server, **volume)
+            for interface in interfaces:
+                self.create_server_interface(server, **interface)
+            return server
+
+        def attached(future):
+            index, server = pending.pop(future)
+            error = future.exception()
+            if error is not None:
+                return _server.ProvisionEvent("failed", index, server, error)
+            return _server.ProvisionEvent("attached", index, server, None)
+
+        servers = [server for _, server in created]
+        pending = {}
+        with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for outcome in self._iter_settled(servers, "ACTIVE", ["ERROR"],
+                                              interval, timeout):
+                index = index_of[outcome.item.id]
+                server = outcome.result or outcome.item
+                if outcome.exception is not None:
+                    yield _server.ProvisionEvent("failed", index, server,
+                                                 outcome.exception)
+                    continue
+                yield _server.ProvisionEvent("active", index, server, None)
+                if any(attachments[index]):
+                    future = executor.submit(attach, (index, server))
+                    pending[future] = (index, server)
+                for future in [f for f in list(pending) if f.done()]:
+                    yield attached(future)
+
+            for future in futures.as_completed(list(pending)):
+                yield attached(future)
+
     def delete_server(self, server, ignore_missing=False, force=False):
         """Delete a server
 
@@ -182,6 +452,137 @@ class Proxy(proxy2.BaseProxy):
         return resource2.wait_for_status(self.session, server, status,
                                          failures, interval, wait)
 
+    def wait_for_servers(self, servers, status='ACTIVE', failures=['ERROR'],
+                         interval=2, wait=120):
+        """Wait for many servers to reach a status
+
+        Every poll is a single listing of server details, however many
+        servers are being waited on. A server has reached the status once
+        no task is in progress on it any more.
+
+        :param servers: An iterable of server IDs or
+                        :class:`~ecl.compute.v2.server.Server` instances.
+        :param status: The status to wait for, or ``None`` to wait for the
+                       servers to be deleted.
+        :param list failures: Statuses that mean a server will not reach
+                              ``status``.
+        :param interval: Number of seconds to wait between polls.
+        :param wait: Maximum number of seconds to wait.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per server
+                  in the order given. The result is the
+                  :class:`~ecl.compute.v2.server.ServerDetail`, or ``None``
+                  for a deleted server. The exception is a
+                  :class:`~ecl.exceptions.ResourceFailure`,
+                  :class:`~ecl.exceptions.ResourceNotFound` or
+                  :class:`~ecl.exceptions.ResourceTimeout` when the server
+                  did not reach the status.
+        """
+        servers = list(servers)
+        done = dict((resource2.Resource._get_id(outcome.item), outcome)
+                    for outcome in self._iter_settled(servers, status,
+                                                      failures, interval,
+                                                      wait))
+        return [done[resource2.Resource._get_id(server)]
+                for server in servers]
+
+    def _iter_settled(self, servers, status, failures, interval, wait):
+        """Yield an Outcome for each server as soon as it settles
+
+        See :meth:`wait_for_servers` for the arguments and outcomes.
+        """
+        pending = dict((resource2.Resource._get_id(server), server)
+                       for server in servers)
+        total_sleep = 0
+
+        while pending:
+            current = dict((server.id, server) for server in
+                           self._list(_server.ServerDetail, paginated=True))
+            for server_id, item in list(pending.items()):
+                server = current.get(server_id)
+                if server is None:
+                    error = None
+                    if status is not None:
+                        error = exceptions.ResourceNotFound(
+                            "Server %s no longer exists" % server_id)
+                    outcome = parallel.Outcome(item, None, error)
+                elif server.status in failures:
+                    error = exceptions.ResourceFailure(
+                        "Server %s transitioned to failure state %s" %
+                        (server_id, server.status))
+                    outcome = parallel.Outcome(item, server, error)
+                elif server.status == status and not server.task_state:
+                    outcome = parallel.Outcome(item, server, None)
+                else:
+                    continue
+                del pending[server_id]
+                yield outcome
+
+            if not pending or total_sleep >= wait:
+                break
+            time.sleep(interval)
+            total_sleep += interval
+
+        for server_id, item in pending.items():
+            error = exceptions.ResourceTimeout(
+                "Timeout waiting for %s to transition to %s" %
+                (server_id, status))
+            yield parallel.Outcome(item, None, error)
+
+    def batch_action(self, servers, action,
+                     concurrency=parallel.DEFAULT_CONCURRENCY, wait=True,
+                     rate=None, interval=2, timeout=600, **args):
+        """Take the same action on many servers
+
+        The actions are sent concurrently. With ``wait``, every server is
+        then waited on with :meth:`wait_for_servers`, which makes a single
+        listing per poll.
+
+        :param servers: An iterable of server IDs or
+                        :class:`~ecl.compute.v2.server.Server` instances.
+        :param string action: One of ``start``, ``stop``, ``reboot``,
+                              ``resize``, ``rebuild`` or ``force_delete``.
+        :param int concurrency: The maximum number of actions in flight.
+        :param bool wait: Wait for the servers to settle after the action.
+        :param float rate: The maximum number of actions sent per second,
+                           or ``None`` for no limit.
+        :param interval: Number of seconds to wait between polls.
+        :param timeout: Maximum number of seconds to wait for the servers.
+        :param kwargs args: Arguments of the action, e.g. ``reboot_type``
+            for ``reboot``, ``flavor`` for ``resize`` or ``name`` and
+            ``admin_password`` for ``rebuild``.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per server
+                  in the order given. The exception is the error sending
+                  the action or, when waiting, the error from
+                  :meth:`wait_for_servers`.
+        :raises: ``ValueError`` for an unknown action.
+        """
+        try:
+            method, status = self._batch_actions[action]
+        except KeyError:
+            raise ValueError("Unsupported action %s, expected one of %s" %
+                             (action, ", ".join(sorted(self._batch_actions))))
+        limiter = parallel.RateLimiter(rate) if rate else None
+
+        def act(server):
+            if limiter is not None:
+                limiter.wait()
+            res = self._get_resource(_server.Server, server)
+            getattr(res, method)(self.session, **args)
+            return res
+
+        outcomes = parallel.run(act, servers, concurrency)
+        if not wait:
+            return outcomes
+
+        sent = [outcome.item for outcome in outcomes
+                if outcome.exception is None]
+        waited = iter(self.wait_for_servers(sent, status=status,
+                                            interval=interval, wait=timeout))
+        return [next(waited) if outcome.exception is None else outcome
+                for outcome in outcomes]
+
     def create_image_from_server(self, server, name, metadata=None):
         """Create image from a certain server
 
@@ -746,6 +1147,33 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._get(_quota.TenantUsage, tenant_id)
 
+    def aggregate_tenant_usage(self, tenant_ids, start, end,
+                               window=datetime.timedelta(days=1),
+                               cache_dir=None,
+                               concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Aggregate server-hours of tenants over a period of any length
+
+        The period is split into windows of ``window`` each, and the usage
+        of every tenant in every window is fetched concurrently. Windows
+        that have already ended never change, so when ``cache_dir`` is
+        given they are kept there and not requested again.
+
+        :param tenant_ids: An iterable of tenant IDs.
+        :param datetime.datetime start: The start of the period, in UTC.
+        :param datetime.datetime end: The end of the period, in UTC.
+        :param datetime.timedelta window: The length of each request.
+        :param str cache_dir: A directory to cache ended windows in.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: :class:`~ecl.compute.v2.usage.UsageColumns` with the
+                  server-hours of each window, tenant and flavor.
+        :raises: The first exception raised fetching any window.
+        """
+        disk_cache = cache.DiskCache(cache_dir) if cache_dir else None
+        return _usage.aggregate(self.session, tenant_ids, start, end,
+                                step=window, cache=disk_cache,
+                                concurrency=concurrency)
+
     def volumes(self, details=True):
         """Return a list of volumes
 
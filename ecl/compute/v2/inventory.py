@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+
+from ecl.compute.v2 import server as _server
+from ecl import sync
+
+#: A server joined with the resources it uses, as produced by
+#: :meth:`~ecl.compute.v2._proxy.Proxy.inventory`. ``server`` is the
+#: :class:`~ecl.compute.v2.server.ServerDetail`, ``flavor`` and ``image``
+#: are the flavor and image it was created from, or ``None`` when unknown,
+#: ``interfaces`` and ``volumes`` are lists, and ``errors`` maps the name
+#: of any of these fields that could not be fetched to the exception.
+ServerRecord = collections.namedtuple(
+    "ServerRecord",
+    ["server", "flavor", "image", "interfaces", "volumes", "errors"])
+
+
+#: Query parameters that never change for a server, so they can be sent
+#: along with ``changes_since``.
+FIXED_FILTERS = ("reservation_id",)
+
+
+class ServerInventory(sync.DeltaSync):
+    """A local map of server details kept current with ``changes-since``.
+
+    After the first full listing only servers that changed since the
+    latest ``updated`` timestamp seen are requested, so a refresh costs
+    in proportion to how much changed rather than to the fleet size.
+    Servers reported as ``DELETED`` are dropped from the map.
+
+    A delta only holds servers that match its filters now, so a server
+    leaving a filter would never be reported. ``status`` is therefore
+    matched locally over the whole delta, dropping servers that no longer
+    have it, and other filters a server can change are refused.
+
+    :param session: The session to use for making requests.
+    :type session: :class:`~ecl.session.Session`
+    :param str status: Only track servers with this status.
+    :param dict query: Optional query parameters in
+                       :data:`FIXED_FILTERS` to limit the servers tracked.
+    :raises: ``ValueError`` for any other query parameter.
+    """
+
+    def __init__(self, session, status=None, **query):
+        unsupported = sorted(set(query) - set(FIXED_FILTERS))
+        if unsupported:
+            raise ValueError("Servers can change %s, which cannot be "
+                             "tracked incrementally" % ", ".join(unsupported))
+        self.session = session
+        self.status = status
+        self.query = query
+        super(ServerInventory, self).__init__(
+            self._list_changes,
+            key=lambda server: server.id,
+            changed_at=lambda server: server.updated_at,
+            is_deleted=self._is_gone)
+
+    def _is_gone(self, server):
+        if server.status == "DELETED":
+            return True
+        return self.status is not None and server.status != self.status
+
+    def _list_changes(self, since):
+        query = dict(self.query)
+        if since is not None:
+            query["changes_since"] = since
+        return _server.ServerDetail.list(self.session, paginated=True,
+                                         **query)
@@ -57,6 +57,10 @@ class DefaultQuota(resource2.Resource):
         return super(DefaultQuota, self).get(session, False)
 
 
+#: The format of the ``start`` and ``end`` of a usage period.
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
 class TenantUsage(resource2.Resource):
     resource_key = "tenant_usage"
     resources_key = "tenant_usages"
@@ -73,3 +77,26 @@ class TenantUsage(resource2.Resource):
     total_local_gb_usage = resource2.Body("total_local_gb_usage")
     total_memory_mb_usage = resource2.Body("total_memory_mb_usage")
     total_vcpus_usage = resource2.Body("total_vcpus_usage")
+
+    def get(self, session, requires_id=True, start=None, end=None):
+        """Get the usage of the tenant, optionally within a period.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param boolean requires_id: A boolean indicating whether resource ID
+                                    should be part of the requested URI.
+        :param datetime.datetime start: The start of the period, in UTC.
+        :param datetime.datetime end: The end of the period, in UTC.
+        :return: This :class:`Resource` instance.
+        """
+        params = {}
+        if start is not None:
+            params["start"] = start.strftime(TIME_FORMAT)
+        if end is not None:
+            params["end"] = end.strftime(TIME_FORMAT)
+
+        request = self._prepare_request(requires_id=requires_id)
+        response = session.get(request.uri, endpoint_filter=self.service,
+                               params=params)
+        self._translate_response(response)
+        return self
@@ -10,13 +10,23 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
 from ecl.compute import compute_service
 from ecl.compute.v2 import metadata as _metadata
-from ecl import exceptions
 from ecl import resource2
 from ecl import utils
 
 
+#: A step in provisioning one of the servers requested from
+#: :meth:`~ecl.compute.v2._proxy.Proxy.create_servers`. ``stage`` is one of
+#: ``created``, ``active``, ``attached`` or ``failed``, ``index`` is the
+#: position of the request, ``server`` is the server once known and
+#: ``error`` is the exception behind a ``failed`` stage.
+ProvisionEvent = collections.namedtuple(
+    "ProvisionEvent", ["stage", "index", "server", "error"])
+
+
 class Server(resource2.Resource, _metadata.MetadataMixin):
     resource_key = 'server'
     resources_key = 'servers'
@@ -29,9 +39,11 @@ class Server(resource2.Resource, _metadata.MetadataMixin):
     allow_update = True
     allow_delete = True
     allow_list = True
+    find_by_id = "uuid"
 
     _query_mapping = resource2.QueryParameters("image", "flavor", "name",
                                                "status", "host",
+                                               "reservation_id",
                                                changes_since="changes-since")
 
     #: IPv4 Address
@@ -137,6 +149,12 @@ class Server(resource2.Resource, _metadata.MetadataMixin):
     min_count = resource2.Body('min_count')
     #: Requested maximum count of instance
     max_count = resource2.Body('max_count')
+    #: Ask for the reservation ID instead of the server when creating
+    #: several servers at once.
+    return_reservation_id = resource2.Body('return_reservation_id')
+    #: The ID of the reservation that created the server, shared by the
+    #: servers created by one request.
+    reservation_id = resource2.Body('reservation_id')
 
     def create(self, session, prepend_key=True):
         """Create a remote resource based on this instance.
@@ -273,44 +291,6 @@ class Server(resource2.Resource, _metadata.MetadataMixin):
         body = {"removeSecurityGroup": {"name": security_group}}
         self._action(session, body)
 
-    @classmethod
-    def find(cls, session, name_or_id, ignore_missing=False, **params):
-        """Find a resource by its name or id.
-
-        :param session: The session to use for making this request.
-        :type session: :class:`~ecl.session.Session`
-        :param name_or_id: This resource's identifier, if needed by
-                           the request. The default is ``None``.
-        :param bool ignore_missing: When set to ``False``
-                    :class:`~ecl.exceptions.ResourceNotFound` will be
-                    raised when the resource does not exist.
-                    When set to ``True``, None will be returned when
-                    attempting to find a nonexistent resource.
-        :param dict params: Any additional parameters to be passed into
-                            underlying methods, such as to
-                            :meth:`~ecl.resource2.Resource.existing`
-                            in order to pass on URI parameters.
-
-        :return: The :class:`Resource` object matching the given name or id
-                 or None if nothing matches.
-        :raises: :class:`ecl.exceptions.DuplicateResource` if more
-                 than one resource is found for this request.
-        :raises: :class:`ecl.exceptions.ResourceNotFound` if nothing
-                 is found and ignore_missing is ``False``.
-        """
-        # Try to short-circuit by looking directly for a matching ID.
-
-        data = cls.list(session, **params)
-
-        result = cls._get_one_match(name_or_id, data)
-        if result is not None:
-            return result
-
-        if ignore_missing:
-            return None
-        raise exceptions.ResourceNotFound(
-            "No %s found for %s" % (cls.__name__, name_or_id))
-
 
 class ServerDetail(Server):
     base_path = '/servers/detail'
@@ -0,0 +1,118 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Server usage of tenants aggregated over long periods.
+"""
+
+import array
+import collections
+import datetime
+import itertools
+
+from ecl.compute.v2 import quota as _quota
+from ecl import parallel
+
+#: Server-hours in columns, one row per window, tenant and flavor.
+#: ``start`` and ``tenant_id`` and ``flavor`` are lists, ``hours`` is an
+#: ``array.array`` of floats.
+UsageColumns = collections.namedtuple(
+    "UsageColumns", ["start", "tenant_id", "flavor", "hours"])
+
+
+def windows(start, end, step):
+    """Split a period into consecutive windows
+
+    :param datetime.datetime start: The start of the period.
+    :param datetime.datetime end: The end of the period.
+    :param datetime.timedelta step: The length of each window. The last
+                                    window is cut short at ``end``.
+    :returns: A list of ``(start, end)`` tuples.
+    """
+    if step <= datetime.timedelta(0):
+        raise ValueError("step must be positive")
+    result = []
+    while start < end:
+        stop = min(start + step, end)
+        result.append((start, stop))
+        start = stop
+    return result
+
+
+def hours_by_flavor(usage):
+    """Sum the hours of a :class:`~ecl.compute.v2.quota.TenantUsage` by flavor
+
+    :returns: A dict of hours keyed by flavor name.
+    """
+    hours = collections.defaultdict(float)
+    for server in usage.server_usages or []:
+        hours[server.get("flavor")] += server.get("hours") or 0
+    return dict(hours)
+
+
+def aggregate(session, tenant_ids, start, end,
+              step=datetime.timedelta(days=1), cache=None,
+              concurrency=parallel.DEFAULT_CONCURRENCY, now=None):
+    """Aggregate server-hours by tenant, flavor and window
+
+    Every tenant and window is fetched concurrently. Windows that ended
+    before ``now`` cannot change any more, so they are read from and
+    written to ``cache`` when one is given.
+
+    :param session: The session to use for making requests.
+    :type session: :class:`~ecl.session.Session`
+    :param tenant_ids: An iterable of tenant IDs.
+    :param datetime.datetime start: The start of the period, in UTC.
+    :param datetime.datetime end: The end of the period, in UTC.
+    :param datetime.timedelta step: The length of each window.
+    :param cache: A :class:`~ecl.cache.DiskCache` for closed windows.
+    :param int concurrency: The maximum number of requests in flight.
+    :param datetime.datetime now: The current time in UTC, which decides
+                                  which windows are closed.
+
+    :returns: :class:`UsageColumns` sorted by window, tenant and flavor.
+    :raises: The first exception raised fetching any window.
+    """
+    now = datetime.datetime.utcnow() if now is None else now
+    jobs = list(itertools.product(list(tenant_ids),
+                                  windows(start, end, step)))
+
+    def fetch(job):
+        tenant_id, (window_start, window_end) = job
+        closed = cache is not None and window_end <= now
+        key = "compute-usage:%s:%s:%s" % (
+            tenant_id, window_start.strftime(_quota.TIME_FORMAT),
+            window_end.strftime(_quota.TIME_FORMAT))
+        if closed:
+            hours = cache.get(key)
+            if hours is not None:
+                return hours
+        usage = _quota.TenantUsage.new(id=tenant_id).get(
+            session, start=window_start, end=window_end)
+        hours = hours_by_flavor(usage)
+        if closed:
+            cache.set(key, hours)
+        return hours
+
+    rows = []
+    for outcome in parallel.run(fetch, jobs, concurrency):
+        if outcome.exception is not None:
+            raise outcome.exception
+        tenant_id, (window_start, _) = outcome.item
+        for flavor, hours in outcome.result.items():
+            rows.append((window_start, tenant_id, flavor, hours))
+    rows.sort(key=lambda row: (row[0], row[1], row[2] or ""))
+
+    return UsageColumns([row[0] for row in rows],
+                        [row[1] for row in rows],
+                        [row[2] for row in rows],
+                        array.array("d", [row[3] for row in rows]))
@@ -63,6 +63,7 @@ import sys
 from keystoneauth1.loading import base as ksa_loader
 import os_client_config
 
+from ecl import cache
 from ecl import profile as _profile
 from ecl import proxy
 from ecl import proxy2
@@ -158,7 +159,7 @@ class Connection(object):
     def __init__(self, session=None, authenticator=None, profile=None,
                  verify=True, cert=None, user_agent=None,
                  auth_plugin="password", timeout=None,
-                 **auth_args):
+                 resource_index_ttl=60, **auth_args):
         """Create a context for a connection to a cloud provider.
 
         A connection needs a transport and an authenticator.  The user may pass
@@ -204,6 +205,12 @@ class Connection(object):
         :param float timeout: A timeout to pass to requests. This should be a
             numerical value indicating some amount (or fraction)
             of seconds or 0 for no timeout. (optional, defaults to 0)
+        :param float resource_index_ttl: Seconds that resources seen in
+            responses are remembered for, by ID and by name, so that
+            repeated ``find_*`` calls for them make no requests. Resources
+            are forgotten sooner when one of their type is created, updated
+            or deleted through this connection. ``None`` or ``0`` turns
+            the index off. (optional, defaults to 60)
         :param auth_args: The rest of the parameters provided are assumed to be
             authentication arguments that are used by the authentication
             plugin.
@@ -215,6 +222,12 @@ class Connection(object):
         self.session = session if session else _session.Session(
             self.profile, auth=self.authenticator, verify=verify, cert=cert,
             user_agent=user_agent, timeout=timeout)
+        #: The :class:`~ecl.cache.ResourceIndex` shared by the proxies of
+        #: this connection, or ``None`` when it is off.
+        self.resource_index = None
+        if resource_index_ttl:
+            self.resource_index = cache.ResourceIndex(
+                resource_index_ttl, proxy2.BaseProxy.resource_index_size)
         self._open()
 
     def _create_authenticator(self, authenticator, auth_plugin, **args):
@@ -247,7 +260,11 @@ class Connection(object):
                     issubclass(proxy_class, proxy2.BaseProxy)):
                 raise TypeError("%s.Proxy must inherit from BaseProxy" %
                                 proxy_class.__module__)
-            setattr(self, attr_name, proxy_class(self.session))
+            if issubclass(proxy_class, proxy2.BaseProxy):
+                instance = proxy_class(self.session, self.resource_index)
+            else:
+                instance = proxy_class(self.session)
+            setattr(self, attr_name, instance)
         except Exception as e:
             _logger.warn("Unable to load %s: %s" % (module, e))
 
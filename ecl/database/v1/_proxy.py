@@ -16,11 +16,12 @@ from ecl.database.v1 import database as _database
 from ecl.database.v1 import flavor as _flavor
 from ecl.database.v1 import datastore as _datastore
 
+from ecl import flavor_catalog
 from ecl import proxy2
 from ecl import resource2
 
 
-class Proxy(proxy2.BaseProxy):
+class Proxy(proxy2.BaseProxy, flavor_catalog.FlavorCatalogMixin):
 
     def instances(self, **query):
         """Retrieve a list of instances
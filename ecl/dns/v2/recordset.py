@@ -27,6 +27,7 @@ class RecordSet(resource2.Resource):
     allow_update = True
     allow_list = True
     allow_get = True
+    find_by_id = "uuid"
 
     _query_mapping = resource2.QueryParameters("limit", "marker")
 
@@ -150,15 +151,6 @@ class RecordSet(resource2.Resource):
         :raises: :class:`ecl.exceptions.ResourceNotFound` if nothing
                  is found and ignore_missing is ``False``.
         """
-        # Try to short-circuit by looking directly for a matching ID.
-
-        data = list(cls.list(session, zone_id=zone_id, **params))
-
-        result = cls._get_one_match(name_or_id, data)
-        if result is not None:
-            return result
-
-        if ignore_missing:
-            return None
-        raise exceptions.ResourceNotFound(
-            "No %s found for %s" % (cls.__name__, name_or_id))
+        return super(RecordSet, cls).find(session, name_or_id,
+                                          ignore_missing=ignore_missing,
+                                          zone_id=zone_id, **params)
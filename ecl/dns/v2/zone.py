@@ -12,7 +12,6 @@
 
 from ecl.dns import dns_service
 from ecl import resource2
-from ecl import exceptions
 
 
 class Zone(resource2.Resource):
@@ -28,6 +27,10 @@ class Zone(resource2.Resource):
     allow_list = True
     allow_get = True
     patch_update = True
+    find_by_id = "uuid"
+
+    # query mappings
+    _query_mapping = resource2.QueryParameters('name')
 
     # Properties
     #: ID for the resource
@@ -67,42 +70,3 @@ class Zone(resource2.Resource):
     #: Links to the resource, and other related resources. When a response has been broken into pages,
     #: we will include a next link that should be followed to retrive all results.
     links = resource2.Body('links')
-
-
-    @classmethod
-    def find(cls, session, name_or_id, ignore_missing=False, **params):
-        """Find a resource by its name or id.
-
-        :param session: The session to use for making this request.
-        :type session: :class:`~ecl.session.Session`
-        :param name_or_id: This resource's identifier, if needed by
-                           the request. The default is ``None``.
-        :param bool ignore_missing: When set to ``False``
-                    :class:`~ecl.exceptions.ResourceNotFound` will be
-                    raised when the resource does not exist.
-                    When set to ``True``, None will be returned when
-                    attempting to find a nonexistent resource.
-        :param dict params: Any additional parameters to be passed into
-                            underlying methods, such as to
-                            :meth:`~ecl.resource2.Resource.existing`
-                            in order to pass on URI parameters.
-
-        :return: The :class:`Resource` object matching the given name or id
-                 or None if nothing matches.
-        :raises: :class:`ecl.exceptions.DuplicateResource` if more
-                 than one resource is found for this request.
-        :raises: :class:`ecl.exceptions.ResourceNotFound` if nothing
-                 is found and ignore_missing is ``False``.
-        """
-        # Try to short-circuit by looking directly for a matching ID.
-
-        data = cls.list(session, **params)
-
-        result = cls._get_one_match(name_or_id, data)
-        if result is not None:
-            return result
-
-        if ignore_missing:
-            return None
-        raise exceptions.ResourceNotFound(
-            "No %s found for %s" % (cls.__name__, name_or_id))
@@ -150,3 +150,13 @@ class ResourceTimeout(SDKException):
 class ResourceFailure(SDKException):
     """General resource failure."""
     pass
+
+
+class QuotaExceeded(SDKException):
+    """Not enough quota is left for the request."""
+    pass
+
+
+class AddressExhausted(SDKException):
+    """No free IP address is left in a subnet."""
+    pass
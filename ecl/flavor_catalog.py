@@ -0,0 +1,140 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+In-memory flavor catalogs for choosing a flavor by its size.
+
+Flavors are held sorted by vCPUs, RAM and disk in compact arrays, so
+picking the smallest flavor that satisfies a requirement is a binary
+search followed by a short scan, with no API call until the catalog
+expires.
+"""
+
+import array
+import bisect
+import threading
+
+from ecl import cache
+
+#: The number of seconds a catalog is used before it is listed again.
+DEFAULT_TTL = 300
+
+
+def _size(flavor):
+    return (flavor.vcpus or 0, flavor.ram or 0, flavor.disk or 0)
+
+
+class FlavorCatalog(object):
+    """Flavors indexed by vCPUs, RAM and disk.
+
+    Disabled flavors are left out. Flavors are ordered by vCPUs, then RAM,
+    then disk, and the first that satisfies a requirement is taken to be
+    the cheapest.
+
+    :param list_flavors: A callable returning an iterable of flavors
+                         that have ``vcpus``, ``ram`` and ``disk``.
+    :param float ttl: The number of seconds the catalog is used before
+                      it is listed again.
+    :param clock: A callable returning the current time in seconds.
+    """
+
+    def __init__(self, list_flavors, ttl=DEFAULT_TTL, clock=cache._clock):
+        self._list_flavors = list_flavors
+        self._cache = cache.TTLCache(ttl, clock=clock)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """List the flavors again and rebuild the index"""
+        flavors = sorted((flavor for flavor in self._list_flavors()
+                          if not getattr(flavor, "is_disabled", False)),
+                         key=_size)
+        sizes = [_size(flavor) for flavor in flavors]
+        index = (array.array("l", [size[0] for size in sizes]),
+                 array.array("l", [size[1] for size in sizes]),
+                 array.array("l", [size[2] for size in sizes]),
+                 flavors)
+        self._cache.set("index", index)
+        return index
+
+    def _index(self):
+        index = self._cache.get("index")
+        if index is None:
+            with self._lock:
+                index = self._cache.get("index")
+                if index is None:
+                    index = self.refresh()
+        return index
+
+    def matching(self, vcpus=0, ram=0, disk=0):
+        """Return every flavor at least as large as required
+
+        :param int vcpus: The minimum number of vCPUs.
+        :param int ram: The minimum amount of RAM in megabytes.
+        :param int disk: The minimum disk size in gigabytes.
+
+        :returns: A list of flavors, cheapest first.
+        """
+        cpus, rams, disks, flavors = self._index()
+        start = bisect.bisect_left(cpus, vcpus)
+        return [flavors[i] for i in range(start, len(flavors))
+                if rams[i] >= ram and disks[i] >= disk]
+
+    def best_flavor(self, vcpus=0, ram=0, disk=0):
+        """Return the cheapest flavor at least as large as required
+
+        :param int vcpus: The minimum number of vCPUs.
+        :param int ram: The minimum amount of RAM in megabytes.
+        :param int disk: The minimum disk size in gigabytes.
+
+        :returns: A flavor, or ``None`` if none is large enough.
+        """
+        cpus, rams, disks, flavors = self._index()
+        for i in range(bisect.bisect_left(cpus, vcpus), len(flavors)):
+            if rams[i] >= ram and disks[i] >= disk:
+                return flavors[i]
+        return None
+
+
+class FlavorCatalogMixin(object):
+    """Adds :meth:`best_flavor` to a proxy that has a ``flavors()`` method"""
+
+    #: Seconds that :meth:`best_flavor` answers from the same catalog.
+    flavor_catalog_ttl = DEFAULT_TTL
+
+    def flavor_catalog(self):
+        """Return the flavor catalog of this proxy
+
+        :returns: A :class:`~ecl.flavor_catalog.FlavorCatalog`, created
+                  on first use and shared by later calls.
+        """
+        catalog = self.__dict__.get("_flavor_catalog")
+        if catalog is None:
+            catalog = self.__dict__.setdefault(
+                "_flavor_catalog",
+                FlavorCatalog(self.flavors, ttl=self.flavor_catalog_ttl))
+        return catalog
+
+    def best_flavor(self, vcpus=0, ram=0, disk=0):
+        """Return the cheapest flavor at least as large as required
+
+        Flavors are ordered by vCPUs, then RAM, then disk. The answer
+        comes from :meth:`flavor_catalog`, which lists the flavors again
+        once :attr:`flavor_catalog_ttl` seconds have passed.
+
+        :param int vcpus: The minimum number of vCPUs.
+        :param int ram: The minimum amount of RAM in megabytes.
+        :param int disk: The minimum disk size in gigabytes.
+
+        :returns: A flavor, or ``None`` if none is large enough.
+        """
+        return self.flavor_catalog().best_flavor(vcpus=vcpus, ram=ram,
+                                                 disk=disk)
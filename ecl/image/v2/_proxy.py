@@ -22,6 +22,8 @@ from ecl import resource2
 
 class Proxy(proxy2.BaseProxy):
 
+    resource_index_ttl = 60
+
     def create_image(self, **attrs):
         """Creates a virtual machine (VM) image.
 
@@ -32,30 +34,60 @@ class Proxy(proxy2.BaseProxy):
         :returns: The results of image creation
         :rtype: :class:`~ecl.image.v2.image.Image`
         """
-        img = self._create(_image.Image, **attrs)
-        return img
+        return self._create(_image.Image, **attrs)
 
-    def upload_image(self, image_id, image_data):
+    def upload_image(self, image_id, image_data=None, path=None,
+                     chunk_size=_image.DEFAULT_CHUNK_SIZE, progress=None):
         """
         Uploads binary image data.
 
+        Anything but ``bytes`` is streamed, so images larger than memory
+        can be uploaded. Buffers such as an ``mmap`` are streamed in copied
+        chunks, so only one chunk at a time is held in memory.
+
         :param image_id: An identifier for the image.
         :param image_data: raw binary data that represents the actual virtual disk.
+            This may be ``bytes``, a binary file-like object, an ``mmap``
+            or an iterable of chunks.
+        :param path: The path of a file to upload instead of ``image_data``.
+        :param int chunk_size: The number of bytes to send at a time.
+        :param progress: A callable invoked as ``progress(sent, total)``
+            after each chunk is sent.
         :return: ``None``
         """
         img = _image.Image()
-        return img.upload(self.session, image_id, image_data)
-
-    def download_image(self, image_id):
+        if path is None:
+            return img.upload(self.session, image_id, image_data,
+                              chunk_size=chunk_size, progress=progress)
+        with open(path, "rb") as image_file:
+            return img.upload(self.session, image_id, image_file,
+                              chunk_size=chunk_size, progress=progress)
+
+    def download_image(self, image_id, output=None,
+                       chunk_size=_image.DEFAULT_CHUNK_SIZE, progress=None):
         """Download an image
 
         :param image: The value can be either the ID of an image or a
                       :class:`~ecl.image.v2.image.Image` instance.
-
-        :returns: The bytes comprising the given Image.
-        """
-        img = _image.Image()
-        return img.download(self.session, image_id)
+        :param output: A path or a writable binary file-like object to
+                       stream the image to. The data is verified against
+                       the image's MD5 checksum as it is written.
+        :param int chunk_size: The number of bytes to read at a time.
+        :param progress: A callable invoked as ``progress(received, total)``
+                         after each chunk is written.
+
+        :returns: The bytes comprising the given Image when ``output`` is
+                  not given, otherwise ``None``.
+        :raises: :class:`~ecl.exceptions.InvalidResponse` when the
+                 downloaded data does not match the checksum.
+        """
+        if isinstance(image_id, _image.Image):
+            img = image_id
+        else:
+            img = _image.Image()
+        image_id = resource2.Resource._get_id(image_id)
+        return img.download(self.session, image_id, output=output,
+                            chunk_size=chunk_size, progress=progress)
 
     def delete_image(self, image, ignore_missing=False):
         """Delete an image
@@ -75,6 +107,13 @@ class Proxy(proxy2.BaseProxy):
     def find_image(self, name_or_id, ignore_missing=False):
         """Find a single image
 
+        A UUID is looked up directly and a name is filtered server side.
+        Images seen through this proxy are remembered by its resource
+        index, shared with the other proxies of a
+        :class:`~ecl.connection.Connection`, until it expires or an image
+        is created, updated or deleted, so repeated lookups of the same
+        name make no requests.
+
         :param name_or_id: The name or ID of a image.
         :param bool ignore_missing: When set to ``False``
                     :class:`~ecl.exceptions.ResourceNotFound` will be
@@ -83,7 +122,6 @@ class Proxy(proxy2.BaseProxy):
                     attempting to find a nonexistent resource.
         :returns: One :class:`~ecl.image.v2.image.Image` or None
         """
-
         return self._find(_image.Image, name_or_id,
                           ignore_missing=ignore_missing)
 
@@ -121,6 +159,7 @@ class Proxy(proxy2.BaseProxy):
         :param image_data: List of attributes(dict) to update on the image.
         :return: :class:`~ecl.image.v2.image.Image`
         """
+        self._forget(_image.Image)
         img = _image.Image()
         return img.update(self.session, image_id, image_data)
 
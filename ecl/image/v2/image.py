@@ -15,7 +15,52 @@ from ecl import exceptions
 from ecl.image import image_service
 from ecl import resource2
 from ecl import utils
+import hashlib
 import json
+import os
+
+import six
+
+#: The number of bytes read or written at a time when streaming image data.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_chunks(data, chunk_size, progress=None, total=None):
+    """Yield image data in chunks of at most ``chunk_size`` bytes
+
+    Objects supporting the buffer protocol, such as ``bytes`` or an
+    ``mmap``, are sliced through a ``memoryview`` and each chunk is copied
+    into ``bytes``, because chunked uploads through urllib3 1.x encode
+    anything else as text. Only one chunk at a time is held in memory.
+    File-like objects are read a chunk at a time and anything else is
+    treated as an iterable of chunks.
+    """
+    try:
+        view = memoryview(data)
+    except TypeError:
+        view = None
+
+    if view is not None:
+        total = len(view) if total is None else total
+        chunks = (view[start:start + chunk_size].tobytes()
+                  for start in six.moves.range(0, len(view), chunk_size))
+    elif hasattr(data, "read"):
+        def read():
+            while True:
+                chunk = data.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        chunks = read()
+    else:
+        chunks = iter(data)
+
+    sent = 0
+    for chunk in chunks:
+        sent += len(chunk)
+        yield chunk
+        if progress is not None:
+            progress(sent, total)
 
 
 class Image(resource2.Resource):
@@ -192,8 +237,31 @@ class Image(resource2.Resource):
         self._translate_response(resp, has_body=True)
         return self
 
-    def upload(self, session, image_id, image_data):
-        """Upload data into an existing image"""
+    def upload(self, session, image_id, image_data,
+               chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        """Upload data into an existing image
+
+        ``bytes`` are sent as they are. File-like objects, ``mmap`` objects
+        and iterables of chunks are streamed with chunked transfer encoding
+        so the image never has to fit in memory; an ``mmap`` is sent in
+        copied chunks.
+
+        :param progress: A callable invoked as ``progress(sent, total)``
+                         after each chunk. ``total`` is ``None`` when the
+                         size is not known up front.
+        """
+        if image_data is not None and (
+                progress is not None or
+                not isinstance(image_data, six.binary_type)):
+            total = None
+            if hasattr(image_data, "fileno"):
+                try:
+                    total = os.fstat(image_data.fileno()).st_size
+                except (OSError, IOError, ValueError):
+                    pass
+            image_data = _iter_chunks(image_data, chunk_size, progress,
+                                      total)
+
         url = utils.urljoin(self.base_path, image_id, 'file')
         resp = session.put(url, endpoint_filter=self.service,
                     data=image_data,
@@ -202,13 +270,57 @@ class Image(resource2.Resource):
         self._translate_response(resp, has_body=False)
         return self
 
-    def download(self, session, image_id):
-        """Download the data contained in an image"""
-        # TODO(briancurtin): This method should probably offload the get
-        # operation into another thread or something of that nature.
+    def download(self, session, image_id, output=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        """Download the data contained in an image
+
+        Without ``output`` the whole image is returned as ``bytes``. With
+        ``output`` the image is streamed to it a chunk at a time while its
+        MD5 is computed and compared with :attr:`checksum`, or with the
+        ``Content-MD5`` header when the checksum is not known.
+
+        :param output: A path or a writable binary file-like object.
+        :param progress: A callable invoked as ``progress(received, total)``
+                         after each chunk. ``total`` is ``None`` when the
+                         server does not send a ``Content-Length``.
+
+        :raises: :class:`~ecl.exceptions.InvalidResponse` when the
+                 downloaded data does not match the checksum. A file
+                 created from a path is removed in that case.
+        """
         url = utils.urljoin(self.base_path, image_id, 'file')
-        resp = session.get(url, endpoint_filter=self.service)
-        return resp.content
+        if output is None:
+            resp = session.get(url, endpoint_filter=self.service)
+            return resp.content
+
+        resp = session.get(url, endpoint_filter=self.service, stream=True)
+        expected = self.checksum or resp.headers.get("Content-MD5")
+        total = resp.headers.get("Content-Length")
+        total = int(total) if total is not None else None
+
+        path = None
+        if isinstance(output, six.string_types):
+            path = output
+            output = open(path, "wb")
+
+        md5 = hashlib.md5()
+        received = 0
+        try:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                output.write(chunk)
+                md5.update(chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+        finally:
+            resp.close()
+            if path is not None:
+                output.close()
+
+        if expected and md5.hexdigest() != expected:
+            if path is not None:
+                os.remove(path)
+            raise exceptions.InvalidResponse(resp)
 
     @classmethod
     def find(cls, session, name_or_id, ignore_missing=False, **params):
@@ -236,10 +348,25 @@ class Image(resource2.Resource):
                  is found and ignore_missing is ``False``.
         """
         # Try to short-circuit by looking directly for a matching ID.
-        params["limit"] = 10000
-        data = cls.list(session, **params)
+        if utils.is_uuid_like(name_or_id):
+            try:
+                return cls().get(session, name_or_id)
+            except exceptions.NotFoundException:
+                pass
 
-        result = cls._get_one_match(name_or_id, data)
+        # Let the server filter by name so only candidates are sent. Should
+        # the filter be ignored this degrades to a paginated scan, which
+        # still stops as soon as a second match is seen.
+        result = None
+        for image in cls.list(session, paginated=True, name=name_or_id,
+                              **params):
+            if image.id != name_or_id and image.name != name_or_id:
+                continue
+            if result is not None:
+                msg = "More than one %s exists with the name '%s'."
+                raise exceptions.DuplicateResource(
+                    msg % (cls.__name__, name_or_id))
+            result = image
         if result is not None:
             return result
 
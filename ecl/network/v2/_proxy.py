@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import time
+import weakref
+
 from ecl.network.v2 import common_function_pool as _common_function_pool
 from ecl.network.v2 import common_function as _common_function
 from ecl.network.v2 import common_function_gateway as _common_function_gateway
@@ -13,6 +17,7 @@ from ecl.network.v2 import port as _port
 from ecl.network.v2 import physical_port as _physical_port
 from ecl.network.v2 import quota as _quota
 from ecl.network.v2 import reserved_address as _reserved_address
+from ecl.network.v2 import route_reconciler as _route_reconciler
 from ecl.network.v2 import firewall as _firewall
 from ecl.network.v2 import firewall_interface as _firewall_if
 from ecl.network.v2 import firewall_plan as _firewall_plan
@@ -22,7 +27,9 @@ from ecl.network.v2 import load_balancer_interface as _load_balancer_if
 from ecl.network.v2 import load_balancer_plan as _load_balancer_plan
 from ecl.network.v2 import load_balancer_action as _load_balancer_action
 from ecl.network.v2 import load_balancer_syslog_server as _load_balancer_syslog
+from ecl.network.v2 import gateway_inventory as _gateway_inventory
 from ecl.network.v2 import gw_interface as _gwif
+from ecl.network.v2 import ip_allocator as _ip_allocator
 from ecl.network.v2 import internet as _internet
 from ecl.network.v2 import publicip as _publicip
 from ecl.network.v2 import qos_option as _qos_option
@@ -33,12 +40,70 @@ from ecl.network.v2 import aws as _aws
 from ecl.network.v2 import gcp as _gcp
 from ecl.network.v2 import tenant_connection as _tenant_connection
 from ecl.network.v2 import azure as _azure
+from ecl.network.v2 import topology as _topology
+from ecl.network.v2 import update_queue as _update_queue
 
+from ecl import cache
+from ecl import exceptions
+from ecl import parallel
 from ecl import proxy2
+from ecl import resource2
+from ecl import sync
+
+
+def _port_attrs(admin_state_up=None, allowed_address_pairs=None,
+                mac_address=None, description=None, device_id=None,
+                device_owner=None, fixed_ips=None, name=None, network_id=None,
+                segmentation_id=None, segmentation_type=None, tags=None):
+    """Return the attributes a port is created with
+
+    It takes the arguments of
+    :meth:`~ecl.network.v2._proxy.Proxy.create_port` and leaves out those
+    that are not set, so single and bulk creation send the same body.
+    """
+    body = dict()
+    if admin_state_up:
+        body["admin_state_up"] = admin_state_up
+    if allowed_address_pairs:
+        body["allowed_address_pairs"] = allowed_address_pairs
+    if mac_address:
+        body["mac_address"] = mac_address
+    if description:
+        body["description"] = description
+    if device_id:
+        body["device_id"] = device_id
+    if device_owner:
+        body["device_owner"] = device_owner
+    if fixed_ips or fixed_ips == []:
+        body["fixed_ips"] = fixed_ips
+    if name:
+        body["name"] = name
+    if network_id:
+        body["network_id"] = network_id
+    if segmentation_id:
+        body["segmentation_id"] = segmentation_id
+    if segmentation_type:
+        body["segmentation_type"] = segmentation_type
+    if tags:
+        body["tags"] = tags
+    return body
 
 
 class Proxy(proxy2.BaseProxy):
 
+    #: Seconds that :meth:`gateway_inventory` answers from the same listing.
+    gateway_inventory_ttl = 15
+
+    #: HTTP statuses that mean the endpoint has no bulk port creation.
+    _bulk_unsupported_statuses = (404, 405, 501)
+
+    def __init__(self, session, resource_index=None):
+        super(Proxy, self).__init__(session, resource_index)
+        self._bulk_ports = True
+        self._common_function_inventory = None
+        self._ip_allocators = weakref.WeakSet()
+        self._gateway_inventory = cache.TTLCache(self.gateway_inventory_ttl)
+
     def create_network(self, admin_state_up=None, description=None,
                        name=None, plane=None, tenant_id=None,
                        tags=None):
@@ -125,6 +190,30 @@ class Proxy(proxy2.BaseProxy):
         """
         return list(self._list(_network.Network, paginated=False, **params))
 
+    def topology(self, concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Return networks joined with what is attached to them
+
+        Networks, subnets, ports and the interfaces of firewalls, load
+        balancers and gateways are listed concurrently and indexed by
+        network ID, subnet ID, device ID and IP address. Call
+        ``refresh()`` on the result, optionally naming the kinds that
+        changed, to bring it up to date.
+
+        :param int concurrency: The maximum number of listings in flight.
+
+        :returns: A :class:`~ecl.network.v2.topology.Topology`
+        """
+        topology = _topology.Topology({
+            "networks": self.networks,
+            "subnets": self.subnets,
+            "ports": self.ports,
+            "firewall_interfaces": self.firewall_interfaces,
+            "load_balancer_interfaces": self.load_balancer_interfaces,
+            "gateway_interfaces": self.gateway_interfaces,
+        }, concurrency=concurrency)
+        topology.refresh()
+        return topology
+
     def update_network(self, network, **params):
         """Update a network
 
@@ -207,33 +296,18 @@ class Proxy(proxy2.BaseProxy):
         :returns: The results of port creation
         :rtype: :class:`~ecl.network.v2.port.Port`
         """
-        body = dict()
-        if admin_state_up:
-            body["admin_state_up"] = admin_state_up
-        if allowed_address_pairs:
-            body["allowed_address_pairs"] = allowed_address_pairs
-        if mac_address:
-            body["mac_address"] = mac_address
-        if description:
-            body["description"] = description
-        if device_id:
-            body["device_id"] = device_id
-        if device_owner:
-            body["device_owner"] = device_owner
-        if fixed_ips or fixed_ips == []:
-            body["fixed_ips"] = fixed_ips
-        if name:
-            body["name"] = name
-        if network_id:
-            body["network_id"] = network_id
-        if segmentation_id:
-            body["segmentation_id"] = segmentation_id
-        if segmentation_type:
-            body["segmentation_type"] = segmentation_type
-        if tags:
-            body["tags"] = tags
-
-        return self._create(_port.Port, **body)
+        body = _port_attrs(
+            admin_state_up=admin_state_up,
+            allowed_address_pairs=allowed_address_pairs,
+            mac_address=mac_address, description=description,
+            device_id=device_id, device_owner=device_owner,
+            fixed_ips=fixed_ips, name=name, network_id=network_id,
+            segmentation_id=segmentation_id,
+            segmentation_type=segmentation_type, tags=tags)
+        port = self._create(_port.Port, **body)
+        for allocator in list(self._ip_allocators):
+            allocator.add_port(port)
+        return port
 
     def delete_port(self, port, ignore_missing=False):
         """Delete a port
@@ -249,6 +323,125 @@ class Proxy(proxy2.BaseProxy):
         :returns: ``None``
         """
         self._delete(_port.Port, port, ignore_missing=ignore_missing)
+        port_id = resource2.Resource._get_id(port)
+        for allocator in list(self._ip_allocators):
+            allocator.remove_port(port_id)
+
+    def create_ports(self, ports, batch_size=100,
+                     concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Create many ports
+
+        Ports are sent in batches of ``batch_size`` with a single bulk
+        request each. A batch the endpoint rejects, or every batch when
+        the endpoint has no bulk creation, is created one port at a time
+        instead, so each port gets its own result. Either way each port is
+        sent with the same attributes :meth:`create_port` would send.
+
+        :param ports: An iterable of dicts, each holding the arguments of
+                      :meth:`create_port` for one port. A dict with other
+                      keys fails with a ``TypeError`` outcome.
+        :param int batch_size: The maximum number of ports per request.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per port
+                  in the order given, whose result is the
+                  :class:`~ecl.network.v2.port.Port`.
+        """
+        ports = [dict(attrs) for attrs in ports]
+        outcomes = [None] * len(ports)
+        bodies = {}
+        for index, attrs in enumerate(ports):
+            try:
+                bodies[index] = _port_attrs(**attrs)
+            except TypeError as e:
+                outcomes[index] = parallel.Outcome(attrs, None, e)
+        indexes = sorted(bodies)
+        batches = [indexes[i:i + batch_size]
+                   for i in range(0, len(indexes), batch_size)]
+
+        def create_batch(batch):
+            if not self._bulk_ports:
+                return None
+            try:
+                return _port.Port.bulk_create(
+                    self.session, [bodies[index] for index in batch])
+            except exceptions.HttpException as e:
+                if e.http_status in self._bulk_unsupported_statuses:
+                    self._bulk_ports = False
+                return None
+
+        def create_one(index):
+            return self.create_port(**bodies[index])
+
+        try:
+            # Batches that could not be created in bulk are created one
+            # port at a time afterwards, in a single pool, so no more than
+            # concurrency requests are ever in flight.
+            fallback = []
+            for outcome in parallel.run(create_batch, batches, concurrency):
+                if outcome.exception is not None:
+                    for index in outcome.item:
+                        outcomes[index] = parallel.Outcome(
+                            ports[index], None, outcome.exception)
+                elif outcome.result is None:
+                    fallback.extend(outcome.item)
+                else:
+                    for index, port in zip(outcome.item, outcome.result):
+                        for allocator in list(self._ip_allocators):
+                            allocator.add_port(port)
+                        outcomes[index] = parallel.Outcome(ports[index], port,
+                                                           None)
+            for outcome in parallel.run(create_one, fallback, concurrency):
+                outcomes[outcome.item] = parallel.Outcome(
+                    ports[outcome.item], outcome.result, outcome.exception)
+            return outcomes
+        finally:
+            self._forget(_port.Port)
+
+    def delete_ports(self, ports, ignore_missing=True,
+                     concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Delete many ports concurrently
+
+        :param ports: An iterable of port IDs or
+                      :class:`~ecl.network.v2.port.Port` instances.
+        :param bool ignore_missing: When set to ``False``
+                    :class:`~ecl.exceptions.ResourceNotFound` is the
+                    outcome of a port that does not exist.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per port
+                  in the order given, whose result is ``None``.
+        """
+        return parallel.run(
+            lambda port: self.delete_port(port,
+                                          ignore_missing=ignore_missing),
+            ports, concurrency)
+
+    def ip_allocator(self, network_id=None):
+        """Return a local allocator of free fixed IPs
+
+        Subnets, ports and reserved addresses are listed concurrently to
+        find the addresses in use. Ports later created or deleted through
+        this proxy update the allocator, so callers sharing it never pick
+        the same address.
+
+        :param string network_id: Only allocate in subnets of this network.
+
+        :returns: An :class:`~ecl.network.v2.ip_allocator.IPAllocator`
+        """
+        query = {"network_id": network_id} if network_id else {}
+        listings = [lambda: self.subnets(**query),
+                    lambda: self.ports(**query),
+                    self.reserved_addresses]
+        outcomes = parallel.run(lambda list_all: list_all(), listings)
+        for outcome in outcomes:
+            if outcome.exception is not None:
+                raise outcome.exception
+
+        subnets, ports, reserved = [outcome.result for outcome in outcomes]
+        allocator = _ip_allocator.IPAllocator(subnets, ports, reserved)
+        self._ip_allocators.add(allocator)
+        return allocator
 
     def find_port(self, name_or_id, ignore_missing=False):
         """Find a single port
@@ -613,6 +806,31 @@ class Proxy(proxy2.BaseProxy):
         return interface.update(self.session, firewall_id,
                                 firewall_interface_id, **params)
 
+    def firewall_interface_updates(self,
+                                   concurrency=parallel.DEFAULT_CONCURRENCY,
+                                   interval=2, wait=300):
+        """Return a queue that serializes updates per firewall
+
+        Updates submitted to the queue are made with
+        :meth:`update_firewall_interface` one at a time per firewall,
+        waiting for the firewall to be ``ACTIVE`` around each of them.
+        Queued updates of the same interface are merged, and different
+        firewalls are updated in parallel.
+
+        :param int concurrency: The maximum number of firewalls updated
+                                at once.
+        :param interval: Seconds to wait between status checks.
+        :param wait: Seconds to wait for a firewall to become ``ACTIVE``.
+
+        :returns: An
+            :class:`~ecl.network.v2.update_queue.ApplianceUpdateQueue`
+            whose ``submit(firewall_id, firewall_interface_id, **params)``
+            returns a future of the updated interface.
+        """
+        return _update_queue.ApplianceUpdateQueue(
+            self.update_firewall_interface, self.get_firewall,
+            concurrency=concurrency, interval=interval, wait=wait)
+
     def firewall_plans(self, **query):
         """
         List all visible firewall_plans.
@@ -791,6 +1009,32 @@ class Proxy(proxy2.BaseProxy):
         return interface.update(self.session, load_balancer_id,
                                 load_balancer_interface_id, **params)
 
+    def load_balancer_interface_updates(
+            self, concurrency=parallel.DEFAULT_CONCURRENCY, interval=2,
+            wait=300):
+        """Return a queue that serializes updates per load balancer
+
+        Updates submitted to the queue are made with
+        :meth:`update_load_balancer_interface` one at a time per load
+        balancer, waiting for it to be ``ACTIVE`` around each of them.
+        Queued updates of the same interface are merged, and different
+        load balancers are updated in parallel.
+
+        :param int concurrency: The maximum number of load balancers
+                                updated at once.
+        :param interval: Seconds to wait between status checks.
+        :param wait: Seconds to wait for a load balancer to become
+                     ``ACTIVE``.
+
+        :returns: An
+            :class:`~ecl.network.v2.update_queue.ApplianceUpdateQueue`
+            whose ``submit(load_balancer_id, load_balancer_interface_id,
+            **params)`` returns a future of the updated interface.
+        """
+        return _update_queue.ApplianceUpdateQueue(
+            self.update_load_balancer_interface, self.get_load_balancer,
+            concurrency=concurrency, interval=interval, wait=wait)
+
     def load_balancer_plans(self, **query):
         """
         List all visible load_balancer_plans.
@@ -1389,6 +1633,57 @@ class Proxy(proxy2.BaseProxy):
         return self._find(_gwif.GatewayInterface,
                           name_or_id, ignore_missing=ignore_missing)
 
+    def gateway_inventory(self, refresh=False,
+                          concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Return the gateways of every service type in one inventory
+
+        Internet, VPN, InterDC, AWS, GCP and Azure gateways, the gateway
+        interfaces and the interfaces of each service type are listed
+        concurrently. The inventory is reused for
+        :attr:`gateway_inventory_ttl` seconds.
+
+        :param bool refresh: List everything again even if the inventory
+                             has not expired.
+        :param int concurrency: The maximum number of listings in flight.
+
+        :returns: A
+            :class:`~ecl.network.v2.gateway_inventory.GatewayInventory`
+        """
+        if not refresh:
+            inventory = self._gateway_inventory.get("inventory")
+            if inventory is not None:
+                return inventory
+
+        listings = [
+            ("gateways", "internet", self.internet_gateways),
+            ("gateways", "vpn", self.vpn_gateways),
+            ("gateways", "interdc", self.interdc_gateways),
+            ("gateways", "aws", self.aws_gateways),
+            ("gateways", "gcp", self.gcp_gateways),
+            ("gateways", "azure", self.azure_gateways),
+            ("links", "vpn", self.vpn_interfaces),
+            ("links", "interdc", self.interdc_interfaces),
+            ("links", "aws", self.aws_interfaces),
+            ("links", "gcp", self.gcp_interfaces),
+            ("links", "azure", self.azure_interfaces),
+            ("gw_interfaces", None, self.gateway_interfaces),
+        ]
+        results = {"gateways": {}, "links": {}}
+        for outcome in parallel.run(lambda listing: listing[2](), listings,
+                                    concurrency):
+            if outcome.exception is not None:
+                raise outcome.exception
+            group, service_type, _ = outcome.item
+            if service_type is None:
+                results[group] = outcome.result
+            else:
+                results[group][service_type] = outcome.result
+
+        inventory = _gateway_inventory.GatewayInventory(
+            results["gateways"], results["gw_interfaces"], results["links"])
+        self._gateway_inventory.set("inventory", inventory)
+        return inventory
+
     def static_routes(self, **query):
         """Return a list of Static Routes
 
@@ -1486,6 +1781,110 @@ class Proxy(proxy2.BaseProxy):
         return self._delete(_static_route.StaticRoute, static_route,
                             ignore_missing=ignore_missing)
 
+    def reconcile_static_routes(self, desired,
+                                concurrency=parallel.DEFAULT_CONCURRENCY,
+                                wait=True, dry_run=False, interval=2,
+                                timeout=300):
+        """Make the static routes of gateways match a desired set
+
+        The routes are listed once and compared with ``desired`` by
+        destination, next hop and gateway ID. Surplus routes are deleted
+        concurrently first. Missing routes are only created once every
+        deletion has been made and, with ``wait``, has taken effect, so
+        replacing the next hop of a destination never conflicts. Waiting
+        costs a single listing per poll.
+
+        :param dict desired: Maps a ``(service_type, gateway_id)`` tuple,
+                             such as ``("vpn", vpn_gw_id)``, to an iterable
+                             of routes. Each route is a dict with a
+                             ``destination`` and ``nexthop`` and
+                             optionally a ``name`` and ``description``.
+                             Routes of gateways not in ``desired`` are left
+                             alone.
+        :param int concurrency: The maximum number of requests in flight.
+        :param bool wait: Wait for created routes to become ``ACTIVE`` and
+                          deleted ones to disappear.
+        :param bool dry_run: Only work out the changes.
+        :param interval: Number of seconds to wait between polls.
+        :param timeout: Maximum number of seconds to wait.
+
+        :returns: A :class:`~ecl.network.v2.route_reconciler.RoutePlan`
+                  with ``dry_run``, otherwise a
+                  :class:`~ecl.network.v2.route_reconciler.RouteChanges`.
+                  The item of each created outcome is the dict of
+                  attributes and its result the
+                  :class:`~ecl.network.v2.static_route.StaticRoute`. The
+                  item of each deleted outcome is the deleted route.
+        """
+        plan = _route_reconciler.plan(desired, self.static_routes())
+        if dry_run:
+            return plan
+
+        def delete(route):
+            self.delete_static_route(route, ignore_missing=True)
+            return route
+
+        deleted = parallel.run(delete, plan.delete, concurrency)
+        if wait:
+            deleted = self._wait_for_static_routes("delete", deleted,
+                                                   interval, timeout)
+
+        created = parallel.run(lambda attrs: self.create_static_route(**attrs),
+                               plan.create, concurrency)
+        if wait:
+            created = self._wait_for_static_routes("create", created,
+                                                   interval, timeout)
+
+        return _route_reconciler.RouteChanges(created, deleted,
+                                              plan.unchanged)
+
+    def _wait_for_static_routes(self, action, outcomes, interval, wait):
+        """Wait for created routes to be ACTIVE and deleted ones to go
+
+        Every poll is a single listing of static routes. Outcomes that
+        already failed are returned as they are.
+        """
+        outcomes = list(outcomes)
+        pending = set(i for i, outcome in enumerate(outcomes)
+                      if outcome.exception is None)
+        total_sleep = 0
+
+        while pending:
+            current = dict((route.id, route) for route in
+                           self.static_routes())
+            for i in list(pending):
+                item, result, _ = outcomes[i]
+                route = current.get(result.id)
+                if action == "delete":
+                    if route is not None:
+                        continue
+                elif route is None:
+                    outcomes[i] = parallel.Outcome(
+                        item, result, exceptions.ResourceNotFound(
+                            "Static route %s no longer exists" % result.id))
+                elif route.status == "ERROR":
+                    outcomes[i] = parallel.Outcome(
+                        item, route, exceptions.ResourceFailure(
+                            "Static route %s transitioned to failure "
+                            "state %s" % (route.id, route.status)))
+                elif route.status == "ACTIVE":
+                    outcomes[i] = parallel.Outcome(item, route, None)
+                else:
+                    continue
+                pending.discard(i)
+
+            if not pending or total_sleep >= wait:
+                break
+            time.sleep(interval)
+            total_sleep += interval
+
+        for i in pending:
+            item, result, _ = outcomes[i]
+            outcomes[i] = parallel.Outcome(
+                item, result, exceptions.ResourceTimeout(
+                    "Timeout waiting for static route %s" % result.id))
+        return outcomes
+
     def vpn_services(self, **query):
         """Return a list of VPN Service
 
@@ -1720,6 +2119,40 @@ class Proxy(proxy2.BaseProxy):
         return self._delete(_interdc.InterDCInterface, interdc_interface,
                             ignore_missing=ignore_missing)
 
+    def common_function_inventory(self, interval=300, background=True):
+        """Return a cached view of common functions and colocation
+
+        Common function pools, common functions, common function
+        gateways, colocation spaces and colocation physical and logical
+        links are listed concurrently and kept in a
+        :class:`~ecl.sync.CollectionCache`, which is shared by later
+        calls on this proxy. Read a collection with
+        ``get("common_functions")`` and what the latest refresh changed
+        from ``changes``.
+
+        :param float interval: Seconds between background refreshes.
+        :param bool background: Refresh on a schedule in a daemon thread.
+                                Call ``stop()`` on the cache to end it.
+
+        :returns: A :class:`~ecl.sync.CollectionCache`
+        """
+        inventory = self._common_function_inventory
+        if inventory is None:
+            inventory = sync.CollectionCache({
+                "common_function_pools": self.common_function_pools,
+                "common_functions": self.common_functions,
+                "common_function_gateways": self.common_function_gateways,
+                "colocation_spaces": self.colocation_spaces,
+                "colocation_physical_links": self.colocation_physical_links,
+                "colocation_logical_links": self.colocation_logical_links,
+            }, interval=interval)
+            inventory.refresh()
+            self._common_function_inventory = inventory
+        inventory.interval = interval
+        if background:
+            inventory.start()
+        return inventory
+
     def common_function_pools(self, **query):
         """Return a list of common_function_pools
 
@@ -2270,6 +2703,106 @@ class Proxy(proxy2.BaseProxy):
                 _tenant_connection.TenantConnection, tenant_connection)
         return tenant_connection.execute(self.session)
 
+    def run_tenant_connections(self, specs, approve=None,
+                               concurrency=parallel.DEFAULT_CONCURRENCY,
+                               done=("completed",), failures=("error",),
+                               interval=5, wait=1800):
+        """Create, approve and execute many tenant connections
+
+        Each connection is created with :meth:`create_tenant_connection`,
+        passed to ``approve`` if given and executed, with different
+        connections going through these stages concurrently. Executed
+        connections are then waited on until their ``progress`` is one of
+        ``done``, with a single listing of tenant connections per poll.
+
+        :param specs: An iterable of dicts, each holding the arguments of
+                      :meth:`create_tenant_connection` for one connection.
+        :param approve: A callable taking a created tenant connection, a
+            :class:`~ecl.network.v2.tenant_connection.TenantConnection`,
+            that gets it approved, e.g. by approving its
+            ``approval_request_id`` as the other tenant.
+        :param int concurrency: The maximum number of connections going
+                                through the create, approve and execute
+                                stages at once.
+        :param done: Values of ``progress`` that mean a connection is
+                     complete.
+        :param failures: Values of ``progress`` that mean it failed.
+        :param interval: Number of seconds to wait between polls.
+        :param wait: Maximum number of seconds to wait for ``progress``.
+
+        :returns: A list of
+                  :class:`~ecl.network.v2.tenant_connection.ConnectionResult`,
+                  one per spec in the order given, with the timing of the
+                  ``create``, ``approve``, ``execute`` and ``wait`` stages.
+        """
+        specs = [dict(spec) for spec in specs]
+        clock = parallel._clock
+
+        def start(spec):
+            timings = collections.OrderedDict()
+            connection = None
+            stages = [("create", lambda: self.create_tenant_connection(
+                **spec))]
+            if approve is not None:
+                stages.append(("approve", lambda: approve(connection)))
+            stages.append(("execute", lambda: self.execute_tenant_connection(
+                connection)))
+            for stage, run in stages:
+                began = clock()
+                try:
+                    result = run()
+                except Exception as e:
+                    timings[stage] = clock() - began
+                    return _tenant_connection.ConnectionResult(
+                        spec, connection, timings, stage, e)
+                timings[stage] = clock() - began
+                if stage == "create":
+                    connection = result
+            return _tenant_connection.ConnectionResult(
+                spec, connection, timings, "wait", None)
+
+        results = [outcome.result for outcome in
+                   parallel.run(start, specs, concurrency)]
+
+        pending = dict((i, clock()) for i, result in enumerate(results)
+                       if result.exception is None)
+        total_sleep = 0
+        while pending:
+            current = dict((connection.id, connection)
+                           for connection in self.tenant_connections())
+            for i in list(pending):
+                spec, connection, timings, stage, _ = results[i]
+                found = current.get(connection.id)
+                error = None
+                if found is None:
+                    error = exceptions.ResourceNotFound(
+                        "Tenant connection %s no longer exists" %
+                        connection.id)
+                elif found.progress in failures:
+                    error = exceptions.ResourceFailure(
+                        "Tenant connection %s transitioned to failure "
+                        "state %s" % (connection.id, found.progress))
+                elif found.progress not in done:
+                    continue
+                timings["wait"] = clock() - pending.pop(i)
+                results[i] = _tenant_connection.ConnectionResult(
+                    spec, found or connection, timings, stage, error)
+
+            if not pending or total_sleep >= wait:
+                break
+            time.sleep(interval)
+            total_sleep += interval
+
+        for i, began in pending.items():
+            spec, connection, timings, stage, _ = results[i]
+            timings["wait"] = clock() - began
+            results[i] = _tenant_connection.ConnectionResult(
+                spec, connection, timings, stage,
+                exceptions.ResourceTimeout(
+                    "Timeout waiting for tenant connection %s" %
+                    connection.id))
+        return results
+
     def gcp_services(self, **params):
         """Return a list of gcp_services
 
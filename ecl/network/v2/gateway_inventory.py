@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+Gateways of every service type normalized into one kind of record.
+"""
+
+import collections
+
+#: The service types of gateways, as used in ``service_type`` of
+#: gateway interfaces and static routes.
+SERVICE_TYPES = ("internet", "vpn", "interdc", "aws", "gcp", "azure")
+
+#: A gateway of any service type. ``service_id`` is the ID of the
+#: service it was created from, ``network_ids`` the networks it has a
+#: gateway interface on, ``interfaces`` those
+#: :class:`~ecl.network.v2.gw_interface.GatewayInterface` and ``links``
+#: the interfaces on the other side, such as
+#: :class:`~ecl.network.v2.aws.AWSInterface`, for service types that
+#: have them. ``gateway`` is the resource the record was made from.
+GatewayRecord = collections.namedtuple(
+    "GatewayRecord",
+    ["service_type", "id", "name", "status", "tenant_id", "service_id",
+     "qos_option_id", "network_ids", "interfaces", "links", "gateway"])
+
+
+def _gateway_id(service_type, resource):
+    return getattr(resource, service_type + "_gw_id", None)
+
+
+class GatewayInventory(object):
+    """Gateway records indexed by ID, network, tenant and service type.
+
+    :param dict gateways: Maps each service type to its gateways.
+    :param gw_interfaces: Every gateway interface, each a
+        :class:`~ecl.network.v2.gw_interface.GatewayInterface`.
+    :param dict links: Maps service types to their own interfaces, such
+                       as :class:`~ecl.network.v2.vpn.VPNInterface`.
+    """
+
+    def __init__(self, gateways, gw_interfaces=(), links=None):
+        interfaces = collections.defaultdict(list)
+        for interface in gw_interfaces:
+            key = (interface.service_type,
+                   _gateway_id(interface.service_type, interface))
+            interfaces[key].append(interface)
+        linked = collections.defaultdict(list)
+        for service_type, resources in (links or {}).items():
+            for resource in resources:
+                key = (service_type, _gateway_id(service_type, resource))
+                linked[key].append(resource)
+
+        self._records = collections.OrderedDict()
+        self._by_network = collections.defaultdict(list)
+        self._by_tenant = collections.defaultdict(list)
+        for service_type in SERVICE_TYPES:
+            for gateway in gateways.get(service_type, ()):
+                key = (service_type, gateway.id)
+                network_ids = []
+                for interface in interfaces[key]:
+                    if interface.network_id not in network_ids:
+                        network_ids.append(interface.network_id)
+                record = GatewayRecord(
+                    service_type, gateway.id, gateway.name, gateway.status,
+                    gateway.tenant_id,
+                    getattr(gateway, service_type + "_service_id", None),
+                    getattr(gateway, "qos_option_id", None), network_ids,
+                    interfaces[key], linked[key], gateway)
+                self._records[key] = record
+                for network_id in network_ids:
+                    self._by_network[network_id].append(record)
+                self._by_tenant[gateway.tenant_id].append(record)
+
+    def get(self, service_type, id):
+        """Return the record of a gateway, or ``None``"""
+        return self._records.get((service_type, id))
+
+    def on_network(self, network_id):
+        """Return the records of gateways with an interface on a network"""
+        return list(self._by_network.get(network_id, ()))
+
+    def of_tenant(self, tenant_id):
+        """Return the records of the gateways of a tenant"""
+        return list(self._by_tenant.get(tenant_id, ()))
+
+    def of_type(self, service_type):
+        """Return the records of the gateways of a service type"""
+        return [record for record in self._records.values()
+                if record.service_type == service_type]
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
+
+    def __len__(self):
+        return len(self._records)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+Local allocation of fixed IPs for new ports.
+
+Choosing an address that a port already holds only fails once the port
+is created. Keeping a bitmap of the addresses in use per subnet lets a
+free address be picked without a request, and without two callers of
+the same allocator ever picking the same one. Only IPv4 is supported,
+as by the network service.
+"""
+
+import socket
+import struct
+import threading
+
+from ecl import exceptions
+
+
+def _to_int(ip_address):
+    return struct.unpack("!I", socket.inet_aton(ip_address))[0]
+
+
+def _to_str(value):
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+
+def _cidr_range(cidr):
+    """Return the first address and the size of a CIDR"""
+    address, _, prefix = cidr.partition("/")
+    size = 1 << (32 - int(prefix or 32))
+    return _to_int(address) & ~(size - 1) & 0xffffffff, size
+
+
+class SubnetAllocator(object):
+    """A bitmap of the addresses of one subnet.
+
+    Only addresses in the allocation pools are ever allocated. The
+    gateway and any address passed to :meth:`exclude` are left out of
+    the pools.
+
+    :param str cidr: The CIDR of the subnet.
+    :param list allocation_pools: Dicts with the ``start`` and ``end`` of
+                                  each pool, or ``None`` to allocate from
+                                  the whole subnet but its network and
+                                  broadcast addresses.
+    :param str gateway_ip: The gateway address of the subnet.
+    """
+
+    def __init__(self, cidr, allocation_pools=None, gateway_ip=None):
+        self.cidr = cidr
+        self._first, self._size = _cidr_range(cidr)
+        # One bit per address, set when the address is in use or is not
+        # in any pool.
+        self._used = bytearray(b"\xff" * ((self._size + 7) // 8))
+        # One bit per address, set when the address is in a pool.
+        self._pool = bytearray((self._size + 7) // 8)
+        self.free_count = 0
+        if allocation_pools:
+            ranges = [(self._index(pool["start"]), self._index(pool["end"]))
+                      for pool in allocation_pools]
+        else:
+            ranges = [(1, self._size - 2)]
+        for start, end in ranges:
+            for index in range(max(start, 0), min(end, self._size - 1) + 1):
+                self._pool[index >> 3] |= 1 << (index & 7)
+                self._set_free(index)
+        if gateway_ip:
+            self.exclude(gateway_ip)
+        self._cursor = 0
+        self._released = []
+
+    def _index(self, ip_address):
+        return _to_int(ip_address) - self._first
+
+    def _is_used(self, index):
+        return self._used[index >> 3] & (1 << (index & 7))
+
+    def _in_pool(self, index):
+        return self._pool[index >> 3] & (1 << (index & 7))
+
+    def _set_free(self, index):
+        if self._is_used(index):
+            self._used[index >> 3] &= ~(1 << (index & 7)) & 0xff
+            self.free_count += 1
+
+    def _set_used(self, index):
+        if not self._is_used(index):
+            self._used[index >> 3] |= 1 << (index & 7)
+            self.free_count -= 1
+
+    def __contains__(self, ip_address):
+        return 0 <= self._index(ip_address) < self._size
+
+    def is_free(self, ip_address):
+        """Return ``True`` when an address can be allocated"""
+        return (ip_address in self and
+                not self._is_used(self._index(ip_address)))
+
+    def reserve(self, ip_address):
+        """Mark an address of the subnet as used
+
+        :returns: ``True`` if the address was free.
+        """
+        if not self.is_free(ip_address):
+            return False
+        self._set_used(self._index(ip_address))
+        return True
+
+    def exclude(self, ip_address):
+        """Take an address out of the pools for good"""
+        if ip_address in self:
+            index = self._index(ip_address)
+            self._set_used(index)
+            self._pool[index >> 3] &= ~(1 << (index & 7)) & 0xff
+
+    def release(self, ip_address):
+        """Mark a used address of the pools as free again"""
+        if ip_address in self:
+            index = self._index(ip_address)
+            if self._in_pool(index) and self._is_used(index):
+                self._set_free(index)
+                self._released.append(index)
+
+    def allocate(self):
+        """Return a free address and mark it as used
+
+        Released addresses are handed out again first. Otherwise the
+        bitmap is scanned from where the previous scan stopped, so
+        allocating every address in turn visits each of them once.
+
+        :returns: The address as a string.
+        :raises: :class:`~ecl.exceptions.AddressExhausted` when every
+                 address is in use.
+        """
+        while self._released:
+            index = self._released.pop()
+            if not self._is_used(index):
+                self._set_used(index)
+                return _to_str(self._first + index)
+        if self.free_count <= 0:
+            raise exceptions.AddressExhausted(
+                "No free address is left in %s" % self.cidr)
+        # There is a free address, so the scan ends within one lap.
+        index = self._cursor
+        while True:
+            if index >= self._size:
+                index = 0
+            if self._used[index >> 3] == 0xff:
+                index = (index | 7) + 1
+                continue
+            if not self._is_used(index):
+                break
+            index += 1
+        self._set_used(index)
+        self._cursor = index + 1
+        return _to_str(self._first + index)
+
+
+class IPAllocator(object):
+    """Free fixed IPs of several subnets, kept in sync with ports.
+
+    :param subnets: Subnets with ``id``, ``cidr``, ``allocation_pools``
+                    and ``gateway_ip``. Subnets other than IPv4 are
+                    ignored.
+    :param ports: The existing ports of those subnets.
+    :param reserved_addresses: Reserved addresses whose ``subnets``
+                               list CIDRs that must never be allocated.
+    """
+
+    def __init__(self, subnets, ports=(), reserved_addresses=()):
+        self._lock = threading.Lock()
+        self._subnets = {}
+        self._ports = {}
+        for subnet in subnets:
+            if getattr(subnet, "ip_version", 4) not in (4, None):
+                continue
+            self._subnets[subnet.id] = SubnetAllocator(
+                subnet.cidr, subnet.allocation_pools, subnet.gateway_ip)
+        for reserved in reserved_addresses:
+            for cidr in reserved.subnets or []:
+                self._exclude_cidr(cidr)
+        for port in ports:
+            self.add_port(port)
+
+    def _exclude_cidr(self, cidr):
+        first, size = _cidr_range(cidr)
+        for allocator in self._subnets.values():
+            start = max(first, allocator._first)
+            end = min(first + size, allocator._first + allocator._size)
+            for value in range(start, end):
+                allocator.exclude(_to_str(value))
+
+    def subnet(self, subnet_id):
+        """Return the :class:`SubnetAllocator` of a subnet"""
+        try:
+            return self._subnets[subnet_id]
+        except KeyError:
+            raise exceptions.ResourceNotFound(
+                "No subnet %s is tracked by this allocator" % subnet_id)
+
+    def allocate(self, subnet_id):
+        """Return a free address of a subnet and mark it as used
+
+        Pass the address to :meth:`release` if no port is created with it.
+
+        :param str subnet_id: The ID of the subnet.
+
+        :returns: The address as a string.
+        :raises: :class:`~ecl.exceptions.AddressExhausted` when every
+                 address of the subnet is in use.
+        """
+        with self._lock:
+            return self.subnet(subnet_id).allocate()
+
+    def fixed_ips(self, subnet_id):
+        """Allocate an address in the form ``create_port`` expects
+
+        :param str subnet_id: The ID of the subnet.
+
+        :returns: A list holding one ``subnet_id`` and ``ip_address`` dict.
+        """
+        return [{"subnet_id": subnet_id,
+                 "ip_address": self.allocate(subnet_id)}]
+
+    def release(self, subnet_id, ip_address):
+        """Make an address of a subnet free again"""
+        with self._lock:
+            self.subnet(subnet_id).release(ip_address)
+
+    def add_port(self, port):
+        """Mark the fixed IPs of a port as used"""
+        fixed_ips = [(fixed_ip.get("subnet_id"), fixed_ip.get("ip_address"))
+                     for fixed_ip in port.fixed_ips or []
+                     if fixed_ip.get("subnet_id") in self._subnets]
+        with self._lock:
+            self._ports[port.id] = fixed_ips
+            for subnet_id, ip_address in fixed_ips:
+                self._subnets[subnet_id].reserve(ip_address)
+
+    def remove_port(self, port_id):
+        """Make the fixed IPs of a port that was deleted free again"""
+        with self._lock:
+            for subnet_id, ip_address in self._ports.pop(port_id, []):
+                self._subnets[subnet_id].release(ip_address)
@@ -3,7 +3,6 @@
 import base
 from ecl.network import network_service
 from ecl import resource2
-from ecl import exceptions
 
 
 class Port(base.NetworkBaseResource):
@@ -19,6 +18,7 @@ class Port(base.NetworkBaseResource):
     allow_update = True
     allow_delete = True
     allow_list = True
+    find_by_id = "uuid"
 
     # query mappings
     _query_mapping = resource2.QueryParameters('description',
@@ -93,39 +93,19 @@ class Port(base.NetworkBaseResource):
         return admin_state
 
     @classmethod
-    def find(cls, session, name_or_id, ignore_missing=False, **params):
-        """Find a resource by its name or id.
+    def bulk_create(cls, session, ports):
+        """Create several ports with a single request
 
         :param session: The session to use for making this request.
         :type session: :class:`~ecl.session.Session`
-        :param name_or_id: This resource's identifier, if needed by
-                           the request. The default is ``None``.
-        :param bool ignore_missing: When set to ``False``
-                    :class:`~ecl.exceptions.ResourceNotFound` will be
-                    raised when the resource does not exist.
-                    When set to ``True``, None will be returned when
-                    attempting to find a nonexistent resource.
-        :param dict params: Any additional parameters to be passed into
-                            underlying methods, such as to
-                            :meth:`~ecl.resource2.Resource.existing`
-                            in order to pass on URI parameters.
-
-        :return: The :class:`Resource` object matching the given name or id
-                 or None if nothing matches.
-        :raises: :class:`ecl.exceptions.DuplicateResource` if more
-                 than one resource is found for this request.
-        :raises: :class:`ecl.exceptions.ResourceNotFound` if nothing
-                 is found and ignore_missing is ``False``.
-        """
-        # Try to short-circuit by looking directly for a matching ID.
-
-        data = cls.list(session, **params)
+        :param list ports: A dict of attributes for each port.
 
-        result = cls._get_one_match(name_or_id, data)
-        if result is not None:
-            return result
-
-        if ignore_missing:
-            return None
-        raise exceptions.ResourceNotFound(
-            "No %s found for %s" % (cls.__name__, name_or_id))
\ No newline at end of file
+        :return: A list of :class:`Port`, in the order given.
+        """
+        body = {cls.resources_key: [
+            cls.new(**attrs)._prepare_request(requires_id=False).body
+            for attrs in ports]}
+        response = session.post(cls.base_path, endpoint_filter=cls.service,
+                                json=body)
+        return [cls.existing(**data)
+                for data in response.json()[cls.resources_key]]
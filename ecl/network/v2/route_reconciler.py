@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+Comparison of desired static routes with the routes that exist.
+"""
+
+import collections
+
+#: The attribute holding the gateway ID for each service type.
+GATEWAY_ATTRS = {
+    "internet": "internet_gw_id",
+    "vpn": "vpn_gw_id",
+    "interdc": "interdc_gw_id",
+    "aws": "aws_gw_id",
+    "gcp": "gcp_gw_id",
+    "azure": "azure_gw_id",
+}
+
+#: The changes needed to reach the desired routes. ``create`` is a list of
+#: dicts of attributes for ``create_static_route``, ``delete`` and
+#: ``unchanged`` are lists of existing routes.
+RoutePlan = collections.namedtuple("RoutePlan",
+                                   ["create", "delete", "unchanged"])
+
+#: What :meth:`~ecl.network.v2._proxy.Proxy.reconcile_static_routes` did.
+#: ``created`` and ``deleted`` are lists of :class:`~ecl.parallel.Outcome`
+#: and ``unchanged`` is a list of routes.
+RouteChanges = collections.namedtuple("RouteChanges",
+                                      ["created", "deleted", "unchanged"])
+
+
+def gateway_of(route):
+    """Return the service type and gateway ID of a route
+
+    :param route: A :class:`~ecl.network.v2.static_route.StaticRoute`.
+    :returns: A ``(service_type, gateway_id)`` tuple.
+    """
+    attr = GATEWAY_ATTRS.get(route.service_type)
+    return route.service_type, getattr(route, attr) if attr else None
+
+
+def route_key(destination, nexthop, gateway_id):
+    """Return the key two routes are compared by"""
+    return destination, nexthop, gateway_id
+
+
+def plan(desired, existing):
+    """Work out which routes to create and delete
+
+    Routes are compared by destination, next hop and gateway ID. Only the
+    gateways in ``desired`` are considered and routes of any other gateway
+    are left alone. Of several existing routes with the same key only the
+    first is kept.
+
+    :param dict desired: Maps a ``(service_type, gateway_id)`` tuple to an
+                         iterable of routes, each a dict with at least a
+                         ``destination`` and ``nexthop`` and optionally a
+                         ``name`` and ``description``.
+    :param existing: An iterable of
+                     :class:`~ecl.network.v2.static_route.StaticRoute`.
+
+    :returns: A :class:`RoutePlan`.
+    :raises: ``ValueError`` for an unknown service type.
+    """
+    wanted = collections.OrderedDict()
+    for (service_type, gateway_id), routes in desired.items():
+        if service_type not in GATEWAY_ATTRS:
+            raise ValueError("Unknown service type %s" % service_type)
+        for route in routes:
+            key = route_key(route["destination"], route["nexthop"],
+                            gateway_id)
+            attrs = dict(route)
+            attrs["service_type"] = service_type
+            attrs[GATEWAY_ATTRS[service_type]] = gateway_id
+            wanted.setdefault(key, attrs)
+
+    create, delete, unchanged = [], [], []
+    seen = set()
+    for route in existing:
+        gateway = gateway_of(route)
+        if gateway not in desired:
+            continue
+        key = route_key(route.destination, route.nexthop, gateway[1])
+        if key in wanted and key not in seen:
+            seen.add(key)
+            unchanged.append(route)
+        else:
+            delete.append(route)
+    create.extend(attrs for key, attrs in wanted.items() if key not in seen)
+    return RoutePlan(create, delete, unchanged)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import collections
 
 from ecl.network import network_service
 from ecl.network.v2.base import NetworkBaseResource
@@ -42,3 +43,14 @@ class TenantConnection(NetworkBaseResource):
         headers = {'Accept': ''}
         return session.post(
             url, endpoint_filter=self.service, headers=headers)
+
+
+#: The result of driving one tenant connection through
+#: :meth:`~ecl.network.v2._proxy.Proxy.run_tenant_connections`. ``spec``
+#: is the dict of arguments it was created from, ``connection`` the
+#: latest :class:`TenantConnection` seen, or ``None`` if creation failed,
+#: ``timings`` an ordered dict of the seconds each stage took, ``stage``
+#: the last stage started and ``exception`` what stopped it, or ``None``.
+ConnectionResult = collections.namedtuple(
+    "ConnectionResult",
+    ["spec", "connection", "timings", "stage", "exception"])
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+An in-memory graph of networks and everything attached to them.
+"""
+
+import collections
+import threading
+
+from ecl import parallel
+from ecl import sync
+
+#: The kinds of resource held by a :class:`Topology`, in the order they
+#: are listed.
+KINDS = ("networks", "subnets", "ports", "firewall_interfaces",
+         "load_balancer_interfaces", "gateway_interfaces")
+
+# The attribute naming the appliance an interface belongs to.
+_DEVICE_ATTRS = {
+    "ports": ("device_id",),
+    "firewall_interfaces": ("firewall_id",),
+    "load_balancer_interfaces": ("load_balancer_id",),
+    "gateway_interfaces": ("internet_gw_id", "vpn_gw_id", "interdc_gw_id",
+                           "aws_gw_id", "gcp_gw_id", "azure_gw_id"),
+}
+
+# The attributes holding IP addresses of an interface.
+_IP_ATTRS = {
+    "firewall_interfaces": ("ip_address", "virtual_ip_address"),
+    "load_balancer_interfaces": ("ip_address", "virtual_ip_address"),
+    "gateway_interfaces": ("primary_ipv4", "secondary_ipv4", "gw_vipv4",
+                           "primary_ipv6", "secondary_ipv6", "gw_vipv6"),
+}
+
+
+def _keys(kind, resource):
+    """Return the index keys of a resource as (index, key) pairs"""
+    if kind == "networks":
+        yield "network", resource.id
+    else:
+        yield "network", getattr(resource, "network_id", None)
+    if kind == "subnets":
+        yield "subnet", resource.id
+    for attr in _DEVICE_ATTRS.get(kind, ()):
+        yield "device", getattr(resource, attr, None)
+    for attr in _IP_ATTRS.get(kind, ()):
+        yield "ip", getattr(resource, attr, None)
+    if kind == "ports":
+        for fixed_ip in getattr(resource, "fixed_ips", None) or []:
+            yield "subnet", fixed_ip.get("subnet_id")
+            yield "ip", fixed_ip.get("ip_address")
+
+
+class Topology(object):
+    """Networks, subnets, ports and appliance interfaces joined together.
+
+    Resources are indexed by network ID, subnet ID, device ID and IP
+    address, so looking up what is attached to any of them does not
+    depend on the size of the tenant. A device is a server or other owner
+    of a port, or the firewall, load balancer or gateway an interface
+    belongs to.
+
+    :param listers: A dict mapping each kind in :data:`KINDS` to a
+                    callable returning every resource of that kind.
+    :param int concurrency: The maximum number of listings in flight.
+    """
+
+    def __init__(self, listers, concurrency=parallel.DEFAULT_CONCURRENCY):
+        self._listers = listers
+        self.concurrency = concurrency
+        self._resources = dict((kind, {}) for kind in listers)
+        self._indexes = dict((name, {})
+                             for name in ("network", "subnet", "device",
+                                          "ip"))
+        self._lock = threading.RLock()
+
+    def refresh(self, kinds=None):
+        """List resources again and re-index only those that changed
+
+        :param kinds: The kinds of resource to list, all of them by
+                      default. Listing only the kinds that are known to
+                      have changed keeps a refresh cheap.
+
+        :returns: A dict mapping each kind listed to a
+                  :class:`~ecl.sync.Changes` of resource IDs.
+        :raises: The first exception raised by any listing, in which case
+                 nothing is changed.
+        """
+        kinds = list(self._listers if kinds is None else kinds)
+        outcomes = parallel.run(lambda kind: list(self._listers[kind]()),
+                                kinds, self.concurrency)
+        for outcome in outcomes:
+            if outcome.exception is not None:
+                raise outcome.exception
+
+        with self._lock:
+            return dict((outcome.item, self._apply(outcome.item,
+                                                   outcome.result))
+                        for outcome in outcomes)
+
+    def _apply(self, kind, resources):
+        old = self._resources[kind]
+        new = {}
+        added, updated, deleted = [], [], []
+        for resource in resources:
+            new[resource.id] = resource
+            previous = old.get(resource.id)
+            if previous is None:
+                added.append(resource.id)
+            elif previous != resource:
+                updated.append(resource.id)
+                self._unindex(kind, previous)
+            else:
+                continue
+            self._index(kind, resource)
+        for id in old:
+            if id not in new:
+                deleted.append(id)
+                self._unindex(kind, old[id])
+        self._resources[kind] = new
+        return sync.Changes(added, updated, deleted)
+
+    def _index(self, kind, resource):
+        for name, key in _keys(kind, resource):
+            if key:
+                by_kind = self._indexes[name].setdefault(key, {})
+                by_kind.setdefault(kind, set()).add(resource.id)
+
+    def _unindex(self, kind, resource):
+        for name, key in _keys(kind, resource):
+            by_kind = self._indexes[name].get(key)
+            if not by_kind or kind not in by_kind:
+                continue
+            by_kind[kind].discard(resource.id)
+            if not by_kind[kind]:
+                del by_kind[kind]
+            if not by_kind:
+                del self._indexes[name][key]
+
+    def _lookup(self, name, key, kinds=None):
+        with self._lock:
+            by_kind = self._indexes[name].get(key, {})
+            result = []
+            for kind in KINDS:
+                if kind in by_kind and (kinds is None or kind in kinds):
+                    resources = self._resources[kind]
+                    result.extend(resources[id]
+                                  for id in sorted(by_kind[kind]))
+            return result
+
+    def get(self, kind, id):
+        """Return a resource of a kind by ID, or ``None``"""
+        return self._resources.get(kind, {}).get(id)
+
+    def resources(self, kind):
+        """Return a list of every resource of a kind"""
+        with self._lock:
+            return list(self._resources.get(kind, {}).values())
+
+    def on_network(self, network_id, kinds=None):
+        """Return the network and everything attached to it
+
+        :param kinds: Only return resources of these kinds.
+        """
+        return self._lookup("network", network_id, kinds)
+
+    def on_subnet(self, subnet_id, kinds=None):
+        """Return the subnet and the ports with an address in it
+
+        :param kinds: Only return resources of these kinds.
+        """
+        return self._lookup("subnet", subnet_id, kinds)
+
+    def of_device(self, device_id, kinds=None):
+        """Return the ports or interfaces of a device
+
+        :param kinds: Only return resources of these kinds.
+        """
+        return self._lookup("device", device_id, kinds)
+
+    def at_ip(self, ip_address, kinds=None):
+        """Return the ports or interfaces that hold an IP address
+
+        :param kinds: Only return resources of these kinds.
+        """
+        return self._lookup("ip", ip_address, kinds)
+
+    def neighbors(self, kind, id, kinds=None):
+        """Return what shares a network with a resource
+
+        For example the servers behind a firewall interface are the
+        ``device_id`` of ``neighbors("firewall_interfaces", id,
+        kinds=["ports"])``.
+
+        :param str kind: The kind of the resource.
+        :param str id: The ID of the resource.
+        :param kinds: Only return resources of these kinds.
+
+        :returns: A list of resources, without the resource itself.
+        """
+        with self._lock:
+            resource = self.get(kind, id)
+            if resource is None:
+                return []
+            seen = set([(kind, id)])
+            result = []
+            network_ids = collections.OrderedDict(
+                (key, None) for name, key in _keys(kind, resource)
+                if name == "network" and key)
+            for network_id in network_ids:
+                for other_kind, by_id in self._indexes["network"].get(
+                        network_id, {}).items():
+                    if kinds is not None and other_kind not in kinds:
+                        continue
+                    for other_id in by_id:
+                        if (other_kind, other_id) not in seen:
+                            seen.add((other_kind, other_id))
+                            result.append(
+                                self._resources[other_kind][other_id])
+            return result
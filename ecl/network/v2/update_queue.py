@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serialized updates of the interfaces of firewalls and load balancers.
+
+An appliance is ``PENDING_UPDATE`` after each change to one of its
+interfaces and rejects further changes until it is ``ACTIVE`` again, so
+changes to one appliance have to be made one at a time while different
+appliances can be changed at once.
+"""
+
+import collections
+import threading
+import time
+
+from concurrent import futures
+
+from ecl import exceptions
+from ecl import parallel
+
+
+class ApplianceUpdateQueue(object):
+    """A work queue per appliance for interface updates.
+
+    Updates of the same appliance are made one after the other, waiting
+    for the appliance to be ``status`` before each of them. Updates of an
+    interface that are still queued are merged into one, later values
+    winning. Appliances are worked on in parallel.
+
+    The queue is a context manager that waits for every update when the
+    block exits.
+
+    :param update: A callable taking the appliance ID, the interface ID
+                   and the attributes to update.
+    :param get_appliance: A callable taking the appliance ID and
+                          returning it with a current ``status``.
+    :param int concurrency: The maximum number of appliances worked on
+                            at once.
+    :param str status: The status an appliance accepts updates in.
+    :param list failures: Statuses that mean an appliance failed.
+    :param interval: Seconds to wait between status checks.
+    :param wait: Seconds to wait for an appliance to reach ``status``.
+    """
+
+    def __init__(self, update, get_appliance,
+                 concurrency=parallel.DEFAULT_CONCURRENCY, status="ACTIVE",
+                 failures=("ERROR",), interval=2, wait=300):
+        self._update = update
+        self._get_appliance = get_appliance
+        self.status = status
+        self.failures = list(failures)
+        self.interval = interval
+        self.wait = wait
+        self._executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+        self._lock = threading.Lock()
+        # Queued updates of each appliance being worked on, mapping an
+        # interface ID to its merged attributes and futures.
+        self._queues = {}
+        self._workers = []
+
+    def submit(self, appliance_id, interface_id, **attrs):
+        """Queue an update of an interface
+
+        :param str appliance_id: The ID of the firewall or load balancer.
+        :param str interface_id: The ID of the interface.
+        :param attrs: The attributes to update.
+
+        :returns: A :class:`concurrent.futures.Future` of the updated
+                  interface, resolved once the appliance is ready for its
+                  next update.
+        """
+        future = futures.Future()
+        with self._lock:
+            queue = self._queues.get(appliance_id)
+            start = queue is None
+            if start:
+                queue = self._queues[appliance_id] = (
+                    collections.OrderedDict())
+            if interface_id in queue:
+                queue[interface_id][0].update(attrs)
+                queue[interface_id][1].append(future)
+            else:
+                queue[interface_id] = (dict(attrs), [future])
+            if start:
+                self._workers.append(
+                    self._executor.submit(self._drain, appliance_id))
+        return future
+
+    def _wait_ready(self, appliance_id):
+        deadline = time.time() + self.wait
+        while True:
+            appliance = self._get_appliance(appliance_id)
+            if appliance.status == self.status:
+                return
+            if appliance.status in self.failures:
+                raise exceptions.ResourceFailure(
+                    "Appliance %s transitioned to failure state %s" %
+                    (appliance_id, appliance.status))
+            if time.time() >= deadline:
+                raise exceptions.ResourceTimeout(
+                    "Timeout waiting for %s to transition to %s" %
+                    (appliance_id, self.status))
+            time.sleep(self.interval)
+
+    def _drain(self, appliance_id):
+        ready = False
+        while True:
+            with self._lock:
+                queue = self._queues[appliance_id]
+                if not queue:
+                    del self._queues[appliance_id]
+                    return
+                interface_id, (attrs, waiters) = queue.popitem(last=False)
+
+            try:
+                if not ready:
+                    self._wait_ready(appliance_id)
+                result = self._update(appliance_id, interface_id, **attrs)
+                ready = False
+                self._wait_ready(appliance_id)
+                ready = True
+            except Exception as e:
+                for future in waiters:
+                    if not future.cancelled():
+                        future.set_exception(e)
+            else:
+                for future in waiters:
+                    if not future.cancelled():
+                        future.set_result(result)
+
+    def join(self):
+        """Wait until every queued update has been made"""
+        while True:
+            with self._lock:
+                workers, self._workers = self._workers, []
+            if not workers:
+                return
+            futures.wait(workers)
+
+    def close(self):
+        """Wait for every queued update and stop the worker threads"""
+        self.join()
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -10,14 +10,28 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import itertools
+
+from ecl import exceptions
 from ecl.object_store.v1 import account as _account
 from ecl.object_store.v1 import container as _container
+from ecl.object_store.v1 import info as _info
 from ecl.object_store.v1 import obj as _obj
+from ecl import parallel
 from ecl import proxy
 
 
 class Proxy(proxy.BaseProxy):
 
+    def get_info(self):
+        """Get the capabilities advertised by the cluster.
+
+        :rtype: :class:`~ecl.object_store.v1.info.Info`
+        :raises: :class:`~ecl.exceptions.ResourceNotFound`
+                 when the cluster does not expose ``/info``.
+        """
+        return self._get(_info.Info)
+
     def get_account_metadata(self):
         """Get metadata for this account.
 
@@ -137,29 +151,37 @@ class Proxy(proxy.BaseProxy):
         res = self._get_resource(_container.Container, container)
         res.delete_metadata(self.session, keys)
 
-    def objects(self, container, **query):
+    def objects(self, container, names_only=False, **query):
         """Return a generator that yields the Container's objects.
 
+        Pages are requested lazily by marker as the generator is consumed,
+        so arbitrarily large containers can be walked without holding
+        the whole listing in memory.
+
         :param container: A container object or the name of a container
             that you want to retrieve objects from.
         :type container:
             :class:`~ecl.object_store.v1.container.Container`
-        :param kwargs \*\*query: Optional query parameters to be sent to limit
-                                 the resources being returned.
+        :param bool names_only: When set to ``True``, yield object names
+            from a ``format=plain`` listing instead of
+            :class:`~ecl.object_store.v1.obj.Object` instances.
+        :param kwargs \*\*query: Optional query parameters to be sent to
+            limit the resources being returned, such as ``prefix``,
+            ``delimiter``, ``marker``, ``end_marker`` and ``limit``.
+            ``limit`` sets the page size.
 
         :rtype: A generator of
-            :class:`~ecl.object_store.v1.obj.Object` objects.
+            :class:`~ecl.object_store.v1.obj.Object` objects, or of
+            names when ``names_only`` is ``True``.
         """
         container = _container.Container.from_id(container)
+        path_args = {"container": container.name}
 
-        objs = _obj.Object.list(self.session,
-                                path_args={"container": container.name},
-                                **query)
-        objs = list(objs)
-        for i in range(len(objs)):
-            objs[i].container = container.name
-
-        return objs
+        if names_only:
+            return _obj.Object.list_names(self.session, path_args=path_args,
+                                          paginated=True, params=query)
+        return _obj.Object.list(self.session, path_args=path_args,
+                                paginated=True, params=query)
 
     def _get_container_name(self, obj, container):
         if isinstance(obj, _obj.Object):
@@ -277,16 +299,24 @@ class Proxy(proxy.BaseProxy):
         return self._head(_obj.Object, obj,
                           path_args={"container": container_name})
 
-    def set_object_metadata(self, obj, container=None, **metadata):
+    def set_object_metadata(self, obj, container=None, refresh=True,
+                            **metadata):
         """Set metadata for an object.
 
-        Note: This method will do an extra HEAD call.
+        Note: This method will do an extra HEAD call unless ``refresh``
+        is ``False``.
 
         :param obj: The value can be the name of an object or a
                     :class:`~ecl.object_store.v1.obj.Object` instance.
         :param container: The value can be the name of a container or a
                :class:`~ecl.object_store.v1.container.Container`
                instance.
+        :param bool refresh: When set to ``False``, the metadata ``obj``
+                             already holds from :meth:`get_object_metadata`
+                             or an earlier metadata update is reused
+                             instead of being read again with a HEAD call.
+                             Objects given by name or from a listing are
+                             still read with a HEAD call.
         :param kwargs metadata: Key/value pairs to be set as metadata
                                 on the container. Both custom and system
                                 metadata can be set. Custom metadata are keys
@@ -305,9 +335,10 @@ class Proxy(proxy.BaseProxy):
         container_name = self._get_container_name(obj, container)
         res = self._get_resource(_obj.Object, obj,
                                  path_args={"container": container_name})
-        res.set_metadata(self.session, metadata)
+        res.set_metadata(self.session, metadata, refresh=refresh)
 
-    def delete_object_metadata(self, obj, container=None, keys=None):
+    def delete_object_metadata(self, obj, container=None, keys=None,
+                               refresh=True):
         """Delete metadata for an object.
 
         :param obj: The value can be the name of an object or a
@@ -316,8 +347,145 @@ class Proxy(proxy.BaseProxy):
                :class:`~ecl.object_store.v1.container.Container`
                instance.
         :param keys: The keys of metadata to be deleted.
+        :param bool refresh: See :meth:`set_object_metadata`.
         """
         container_name = self._get_container_name(obj, container)
         res = self._get_resource(_obj.Object, obj,
                                  path_args={"container": container_name})
-        res.delete_metadata(self.session, keys)
+        res.delete_metadata(self.session, keys, refresh=refresh)
+
+    def set_objects_metadata(self, objects, container=None, refresh=True,
+                             concurrency=parallel.DEFAULT_CONCURRENCY,
+                             **metadata):
+        """Set the same metadata on many objects concurrently.
+
+        :param objects: An iterable of object names or
+                        :class:`~ecl.object_store.v1.obj.Object` instances.
+        :param container: The value can be the name of a container or a
+               :class:`~ecl.object_store.v1.container.Container`
+               instance. It may be omitted if every object carries
+               its container.
+        :param bool refresh: See :meth:`set_object_metadata`. With
+                             ``False``, objects whose metadata is already
+                             known, such as instances updated before,
+                             are updated with one request each instead of
+                             two. Reading the metadata just for this call
+                             saves nothing.
+        :param int concurrency: The maximum number of requests in flight.
+        :param kwargs metadata: Key/value pairs to be set as metadata
+                                on every object.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per object
+                  in the order given. ``exception`` is set on the outcomes
+                  of objects that could not be updated.
+        """
+        def set_one(obj):
+            self.set_object_metadata(obj, container=container,
+                                     refresh=refresh, **metadata)
+
+        return parallel.run(set_one, objects, concurrency)
+
+    def _get_bulk_delete_limit(self):
+        """Return how many names fit in one bulk delete, or 0 if disabled"""
+        try:
+            info = self.get_info()
+        except exceptions.HttpException:
+            return 0
+        if info.bulk_delete is None:
+            return 0
+        return min(info.bulk_delete.get("max_deletes_per_request",
+                                        _obj.BULK_DELETE_MAX),
+                   _obj.BULK_DELETE_MAX)
+
+    def delete_objects(self, objects, container=None,
+                       concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Delete many objects
+
+        When the cluster advertises the bulk middleware, objects are
+        deleted with ``?bulk-delete`` requests of up to
+        ``max_deletes_per_request`` names each. Otherwise they are
+        deleted with concurrent single requests. Objects that do not
+        exist are counted rather than treated as errors.
+
+        :param objects: An iterable of object names or
+                        :class:`~ecl.object_store.v1.obj.Object` instances.
+                        It is consumed lazily, so the generator returned
+                        by :meth:`objects` can be passed directly.
+        :param container: The value can be the name of a container or a
+               :class:`~ecl.object_store.v1.container.Container`
+               instance. It may be omitted if every object carries
+               its container.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: A ``dict`` with ``number_deleted``, ``number_not_found``
+                  and a list of ``(name, status)`` ``errors``.
+        """
+        paths = ("%s/%s" % (self._get_container_name(obj, container),
+                            _obj.Object.get_id(obj))
+                 for obj in objects)
+        result = {"number_deleted": 0, "number_not_found": 0, "errors": []}
+
+        limit = self._get_bulk_delete_limit()
+        if limit:
+            def batches():
+                while True:
+                    batch = list(itertools.islice(paths, limit))
+                    if not batch:
+                        return
+                    yield batch
+
+            def delete_batch(batch):
+                return _obj.Object.bulk_delete(self.session, batch)
+
+            for outcome in parallel.iter_completed(delete_batch, batches(),
+                                                   concurrency):
+                if outcome.exception is not None:
+                    result["errors"].extend(
+                        (path, str(outcome.exception))
+                        for path in outcome.item)
+                    continue
+                for key in ("number_deleted", "number_not_found"):
+                    result[key] += outcome.result.get(key, 0)
+                result["errors"].extend(outcome.result["errors"])
+            return result
+
+        def delete_one(path):
+            container_name, name = path.split("/", 1)
+            _obj.Object.delete_by_id(self.session, name,
+                                     path_args={"container": container_name})
+
+        for outcome in parallel.iter_completed(delete_one, paths,
+                                               concurrency):
+            if outcome.exception is None:
+                result["number_deleted"] += 1
+            elif isinstance(outcome.exception,
+                            exceptions.NotFoundException):
+                result["number_not_found"] += 1
+            else:
+                result["errors"].append((outcome.item,
+                                         str(outcome.exception)))
+        return result
+
+    def upload_archive(self, data, container=None, archive_format="tar",
+                       prefix=None):
+        """Upload the contents of an archive as individual objects
+
+        The archive is expanded server side by the bulk middleware.
+
+        :param data: The archive as bytes or a file-like object. File-like
+                     objects are streamed rather than read into memory.
+        :param container: The value can be the name of a container or a
+               :class:`~ecl.object_store.v1.container.Container`
+               instance.
+        :param archive_format: One of ``tar``, ``tar.gz`` or ``tar.bz2``.
+        :param prefix: An optional pseudo-directory to prepend to the
+                       name of every extracted object.
+
+        :returns: A ``dict`` with ``number_files_created`` and a list of
+                  ``(name, status)`` ``errors``.
+        """
+        container_name = self._get_container_name(None, container)
+        return _obj.Object.extract_archive(self.session, container_name,
+                                           data,
+                                           archive_format=archive_format,
+                                           prefix=prefix)
@@ -0,0 +1,62 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from six.moves.urllib import parse
+
+from ecl.object_store import object_store_service
+from ecl import resource
+
+
+class Info(resource.Resource):
+    """The capabilities advertised by the cluster at ``/info``."""
+
+    base_path = "/info"
+    service = object_store_service.ObjectStoreService()
+
+    allow_retrieve = True
+
+    #: Core settings of the cluster such as ``max_file_size``.
+    swift = resource.prop("swift")
+    #: Settings of the bulk delete middleware, if it is enabled.
+    bulk_delete = resource.prop("bulk_delete")
+    #: Settings of the bulk upload (extract archive) middleware,
+    #: if it is enabled.
+    bulk_upload = resource.prop("bulk_upload")
+    #: Settings of the static large object middleware, if it is enabled.
+    slo = resource.prop("slo")
+    #: Settings of the temporary URL middleware, if it is enabled.
+    tempurl = resource.prop("tempurl")
+
+    @staticmethod
+    def _get_info_url(endpoint):
+        """Return the ``/info`` URL for an object store endpoint
+
+        The account endpoint from the service catalog looks like
+        ``https://host/v1/AUTH_project`` while ``/info`` lives next to
+        the version, outside of the account.
+        """
+        parts = parse.urlsplit(endpoint)
+        path = parts.path
+        index = path.find("/v1")
+        path = path[:index] if index >= 0 else ""
+        return parse.urlunsplit((parts.scheme, parts.netloc,
+                                 path + Info.base_path, "", ""))
+
+    def get(self, session, include_headers=False, args=None):
+        endpoint = session.get_endpoint(
+            service_type=self.service.service_type,
+            interface=self.service.interface)
+        resp = session.get(self._get_info_url(endpoint),
+                           endpoint_filter=self.service)
+        self._update_attrs_from_response(resp.json())
+        self._loaded = True
+        return self
@@ -13,11 +13,34 @@
 
 import copy
 
+import six
+from six.moves.urllib import parse
+
+from ecl import exceptions
 from ecl.object_store import object_store_service
 from ecl.object_store.v1 import _base
 from ecl import resource
 
 
+#: The largest number of names the bulk middleware accepts by default
+#: in a single bulk delete request.
+BULK_DELETE_MAX = 10000
+
+
+def _parse_bulk_response(body):
+    """Normalize the summary returned by the bulk middleware
+
+    The middleware always answers ``200 OK`` and reports the real
+    outcome in the body, e.g. ``{"Number Deleted": 2, "Errors": []}``.
+    Keys are lowered and joined with underscores.
+    """
+    result = {}
+    for key, value in body.items():
+        result[key.lower().replace(" ", "_")] = value
+    result["errors"] = [tuple(error) for error in result.get("errors", [])]
+    return result
+
+
 class Object(_base.BaseResource):
     _custom_metadata_prefix = "X-Object-Meta-"
     _system_metadata = {
@@ -48,6 +71,10 @@ class Object(_base.BaseResource):
     container = resource.prop("container")
     #: The unique name for the object.
     name = resource.prop("name")
+    #: Set on entries that represent a pseudo-directory when listing with
+    #: a ``delimiter``. The value is the common prefix, such as
+    #: ``photos/``, and ``name`` carries the same value.
+    subdir = resource.prop("subdir")
 
     # Object details
     hash = resource.prop("hash")
@@ -160,43 +187,76 @@ class Object(_base.BaseResource):
     #: COPY operation to copy an object.
     copy_from = resource.header("x-copy-from")
 
+    # Whether this instance holds all of the object's metadata, which is
+    # only the case after a HEAD or after metadata was POSTed through it.
+    _metadata_known = False
+
+    def head(self, session):
+        super(Object, self).head(session)
+        self._metadata_known = True
+        return self
+
+    def _current_metadata(self, session, refresh):
+        """Return the custom and system metadata to preserve on POST
+
+        A POST replaces all of an object's metadata, so the current values
+        must be sent along with the changes. They are read with a HEAD
+        request unless ``refresh`` is ``False`` and this instance already
+        holds them from an earlier HEAD or POST. An object known only by
+        name or from a listing is always read first, so its metadata is
+        never wiped.
+        """
+        obj = self
+        if refresh or not self._metadata_known:
+            obj = self.head(session)
+        metadata = copy.deepcopy(obj.metadata)
+
+        # Include any original system metadata so it doesn't get erased on POST
+        for key in self._system_metadata:
+            value = getattr(obj, key)
+            if value and key not in metadata:
+                metadata[key] = value
+        return metadata
+
     # The Object Store treats the metadata for its resources inconsistently so
     # Object.set_metadata must override the BaseResource.set_metadata to
     # account for it.
-    def set_metadata(self, session, metadata):
+    def set_metadata(self, session, metadata, refresh=True):
+        """Set metadata on this object, preserving what is already there.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param dict metadata: The metadata to add or change.
+        :param bool refresh: When ``True``, the current metadata is read
+                             with a HEAD request first. When ``False``, the
+                             metadata this instance got from an earlier
+                             HEAD or metadata update is used instead and
+                             only a POST is sent. Other instances are still
+                             read with a HEAD request first.
+        """
         # Filter out items with empty values so the create metadata behaviour
         # is the same as account and container
         filtered_metadata = \
-            {key: value for key, value in metadata.iteritems() if value}
+            {key: value for key, value in six.iteritems(metadata) if value}
 
-        # Get a copy of the original metadata so it doesn't get erased on POST
-        # and update it with the new metadata values.
-        obj = self.head(session)
-        metadata2 = copy.deepcopy(obj.metadata)
+        metadata2 = self._current_metadata(session, refresh)
         metadata2.update(filtered_metadata)
 
-        # Include any original system metadata so it doesn't get erased on POST
-        for key in self._system_metadata:
-            value = getattr(obj, key)
-            if value and key not in metadata2:
-                metadata2[key] = value
-
         super(Object, self).set_metadata(session, metadata2)
+        self._remember_metadata(metadata2)
 
     # The Object Store treats the metadata for its resources inconsistently so
     # Object.delete_metadata must override the BaseResource.delete_metadata to
     # account for it.
-    def delete_metadata(self, session, keys):
-        # Get a copy of the original metadata so it doesn't get erased on POST
-        # and update it with the new metadata values.
-        obj = self.head(session)
-        metadata = copy.deepcopy(obj.metadata)
+    def delete_metadata(self, session, keys, refresh=True):
+        """Delete metadata from this object, preserving the rest.
 
-        # Include any original system metadata so it doesn't get erased on POST
-        for key in self._system_metadata:
-            value = getattr(obj, key)
-            if value:
-                metadata[key] = value
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param keys: The keys of metadata to be deleted.
+        :param bool refresh: See :meth:`set_metadata`.
+        """
+        metadata = self._current_metadata(session, refresh)
 
         # Remove the metadata
         for key in keys:
@@ -208,6 +268,20 @@ class Object(_base.BaseResource):
         url = self._get_url(self, self.id)
         session.post(url, endpoint_filter=self.service,
                      headers=self._calculate_headers(metadata))
+        self._remember_metadata(metadata)
+        for key in self._system_metadata:
+            if key not in metadata and getattr(self, key):
+                setattr(self, key, None)
+
+    def _remember_metadata(self, metadata):
+        """Record metadata that was just POSTed as this instance's state
+
+        This keeps a sequence of updates on one instance with
+        ``refresh=False`` consistent without further HEAD requests.
+        """
+        self._metadata_known = True
+        self.metadata = dict((key, value) for key, value in metadata.items()
+                             if key not in self._system_metadata)
 
     def get(self, session, include_headers=False, args=None):
         url = self._get_url(self, self.id)
@@ -231,3 +305,136 @@ class Object(_base.BaseResource):
                                 headers=headers).headers
         self.set_headers(resp)
         return self
+
+    @classmethod
+    def _iter_listing(cls, session, path_args, paginated, params, fmt):
+        """Yield raw listing entries, requesting pages as they are needed
+
+        With ``format=json`` each entry is a ``dict``; with
+        ``format=plain`` each entry is a name.
+        """
+        if not cls.allow_list:
+            raise exceptions.MethodNotSupported(cls, 'list')
+
+        params = dict(params or {})
+        params["format"] = fmt
+        url = cls._get_url(path_args)
+        accept = "application/json" if fmt == "json" else "text/plain"
+
+        while True:
+            resp = session.get(url, endpoint_filter=cls.service,
+                               headers={"Accept": accept}, params=params)
+            # An empty container answers 204 with no body.
+            if not resp.content:
+                return
+            if fmt == "json":
+                entries = resp.json()
+            else:
+                entries = resp.text.splitlines()
+            if not entries:
+                return
+
+            for entry in entries:
+                yield entry
+
+            if not paginated:
+                return
+            if "limit" in params and len(entries) < params["limit"]:
+                return
+            last = entries[-1]
+            if fmt == "json":
+                last = last.get("name", last.get("subdir"))
+            params["marker"] = last
+
+    @classmethod
+    def list(cls, session, path_args=None, paginated=False, params=None):
+        """Yield the objects of a container.
+
+        Pages are requested lazily, so only one page is held in memory
+        at a time. Supported ``params`` include ``limit``, ``marker``,
+        ``end_marker``, ``prefix``, ``delimiter`` and ``path``. When a
+        ``delimiter`` is given, pseudo-directories are yielded as objects
+        with :attr:`subdir` set.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param dict path_args: Must contain the ``container`` name.
+        :param bool paginated: ``True`` to follow markers until the
+                               listing is exhausted.
+        :param dict params: Query parameters for the listing.
+
+        :return: A generator of :class:`Object` instances.
+        """
+        container = path_args.get("container") if path_args else None
+        for data in cls._iter_listing(session, path_args, paginated,
+                                      params, "json"):
+            if "subdir" in data:
+                data = {"name": data["subdir"], "subdir": data["subdir"]}
+            value = cls.existing(**data)
+            value.container = container
+            yield value
+
+    @classmethod
+    def list_names(cls, session, path_args=None, paginated=False,
+                   params=None):
+        """Yield only the names of the objects of a container.
+
+        This uses ``format=plain`` listings, which are far cheaper to
+        produce and parse than JSON when nothing but names is needed.
+        Parameters are the same as for :meth:`list`.
+
+        :return: A generator of object names.
+        """
+        return cls._iter_listing(session, path_args, paginated, params,
+                                 "plain")
+
+    @classmethod
+    def bulk_delete(cls, session, paths):
+        """Delete objects with a single request to the bulk middleware.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param paths: The ``container/object`` names to delete. No more
+                      than the cluster's ``max_deletes_per_request``
+                      names may be given.
+
+        :return: A ``dict`` with ``number_deleted``, ``number_not_found``,
+                 ``response_status`` and a list of ``(name, status)``
+                 ``errors``.
+        """
+        lines = []
+        for path in paths:
+            if isinstance(path, six.text_type):
+                path = path.encode("utf-8")
+            lines.append(parse.quote(path))
+        headers = {"Content-Type": "text/plain",
+                   "Accept": "application/json"}
+        resp = session.post("/", endpoint_filter=cls.service,
+                            params={"bulk-delete": ""},
+                            data="\n".join(lines), headers=headers)
+        return _parse_bulk_response(resp.json())
+
+    @classmethod
+    def extract_archive(cls, session, container, data,
+                        archive_format="tar", prefix=None):
+        """Create objects from an archive with the bulk middleware.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~ecl.session.Session`
+        :param container: The name of the container to extract into.
+        :param data: The archive as bytes or a file-like object. File-like
+                     objects are streamed rather than read into memory.
+        :param archive_format: One of ``tar``, ``tar.gz`` or ``tar.bz2``.
+        :param prefix: An optional pseudo-directory to prepend to the
+                       name of every extracted object.
+
+        :return: A ``dict`` with ``number_files_created``,
+                 ``response_status`` and a list of ``(name, status)``
+                 ``errors``.
+        """
+        url = cls._get_url({"container": container}, prefix)
+        headers = {"Accept": "application/json"}
+        resp = session.put(url, endpoint_filter=cls.service,
+                           params={"extract-archive": archive_format},
+                           data=data, headers=headers)
+        return _parse_bulk_response(resp.json())
@@ -0,0 +1,159 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Helpers for issuing independent API calls concurrently.
+
+Proxy methods that operate on many resources at once use these helpers
+to fan requests out over a bounded pool of threads. Every call produces
+an :class:`Outcome`, so a failure for one item never aborts the others.
+"""
+
+import collections
+import itertools
+import threading
+import time
+
+from concurrent import futures
+
+#: The number of calls that are in flight at once unless told otherwise.
+DEFAULT_CONCURRENCY = 10
+
+#: The result of calling a function on a single item. Exactly one of
+#: ``result`` and ``exception`` is meaningful; ``exception`` is ``None``
+#: when the call succeeded.
+Outcome = collections.namedtuple("Outcome", ["item", "result", "exception"])
+
+#: A clock that is not affected by changes to the system time, where the
+#: running Python offers one.
+_clock = getattr(time, "monotonic", time.time)
+
+
+class RateLimiter(object):
+    """Space out calls made from any number of threads.
+
+    :param float rate: The maximum number of calls started per second.
+    :param clock: A callable returning the current time in seconds.
+    :param sleep: A callable that sleeps for a number of seconds.
+    """
+
+    def __init__(self, rate, clock=_clock, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._clock = clock
+        self._sleep = sleep
+        self._next = None
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may start its next call"""
+        with self._lock:
+            now = self._clock()
+            start = now if self._next is None else max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            self._sleep(start - now)
+
+
+def iter_completed(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """Call ``func`` on every item and yield outcomes as they complete.
+
+    Items are consumed lazily, so ``items`` may be an unbounded generator;
+    no more than ``concurrency`` calls are ever in flight.
+
+    :param func: A callable taking a single item.
+    :param items: An iterable of items to pass to ``func``.
+    :param int concurrency: The maximum number of concurrent calls.
+
+    :return: A generator of :class:`Outcome` in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    items = iter(items)
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        for item in itertools.islice(items, concurrency):
+            pending[executor.submit(func, item)] = item
+
+        while pending:
+            done, _ = futures.wait(list(pending),
+                                   return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                # Keep the pool busy before handing control to the caller.
+                for next_item in itertools.islice(items, 1):
+                    pending[executor.submit(func, next_item)] = next_item
+
+                exc = future.exception()
+                if exc is not None:
+                    yield Outcome(item, None, exc)
+                else:
+                    yield Outcome(item, future.result(), None)
+
+
+def iter_ordered(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """Call ``func`` on every item and yield outcomes in input order.
+
+    Items are consumed lazily and each outcome is yielded as soon as it
+    and every outcome before it are complete. No more than
+    ``concurrency`` calls are in flight or waiting to be yielded.
+
+    :param func: A callable taking a single item.
+    :param items: An iterable of items to pass to ``func``.
+    :param int concurrency: The maximum number of concurrent calls.
+
+    :return: A generator of :class:`Outcome` in the order the items were
+             given.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    items = iter(items)
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = collections.deque(
+            (item, executor.submit(func, item))
+            for item in itertools.islice(items, concurrency))
+
+        while pending:
+            item, future = pending.popleft()
+            exc = future.exception()
+            for next_item in itertools.islice(items, 1):
+                pending.append((next_item, executor.submit(func, next_item)))
+
+            if exc is not None:
+                yield Outcome(item, None, exc)
+            else:
+                yield Outcome(item, future.result(), None)
+
+
+def run(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """Call ``func`` on every item and return outcomes in input order.
+
+    :param func: A callable taking a single item.
+    :param items: An iterable of items to pass to ``func``.
+    :param int concurrency: The maximum number of concurrent calls.
+
+    :return: A list of :class:`Outcome`, one per item, in the order
+             the items were given.
+    """
+    items = list(items)
+    outcomes = [None] * len(items)
+
+    def call(index):
+        return func(items[index])
+
+    for outcome in iter_completed(call, range(len(items)), concurrency):
+        outcomes[outcome.item] = Outcome(items[outcome.item], outcome.result,
+                                         outcome.exception)
+    return outcomes
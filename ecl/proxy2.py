@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from ecl import cache
 from ecl import exceptions
 from ecl import resource2
 
@@ -40,8 +41,90 @@ def _check_resource(strict=False):
 
 class BaseProxy(object):
 
-    def __init__(self, session):
+    #: Seconds that resources seen in responses are remembered for by
+    #: :meth:`_find` when the proxy is not given a shared index. The index
+    #: is off when it is ``None`` or ``0``, so :meth:`_find` always asks
+    #: the API.
+    resource_index_ttl = None
+
+    #: The most resources the index remembers at once.
+    resource_index_size = 1000
+
+    def __init__(self, session, resource_index=None):
+        """Create a proxy
+
+        :param session: The :class:`~ecl.session.Session` to send
+                        requests with.
+        :param resource_index: A :class:`~ecl.cache.ResourceIndex` shared
+                               with other proxies, such as the one of a
+                               :class:`~ecl.connection.Connection`.
+                               Without it the proxy keeps an index of its
+                               own when :attr:`resource_index_ttl` is set.
+        """
         self.session = session
+        self._resource_index = resource_index
+        if resource_index is None and self.resource_index_ttl:
+            self._resource_index = cache.ResourceIndex(
+                self.resource_index_ttl, self.resource_index_size)
+
+    @staticmethod
+    def _uri_attrs(resource_type, attrs):
+        """Return the attributes that are URI parts, by server-side name"""
+        mapping = resource_type._uri_mapping()
+        uri = {}
+        for key, value in attrs.items():
+            if key in mapping:
+                uri[mapping[key]] = value
+            elif key in mapping.values():
+                uri[key] = value
+        return uri
+
+    @staticmethod
+    def _index_scope(resource_type, uri):
+        """Return the resource index scope of a type under a parent URI"""
+        service_type = getattr(resource_type.service, "service_type", None)
+        parents = tuple(sorted((key, resource2.Resource._get_id(value))
+                               for key, value in uri.items()))
+        return (service_type, resource_type, parents)
+
+    def _remember(self, resource_type, res, uri=None):
+        """Add a resource from a response to the resource index"""
+        if (self._resource_index is None or
+                not isinstance(res, resource2.Resource)):
+            return res
+        try:
+            id = res.id
+        except KeyError:
+            # Neither an id nor an alternate id was returned.
+            return res
+        if uri is None:
+            uri = res._uri.attributes
+        self._resource_index.add(self._index_scope(resource_type, uri),
+                                 id, res.name, res.to_dict(ignore_none=True))
+        return res
+
+    def _remember_all(self, resource_type, results, uri):
+        if self._resource_index is None:
+            return results
+        return self._remember_each(resource_type, results, uri)
+
+    def _remember_each(self, resource_type, results, uri):
+        for res in results:
+            yield self._remember(resource_type, res, uri)
+
+    def _forget(self, resource_type):
+        """Drop what the resource index knows about a resource type
+
+        Related types, such as a detailed listing of the same resources,
+        are dropped as well.
+        """
+        if self._resource_index is None:
+            return
+
+        def related(scope):
+            return (issubclass(scope[1], resource_type) or
+                    issubclass(resource_type, scope[1]))
+        self._resource_index.invalidate(related)
 
     def _get_resource(self, resource_type, value, **attrs):
         """Get a resource object to work on
@@ -100,9 +183,21 @@ class BaseProxy(object):
 
         :returns: An instance of ``resource_type`` or None
         """
-        return resource_type.find(self.session, name_or_id,
-                                  ignore_missing=ignore_missing,
-                                  **attrs)
+        # Resources seen recently in responses through this proxy are
+        # answered without a request, unless query parameters narrow
+        # the search.
+        uri = self._uri_attrs(resource_type, attrs)
+        if self._resource_index is not None and len(uri) == len(attrs):
+            known = self._resource_index.lookup(
+                self._index_scope(resource_type, uri), name_or_id)
+            if known is not None:
+                known.update(uri)
+                return resource_type.existing(**known)
+
+        res = resource_type.find(self.session, name_or_id,
+                                 ignore_missing=ignore_missing,
+                                 **attrs)
+        return self._remember(resource_type, res, uri)
 
     @_check_resource(strict=False)
     def _delete(self, resource_type, value, ignore_missing=False, **attrs):
@@ -147,6 +242,8 @@ class BaseProxy(object):
                     details=e.details, response=e.response,
                     request_id=e.request_id, url=e.url, method=e.method,
                     http_status=e.http_status, cause=e.cause)
+        finally:
+            self._forget(resource_type)
 
         return rv
 
@@ -170,7 +267,10 @@ class BaseProxy(object):
         :rtype: :class:`~ecl.resource2.Resource`
         """
         res = self._get_resource(resource_type, value, **attrs)
-        return res.update(self.session)
+        try:
+            return res.update(self.session)
+        finally:
+            self._forget(resource_type)
 
     def _create(self, resource_type, **attrs):
         """Create a resource from attributes
@@ -190,7 +290,10 @@ class BaseProxy(object):
         :rtype: :class:`~ecl.resource2.Resource`
         """
         res = resource_type.new(**attrs)
-        return res.create(self.session)
+        try:
+            return res.create(self.session)
+        finally:
+            self._forget(resource_type)
 
     @_check_resource(strict=False)
     def _get(self, resource_type, value=None, requires_id=True, **attrs):
@@ -214,7 +317,8 @@ class BaseProxy(object):
         res = self._get_resource(resource_type, value, **attrs)
 
         try:
-            return res.get(self.session, requires_id=requires_id)
+            return self._remember(
+                resource_type, res.get(self.session, requires_id=requires_id))
         except exceptions.NotFoundException as e:
             raise exceptions.ResourceNotFound(
                 message="No %s found for %s" %
@@ -247,7 +351,9 @@ class BaseProxy(object):
                  the ``resource_type``.
         """
         res = self._get_resource(resource_type, value, **attrs)
-        return res.list(self.session, paginated=paginated, **attrs)
+        results = res.list(self.session, paginated=paginated, **attrs)
+        return self._remember_all(resource_type, results,
+                                  self._uri_attrs(resource_type, attrs))
 
     def _head(self, resource_type, value=None, **attrs):
         """Retrieve a resource's header
@@ -247,6 +247,17 @@ class Resource(object):
     #: Use PUT for create operations on this resource.
     put_create = False
 
+    #: How :meth:`find` may look this resource up directly by its ID when
+    #: :data:`Resource.allow_get` is set. ``True`` always tries a GET first,
+    #: ``"uuid"`` only tries it when the value looks like a UUID, as IDs
+    #: of the resource always do, and ``False`` never tries it, e.g. when
+    #: the API answers unknown IDs with something other than a 404.
+    find_by_id = True
+    #: The client-side query parameter :meth:`find` uses to have the
+    #: server filter a listing by name. It is only used when it is also
+    #: a key of :data:`Resource._query_mapping`.
+    find_name_query = "name"
+
     def __init__(self, synchronized=False, **attrs):
         # NOTE: _collect_attrs modifies **attrs in place, removing
         # items as they match up with any of the body, header,
@@ -759,10 +770,25 @@ class Resource(object):
 
         return the_result
 
+    @classmethod
+    def _should_find_by_id(cls, name_or_id):
+        """Return ``True`` if :meth:`find` should GET ``name_or_id``"""
+        if not cls.allow_get:
+            return False
+        if cls.find_by_id == "uuid":
+            return utils.is_uuid_like(name_or_id)
+        return bool(cls.find_by_id)
+
     @classmethod
     def find(cls, session, name_or_id, ignore_missing=False, **params):
         """Find a resource by its name or id.
 
+        The lookup is driven by :data:`Resource.find_by_id` and
+        :data:`Resource.find_name_query`: a GET by ID is tried first when
+        allowed, then a listing filtered by name on the server where
+        possible. The listing is consumed lazily and stops as soon as a
+        second match shows the name is ambiguous.
+
         :param session: The session to use for making this request.
         :type session: :class:`~ecl.session.Session`
         :param name_or_id: This resource's identifier, if needed by
@@ -785,13 +811,24 @@ class Resource(object):
                  is found and ignore_missing is ``False``.
         """
         # Try to short-circuit by looking directly for a matching ID.
-        try:
-            match = cls.existing(id=name_or_id, **params)
-            return match.get(session)
-        except exceptions.NotFoundException:
-            pass
-
-        data = cls.list(session, **params)
+        by_id = cls._should_find_by_id(name_or_id)
+        if by_id:
+            try:
+                match = cls.existing(id=name_or_id, **params)
+                return match.get(session)
+            except exceptions.NotFoundException:
+                pass
+
+        # Once the value is ruled out as an ID, let the server filter the
+        # collection by name rather than downloading all of it.
+        query = dict(params)
+        name_query = cls.find_name_query
+        if name_query in cls._query_mapping._mapping and (
+                by_id or cls.find_by_id == "uuid" and
+                not utils.is_uuid_like(name_or_id)):
+            query[name_query] = name_or_id
+
+        data = cls.list(session, **query)
 
         result = cls._get_one_match(name_or_id, data)
         if result is not None:
@@ -0,0 +1,210 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Local copies of collections kept up to date incrementally.
+
+APIs that can list only what changed since a point in time let a client
+keep a collection current at a cost proportional to the number of
+changes rather than the size of the collection.
+"""
+
+import collections
+import threading
+
+from ecl import parallel
+
+#: What a refresh changed. Each field is a list of keys.
+Changes = collections.namedtuple("Changes", ["added", "updated", "deleted"])
+
+
+class DeltaSync(object):
+    """A local map of records refreshed from incremental listings.
+
+    The first refresh lists everything. Each later refresh only asks for
+    records changed since the newest change seen so far, the high-water
+    mark, and applies them as additions, updates or deletions.
+
+    :param list_changes: A callable taking the high-water mark, or
+                         ``None`` for a full listing, and returning an
+                         iterable of records.
+    :param key: A callable returning the key of a record.
+    :param changed_at: A callable returning when a record last changed,
+                       as a value that sorts chronologically, or ``None``.
+    :param is_deleted: A callable returning ``True`` for records that
+                       report a deletion.
+    """
+
+    def __init__(self, list_changes, key, changed_at, is_deleted):
+        self._list_changes = list_changes
+        self._key = key
+        self._changed_at = changed_at
+        self._is_deleted = is_deleted
+        self._records = {}
+        self._lock = threading.Lock()
+        #: The newest change applied so far, or ``None`` before the
+        #: first refresh.
+        self.high_water_mark = None
+
+    def refresh(self, full=False):
+        """Bring the local map up to date
+
+        :param bool full: List everything even when a high-water mark is
+                          known, e.g. to recover from missed deletions.
+
+        :return: A :class:`Changes` describing what the refresh did.
+                 Records listed again with the same contents are not
+                 reported as updated.
+        """
+        with self._lock:
+            since = None if full else self.high_water_mark
+            mark = self.high_water_mark
+            records = {} if since is None else dict(self._records)
+            added, updated, deleted = [], [], []
+
+            for record in self._list_changes(since):
+                key = self._key(record)
+                changed_at = self._changed_at(record)
+                if changed_at is not None and (mark is None or
+                                               changed_at > mark):
+                    mark = changed_at
+
+                if self._is_deleted(record):
+                    if records.pop(key, None) is not None:
+                        deleted.append(key)
+                    continue
+                if key not in self._records:
+                    added.append(key)
+                elif self._records[key] != record:
+                    updated.append(key)
+                records[key] = record
+
+            if since is None:
+                deleted.extend(key for key in self._records
+                               if key not in records)
+            self._records = records
+            self.high_water_mark = mark
+            return Changes(added, updated, deleted)
+
+    def get(self, key, default=None):
+        """Return the record for a key, or default"""
+        return self._records.get(key, default)
+
+    def keys(self):
+        """Return a list of the keys of every record"""
+        return list(self._records)
+
+    def values(self):
+        """Return a list of every record"""
+        return list(self._records.values())
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def __len__(self):
+        return len(self._records)
+
+
+class CollectionCache(object):
+    """Several collections listed together and kept for reading.
+
+    Every refresh lists all collections concurrently and records what
+    changed since the previous refresh. Refreshes can run on a schedule
+    in a background thread, so readers never wait for the API.
+
+    :param dict listers: Maps the name of each collection to a callable
+                         returning all of its resources.
+    :param float interval: Seconds between background refreshes.
+    :param int concurrency: The maximum number of listings in flight.
+    """
+
+    def __init__(self, listers, interval=300,
+                 concurrency=parallel.DEFAULT_CONCURRENCY):
+        self.interval = interval
+        self.concurrency = concurrency
+        self._syncs = dict(
+            (name, DeltaSync(lambda since, list_all=list_all: list_all(),
+                             key=lambda resource: resource.id,
+                             changed_at=lambda resource: None,
+                             is_deleted=lambda resource: False))
+            for name, list_all in listers.items())
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        #: What the latest refresh changed, as a dict mapping the name
+        #: of each collection to :class:`Changes` of resource IDs, or
+        #: ``None`` before the first refresh.
+        self.changes = None
+        #: The exception raised by the latest background refresh, or
+        #: ``None`` if it succeeded.
+        self.last_error = None
+
+    def refresh(self):
+        """List every collection again
+
+        A collection whose listing fails keeps its previous contents.
+
+        :returns: The new :attr:`changes`.
+        :raises: The first exception raised by any listing.
+        """
+        with self._lock:
+            outcomes = parallel.run(
+                lambda name: self._syncs[name].refresh(full=True),
+                sorted(self._syncs), self.concurrency)
+            self.changes = dict((outcome.item, outcome.result or
+                                 Changes([], [], []))
+                                for outcome in outcomes)
+        for outcome in outcomes:
+            if outcome.exception is not None:
+                raise outcome.exception
+        return self.changes
+
+    def get(self, name):
+        """Return the resources of a collection
+
+        The collections are listed first if they never were.
+        """
+        if self.changes is None:
+            self.refresh()
+        return self._syncs[name].values()
+
+    def find(self, name, id, default=None):
+        """Return a resource of a collection by ID, or default"""
+        if self.changes is None:
+            self.refresh()
+        return self._syncs[name].get(id, default)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+    def start(self):
+        """Refresh every :attr:`interval` seconds in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stop refreshing in the background"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -10,19 +10,32 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import datetime
+import itertools
+
+from ecl import parallel
 from ecl import proxy
 from ecl.telemetry.v2 import alarm as _alarm
 from ecl.telemetry.v2 import alarm_change as _alarm_change
+from ecl.telemetry.v2 import arrays
 from ecl.telemetry.v2 import capability
 from ecl.telemetry.v2 import meter as _meter
+from ecl.telemetry.v2 import query as _query
 from ecl.telemetry.v2 import resource as _resource
 from ecl.telemetry.v2 import sample
+from ecl.telemetry.v2 import sample_buffer
+from ecl.telemetry.v2 import sample_store
 from ecl.telemetry.v2 import statistics
 
 
 class Proxy(proxy.BaseProxy):
     """.. caution:: This API is a work in progress and is subject to change."""
 
+    def __init__(self, session):
+        super(Proxy, self).__init__(session)
+        self._sample_store = None
+
     def create_alarm(self, **attrs):
         """Create a new alarm from attributes
 
@@ -231,6 +244,74 @@ class Proxy(proxy.BaseProxy):
         """
         return self._create(sample.Sample, **attrs)
 
+    def create_samples(self, samples, batch_size=100,
+                       concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Create many samples
+
+        Samples are grouped by meter and each group is sent in batches of
+        ``batch_size`` with a single request each.
+
+        :param samples: An iterable of dicts, each holding the attributes
+                        of :meth:`create_sample` for one sample, with the
+                        meter name as ``counter_name`` or ``meter``.
+        :param int batch_size: The maximum number of samples per request.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: A list of :class:`~ecl.parallel.Outcome`, one per sample
+                  in the order given, whose result is the
+                  :class:`~ecl.telemetry.v2.sample.Sample`. Samples without
+                  a meter name are not sent and have a ``ValueError``.
+        """
+        samples = [dict(attrs) for attrs in samples]
+        outcomes = [None] * len(samples)
+        by_meter = collections.OrderedDict()
+        for index, attrs in enumerate(samples):
+            meter = attrs.get('counter_name') or attrs.get('meter')
+            if not meter:
+                outcomes[index] = parallel.Outcome(attrs, None, ValueError(
+                    "A sample needs a counter_name or meter"))
+                continue
+            by_meter.setdefault(meter, []).append(index)
+        batches = [(meter, indexes[i:i + batch_size])
+                   for meter, indexes in by_meter.items()
+                   for i in range(0, len(indexes), batch_size)]
+
+        def create_batch(batch):
+            meter, indexes = batch
+            return sample.Sample.create_many(
+                self.session, meter, [samples[i] for i in indexes])
+
+        for outcome in parallel.run(create_batch, batches, concurrency):
+            created = outcome.result or [None] * len(outcome.item[1])
+            for index, result in zip(outcome.item[1], created):
+                outcomes[index] = parallel.Outcome(samples[index], result,
+                                                   outcome.exception)
+        return outcomes
+
+    def sample_buffer(self, max_batch=100, max_latency=1.0, on_error=None,
+                      concurrency=parallel.DEFAULT_CONCURRENCY):
+        """Return a buffer that creates samples in the background
+
+        Samples added to the buffer are created with
+        :meth:`create_samples` from a daemon thread once ``max_batch`` of
+        them are waiting or the oldest has waited ``max_latency`` seconds.
+        Close the buffer, or use it as a context manager, to create the
+        samples left in it.
+
+        :param int max_batch: The most samples sent in one request.
+        :param float max_latency: The most seconds a sample is buffered.
+        :param on_error: A callable taking the
+                         :class:`~ecl.parallel.Outcome` of each sample that
+                         could not be created.
+        :param int concurrency: The maximum number of requests in flight.
+
+        :returns: A :class:`~ecl.telemetry.v2.sample_buffer.SampleBuffer`.
+        """
+        return sample_buffer.SampleBuffer(
+            lambda samples: self.create_samples(samples, max_batch,
+                                                concurrency),
+            max_batch, max_latency, on_error)
+
     def find_sample(self, name_or_id, ignore_missing=False):
         """Find a single sample
 
@@ -245,19 +326,75 @@ class Proxy(proxy.BaseProxy):
         return self._find(sample.Sample, name_or_id,
                           ignore_missing=ignore_missing)
 
-    def samples(self, meter, **query):
+    def samples(self, meter, as_arrays=False, start=None, end=None,
+                window=None, concurrency=parallel.DEFAULT_CONCURRENCY,
+                resource_id=None, **query):
         """Return a generator of samples
 
+        When ``start`` or ``end`` is given only samples in that time range
+        are returned, oldest first. With a ``window`` as well the range is
+        split into windows of that length which are fetched concurrently,
+        so no single request has to return the whole range.
+
+        Once :meth:`cache_samples` has been called, the samples of a
+        ``resource_id`` from a ``start`` are served from the cache and only
+        the part of the range not fetched before is requested, unless other
+        query parameters are given. The part older than the retention of
+        the cache is always requested.
+
         :param value: Meter resource or name for a meter.
+        :param bool as_arrays: Return the samples as columns of NumPy arrays
+                               instead, which needs NumPy to be installed.
+                               Use the functions of
+                               :mod:`~ecl.telemetry.v2.arrays` to resample
+                               or aggregate them.
+        :param datetime.datetime start: The earliest timestamp of samples.
+        :param datetime.datetime end: The timestamp samples are before.
+                                      Defaults to now when ``start`` and
+                                      ``window`` are given.
+        :param datetime.timedelta window: The length of the time range
+                                          fetched by each request.
+        :param int concurrency: The maximum number of windows fetched at
+                                once.
+        :param str resource_id: Only return samples of this resource.
         :param kwargs \*\*query: Optional query parameters to be sent to limit
                                  the resources being returned.
 
-        :returns: A generator of sample objects
+        :returns: A generator of sample objects, or a
+                  :class:`~ecl.telemetry.v2.arrays.SampleArrays` when
+                  ``as_arrays`` is set.
         :rtype: :class:`~ecl.telemetry.v2.sample.Sample`
         """
         meter_name = _meter.Meter.from_name(meter).name
-        return self._list(sample.Sample, paginated=False,
-                          path_args={'counter_name': meter_name}, **query)
+        path_args = {'counter_name': meter_name}
+        if self._use_sample_store(resource_id, start, query):
+            items = self._cached_samples(meter_name, resource_id, start, end,
+                                         window, concurrency)
+            if as_arrays:
+                return arrays.from_samples(items)
+            return (sample.Sample.existing(**item) for item in items)
+        if resource_id is not None:
+            query = _query.add_filter(query, 'resource_id', 'eq', resource_id)
+        if start is None and end is None:
+            if as_arrays:
+                return sample.Sample.list_arrays(
+                    self.session, path_args=path_args, **query)
+            return self._list(sample.Sample, paginated=False,
+                              path_args=path_args, **query)
+
+        def fetch(bounds):
+            params = _query.timestamp_query(query, *bounds)
+            if as_arrays:
+                return sample.Sample.list_arrays(
+                    self.session, path_args=path_args, **params)
+            return sorted(sample.Sample.list(self.session,
+                                             path_args=path_args, **params),
+                          key=lambda item: item.generated_at)
+
+        results = self._fetch_windows(fetch, start, end, window, concurrency)
+        if as_arrays:
+            return arrays.sort_by_time(arrays.concatenate(results))
+        return itertools.chain.from_iterable(results)
 
     def find_statistics(self, name_or_id, ignore_missing=False):
         """Find a single statistics
@@ -274,10 +411,33 @@ class Proxy(proxy.BaseProxy):
         return self._find(statistics.Statistics, name_or_id,
                           ignore_missing=ignore_missing)
 
-    def statistics(self, meter, **query):
+    def statistics(self, meter, start=None, end=None, window=None,
+                   concurrency=parallel.DEFAULT_CONCURRENCY, resource_id=None,
+                   **query):
         """Return a generator of statistics
 
+        When ``start`` or ``end`` is given only samples in that time range
+        are aggregated. With a ``window`` as well the range is split into
+        windows of that length which are fetched concurrently, and each
+        window has statistics of its own, ordered by period start. A
+        window should therefore be a multiple of the ``period`` queried.
+
+        Once :meth:`cache_samples` has been called, the statistics of a
+        ``resource_id`` from a ``start`` are computed from the cached
+        samples and only the samples not fetched before are requested,
+        unless query parameters other than ``period`` are given or the
+        ``start`` is older than the retention of the cache.
+
         :param meter: Meter resource or name for a meter.
+        :param datetime.datetime start: The earliest timestamp of samples.
+        :param datetime.datetime end: The timestamp samples are before.
+                                      Defaults to now when ``start`` and
+                                      ``window`` are given.
+        :param datetime.timedelta window: The length of the time range
+                                          fetched by each request.
+        :param int concurrency: The maximum number of windows fetched at
+                                once.
+        :param str resource_id: Only aggregate samples of this resource.
         :param kwargs \*\*query: Optional query parameters to be sent to limit
                                  the resources being returned.
 
@@ -285,5 +445,125 @@ class Proxy(proxy.BaseProxy):
         :rtype: :class:`~ecl.telemetry.v2.statistics.Statistics`
         """
         meter_name = _meter.Meter.from_name(meter).name
-        return self._list(statistics.Statistics, paginated=False,
-                          path_args={'meter_name': meter_name}, **query)
+        path_args = {'meter_name': meter_name}
+        if (self._use_sample_store(resource_id, start, query, ('period',))
+                and start >= self._sample_store.evict()):
+            end = self._fill_sample_store(meter_name, resource_id, start, end,
+                                          window, concurrency)
+            return (statistics.Statistics.existing(**item)
+                    for item in self._sample_store.statistics(
+                        meter_name, resource_id, start, end,
+                        query.get('period')))
+        if resource_id is not None:
+            query = _query.add_filter(query, 'resource_id', 'eq', resource_id)
+        if start is None and end is None:
+            return self._list(statistics.Statistics, paginated=False,
+                              path_args=path_args, **query)
+
+        def fetch(bounds):
+            params = _query.timestamp_query(query, *bounds)
+            return sorted(
+                statistics.Statistics.list(self.session,
+                                           path_args=path_args, **params),
+                key=lambda item: item.period_start_at)
+
+        return itertools.chain.from_iterable(
+            self._fetch_windows(fetch, start, end, window, concurrency))
+
+    def _fetch_windows(self, fetch, start, end, window, concurrency):
+        """Fetch a time range window by window
+
+        :returns: A generator of the result of each window, in order.
+        """
+        if window is None or start is None:
+            bounds = [(start, end)]
+        else:
+            bounds = _query.windows(start, end or datetime.datetime.utcnow(),
+                                    window)
+        for outcome in parallel.iter_ordered(fetch, bounds, concurrency):
+            if outcome.exception is not None:
+                raise outcome.exception
+            yield outcome.result
+
+    def cache_samples(self, path=None, retention=datetime.timedelta(days=7),
+                      settle=datetime.timedelta(minutes=5)):
+        """Keep the samples of resources in a local cache
+
+        Afterwards :meth:`samples` and :meth:`statistics` for a
+        ``resource_id`` from a ``start`` only fetch the samples outside of
+        the time range fetched before for that meter and resource. Samples
+        of the last ``settle`` before now are fetched again every time, so
+        samples that reach the API late are not missed. Samples older than
+        ``retention`` are fetched from the API without being cached, and
+        statistics reaching back that far are not computed locally.
+
+        :param str path: The file of the SQLite database the samples are
+                         kept in. They are kept in memory by default.
+        :param datetime.timedelta retention: How long samples are kept.
+        :param datetime.timedelta settle: How long after its timestamp a
+                                          sample is expected to be in the
+                                          API.
+
+        :returns: The :class:`~ecl.telemetry.v2.sample_store.SampleStore`.
+        """
+        self._sample_store = sample_store.SampleStore(
+            path or ":memory:", retention, settle)
+        return self._sample_store
+
+    def _use_sample_store(self, resource_id, start, query, allowed=()):
+        return (self._sample_store is not None and resource_id is not None
+                and start is not None and not set(query) - set(allowed))
+
+    def _fetch_resource_samples(self, meter_name, resource_id, start, end,
+                                window, concurrency):
+        """Fetch the samples of a resource as dicts, oldest first"""
+        path_args = {'counter_name': meter_name}
+        query = _query.add_filter({}, 'resource_id', 'eq', resource_id)
+
+        def fetch(bounds):
+            params = _query.timestamp_query(query, *bounds)
+            return sorted((item.to_dict() for item in sample.Sample.list(
+                self.session, path_args=path_args, **params)),
+                key=lambda item: item['timestamp'])
+
+        return list(itertools.chain.from_iterable(self._fetch_windows(
+            fetch, start, end, window, concurrency)))
+
+    def _fill_sample_store(self, meter_name, resource_id, start, end, window,
+                           concurrency):
+        """Fetch the samples missing from the cache
+
+        :returns: The end of the range, no later than now.
+        """
+        now = self._sample_store.clock()
+        end = now if end is None else min(end, now)
+        for gap_start, gap_end in self._sample_store.missing(
+                meter_name, resource_id, start, end):
+            items = self._fetch_resource_samples(
+                meter_name, resource_id, gap_start, gap_end, window,
+                concurrency)
+            self._sample_store.add(meter_name, resource_id, items,
+                                   gap_start, gap_end)
+        return end
+
+    def _cached_samples(self, meter_name, resource_id, start, end, window,
+                        concurrency):
+        """Return the samples of a range as dicts, oldest first
+
+        The part of the range older than the retention is fetched
+        directly and the rest is served from the cache.
+        """
+        cutoff = self._sample_store.evict()
+        items = []
+        if start < cutoff:
+            old_end = cutoff if end is None else min(end, cutoff)
+            items.extend(self._fetch_resource_samples(
+                meter_name, resource_id, start, old_end, window,
+                concurrency))
+            start = cutoff
+        end = self._fill_sample_store(meter_name, resource_id, start, end,
+                                      window, concurrency)
+        if start < end:
+            items.extend(self._sample_store.samples(meter_name, resource_id,
+                                                    start, end))
+        return items
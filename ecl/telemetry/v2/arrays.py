@@ -0,0 +1,199 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Telemetry samples held as columns of NumPy arrays.
+
+Parsing a listing straight into arrays avoids building a resource per
+sample, and the helpers here aggregate those arrays without a Python
+loop over the samples. NumPy is optional; only these functions need it,
+and it is installed with the ``arrays`` extra, ``pip install eclsdk[arrays]``.
+"""
+
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ecl import exceptions
+
+#: Samples in columns. ``timestamp`` is a ``datetime64[us]`` array,
+#: ``volume`` a ``float64`` array and ``resource_id`` an ``int32`` array of
+#: codes indexing ``resources``, the distinct resource IDs in sorted order.
+SampleArrays = collections.namedtuple(
+    "SampleArrays", ["timestamp", "volume", "resource_id", "resources"])
+
+_AGGREGATES = ("mean", "sum", "count", "min", "max")
+
+
+def _require_numpy():
+    if numpy is None:
+        raise exceptions.SDKException(
+            "NumPy is required for samples as arrays")
+
+
+def _timestamp(value):
+    # NumPy parses ISO 8601 but warns about explicit time zones, which
+    # are always UTC here.
+    if value.endswith("Z"):
+        return value[:-1]
+    if value.endswith("+00:00"):
+        return value[:-6]
+    return value
+
+
+def from_samples(items):
+    """Build :class:`SampleArrays` from samples as returned by the API
+
+    :param items: A list of sample dicts, in either the ``counter_*`` or
+                  the plain key format.
+
+    :returns: :class:`SampleArrays` in the order given.
+    :raises: :class:`~ecl.exceptions.SDKException` if NumPy is missing.
+    """
+    _require_numpy()
+    timestamps = numpy.array([_timestamp(item["timestamp"])
+                              for item in items], dtype="datetime64[us]")
+    volumes = numpy.array(
+        [item.get("counter_volume", item.get("volume")) for item in items],
+        dtype="float64")
+    resources, codes = numpy.unique(
+        numpy.array([item.get("resource_id") or "" for item in items],
+                    dtype=object),
+        return_inverse=True)
+    return SampleArrays(timestamps, volumes, codes.astype("int32"),
+                        resources)
+
+
+def concatenate(parts):
+    """Join several :class:`SampleArrays` into one
+
+    Resource codes are recomputed against the combined resources.
+    """
+    _require_numpy()
+    parts = list(parts)
+    if not parts:
+        return from_samples([])
+    resources, codes = numpy.unique(
+        numpy.concatenate([part.resources[part.resource_id]
+                           for part in parts]).astype(object),
+        return_inverse=True)
+    return SampleArrays(
+        numpy.concatenate([part.timestamp for part in parts]),
+        numpy.concatenate([part.volume for part in parts]),
+        codes.astype("int32"), resources)
+
+
+def sort_by_time(samples):
+    """Return :class:`SampleArrays` ordered by timestamp
+
+    Samples with the same timestamp keep their order.
+    """
+    _require_numpy()
+    order = numpy.argsort(samples.timestamp, kind="mergesort")
+    return SampleArrays(samples.timestamp[order], samples.volume[order],
+                        samples.resource_id[order], samples.resources)
+
+
+def _aggregate(keys, size, values, how):
+    """Aggregate values by integer keys in ``range(size)``"""
+    if how not in _AGGREGATES:
+        raise ValueError("how must be one of %s" % ", ".join(_AGGREGATES))
+    counts = numpy.bincount(keys, minlength=size)
+    if how == "count":
+        return counts.astype("float64")
+    if how in ("sum", "mean"):
+        sums = numpy.bincount(keys, weights=values, minlength=size)
+        if how == "sum":
+            return sums
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+    result = numpy.full(size, numpy.nan)
+    if len(keys):
+        order = numpy.argsort(keys, kind="mergesort")
+        sorted_keys = keys[order]
+        starts = numpy.flatnonzero(
+            numpy.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        reduce = numpy.minimum if how == "min" else numpy.maximum
+        result[sorted_keys[starts]] = reduce.reduceat(values[order], starts)
+    return result
+
+
+def group_by(samples, how="mean"):
+    """Aggregate the volume of each resource
+
+    :param samples: :class:`SampleArrays`.
+    :param str how: One of ``mean``, ``sum``, ``count``, ``min`` or
+                    ``max``.
+
+    :returns: A tuple of the resource IDs and an array of their values.
+    """
+    _require_numpy()
+    return samples.resources, _aggregate(samples.resource_id,
+                                         len(samples.resources),
+                                         samples.volume, how)
+
+
+def resample(samples, period, how="mean", by_resource=False):
+    """Aggregate the volume into fixed periods
+
+    Periods are aligned to the Unix epoch and only periods with samples
+    are returned.
+
+    :param samples: :class:`SampleArrays`.
+    :param period: The length of a period, as a ``datetime.timedelta`` or
+                   a ``numpy.timedelta64``.
+    :param str how: One of ``mean``, ``sum``, ``count``, ``min`` or
+                    ``max``.
+    :param bool by_resource: Aggregate each resource separately.
+
+    :returns: A tuple of the ``datetime64[us]`` start of each period and
+              an array of values. With ``by_resource`` a third array
+              holds the resource code of each value, and periods repeat.
+    """
+    _require_numpy()
+    step = numpy.timedelta64(period).astype("timedelta64[us]").astype(
+        "int64")
+    if step <= 0:
+        raise ValueError("period must be positive")
+    bins = samples.timestamp.astype("int64") // step
+    if by_resource:
+        pairs = bins * len(samples.resources) + samples.resource_id
+        keys, index = numpy.unique(pairs, return_inverse=True)
+        values = _aggregate(index, len(keys), samples.volume, how)
+        starts = (keys // len(samples.resources)) * step
+        codes = (keys % len(samples.resources)).astype("int32")
+        return starts.astype("datetime64[us]"), values, codes
+    keys, index = numpy.unique(bins, return_inverse=True)
+    values = _aggregate(index, len(keys), samples.volume, how)
+    return (keys * step).astype("datetime64[us]"), values
+
+
+def percentile(samples, q, by_resource=False):
+    """Return percentiles of the volume
+
+    :param samples: :class:`SampleArrays`.
+    :param q: A percentile, or a sequence of them, between 0 and 100.
+    :param bool by_resource: Compute them for each resource separately.
+
+    :returns: What ``numpy.percentile`` returns for the volume, or with
+              ``by_resource`` a dict mapping each resource ID to it.
+    """
+    _require_numpy()
+    if not by_resource:
+        return numpy.percentile(samples.volume, q)
+    return dict((resource_id,
+                 numpy.percentile(samples.volume[samples.resource_id == i],
+                                  q))
+                for i, resource_id in enumerate(samples.resources))
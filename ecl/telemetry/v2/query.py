@@ -0,0 +1,86 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Time range filters for telemetry queries.
+
+The API filters with ``q.field``, ``q.op`` and ``q.value`` parameters,
+each repeated once per condition, so a query can be restricted to a time
+range without touching the conditions it already has.
+"""
+
+import datetime
+
+#: The format of timestamps sent in filters.
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_FILTER_KEYS = ("q.field", "q.op", "q.value")
+
+
+def windows(start, end, step):
+    """Split a time range into consecutive windows
+
+    :param datetime.datetime start: The start of the range.
+    :param datetime.datetime end: The end of the range.
+    :param datetime.timedelta step: The length of each window. The last
+                                    window is cut short at ``end``.
+    :returns: A list of ``(start, end)`` tuples.
+    """
+    if step <= datetime.timedelta(0):
+        raise ValueError("step must be positive")
+    result = []
+    while start < end:
+        stop = min(start + step, end)
+        result.append((start, stop))
+        start = stop
+    return result
+
+
+def add_filter(query, field, op, value):
+    """Add a condition to query parameters
+
+    :param dict query: Query parameters, which are left unchanged.
+    :param str field: The field to filter on, such as ``resource_id``.
+    :param str op: The comparison, one of ``eq``, ``ne``, ``lt``, ``le``,
+                   ``gt`` or ``ge``.
+    :param str value: The value to compare with.
+    :returns: A new dict of query parameters.
+    """
+    params = dict(query)
+    for key, item in zip(_FILTER_KEYS, (field, op, value)):
+        existing = params.get(key, [])
+        if not isinstance(existing, (list, tuple)):
+            existing = [existing]
+        params[key] = list(existing) + [item]
+    return params
+
+
+def timestamp_query(query, start=None, end=None):
+    """Add timestamp filters to query parameters
+
+    Samples from ``start`` up to but excluding ``end`` are matched, so
+    consecutive windows never return the same sample twice.
+
+    :param dict query: Query parameters, which are left unchanged.
+    :param datetime.datetime start: The earliest timestamp, or ``None``.
+    :param datetime.datetime end: The timestamp to stop before, or
+                                  ``None``.
+    :returns: A new dict of query parameters.
+    """
+    params = dict(query)
+    if start is not None:
+        params = add_filter(params, "timestamp", "ge",
+                            start.strftime(TIME_FORMAT))
+    if end is not None:
+        params = add_filter(params, "timestamp", "lt",
+                            end.strftime(TIME_FORMAT))
+    return params
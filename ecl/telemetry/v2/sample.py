@@ -12,6 +12,7 @@
 
 from ecl import resource
 from ecl.telemetry import telemetry_service
+from ecl.telemetry.v2 import arrays
 
 
 class Sample(resource.Resource):
@@ -56,6 +57,45 @@ class Sample(resource.Resource):
         for item in resp.json():
             yield cls.existing(**item)
 
+    @classmethod
+    def list_arrays(cls, session, path_args=None, **params):
+        """List samples as columns of NumPy arrays
+
+        The response is parsed straight into arrays without creating a
+        :class:`Sample` for each sample.
+
+        :param session: The session to use for making this request.
+        :param dict path_args: A dictionary of arguments to construct
+                               a compound URL.
+        :param params: Query parameters sent with the request.
+
+        :returns: A :class:`~ecl.telemetry.v2.arrays.SampleArrays`.
+        :raises: :class:`~ecl.exceptions.SDKException` if NumPy is missing.
+        """
+        url = cls._get_url(path_args)
+        resp = session.get(url, endpoint_filter=cls.service, params=params)
+        return arrays.from_samples(resp.json())
+
+    @classmethod
+    def create_many(cls, session, meter, samples):
+        """Create several samples of a meter with a single request
+
+        :param session: The session to use for making this request.
+        :param str meter: The name of the meter.
+        :param list samples: A dict of attributes for each sample.
+
+        :returns: A list of :class:`Sample`, in the order given.
+        """
+        url = cls._get_url({'counter_name': meter})
+        body = []
+        for attrs in samples:
+            attrs = dict(attrs)
+            attrs.pop('meter', None)
+            attrs['counter_name'] = meter
+            body.append(attrs)
+        resp = session.post(url, endpoint_filter=cls.service, json=body)
+        return [cls.existing(**item) for item in resp.json()]
+
     def create(self, session):
         url = self._get_url(self)
         # telemetry expects a list of samples
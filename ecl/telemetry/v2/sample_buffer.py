@@ -0,0 +1,136 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Buffering of samples that are sent in batches from a background thread.
+"""
+
+import threading
+
+from ecl import exceptions
+from ecl import parallel
+
+
+class SampleBuffer(object):
+    """Samples collected and sent in batches by a daemon thread.
+
+    Buffered samples are sent once ``max_batch`` of them are waiting or
+    the oldest of them has waited ``max_latency`` seconds, whichever
+    comes first. The buffer is a context manager that sends every sample
+    left when the block exits.
+
+    :param send: A callable taking a list of sample dicts and returning
+                 a list of :class:`~ecl.parallel.Outcome`, one per sample.
+    :param int max_batch: The number of waiting samples that are sent
+                          without waiting any longer.
+    :param float max_latency: The most seconds a sample waits before it
+                              is sent.
+    :param on_error: A callable taking the :class:`~ecl.parallel.Outcome`
+                     of each sample that could not be created.
+    :param clock: A callable returning the current time in seconds.
+    """
+
+    def __init__(self, send, max_batch=100, max_latency=1.0, on_error=None,
+                 clock=parallel._clock):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self._send = send
+        self._on_error = on_error
+        self._clock = clock
+        self._condition = threading.Condition()
+        # Held while samples are taken from the buffer and sent, so a
+        # flush returns only after every earlier batch has been sent.
+        self._sending = threading.Lock()
+        self._samples = []
+        self._oldest = None
+        self._closed = False
+        #: The exception of the latest sample that could not be created,
+        #: or ``None``.
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def add(self, **attrs):
+        """Buffer a sample
+
+        :param attrs: The attributes of the sample, as for
+                      :meth:`~ecl.telemetry.v2._proxy.Proxy.create_sample`.
+        :raises: :class:`~ecl.exceptions.SDKException` once the buffer is
+                 closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise exceptions.SDKException("The sample buffer is closed")
+            if not self._samples:
+                self._oldest = self._clock()
+            self._samples.append(attrs)
+            if len(self._samples) in (1, self.max_batch):
+                self._condition.notify()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._samples)
+
+    def _ready(self):
+        """Return the seconds until the buffer is due, 0 if it is"""
+        if self._closed or len(self._samples) >= self.max_batch:
+            return 0
+        return max(0, self._oldest + self.max_latency - self._clock())
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._samples or self._ready():
+                    if self._closed and not self._samples:
+                        return
+                    self._condition.wait(
+                        self._ready() if self._samples else None)
+            self.flush()
+
+    def flush(self):
+        """Send every buffered sample now"""
+        with self._sending:
+            with self._condition:
+                samples, self._samples = self._samples, []
+            if not samples:
+                return
+            try:
+                outcomes = self._send(samples)
+            except Exception as e:
+                outcomes = [parallel.Outcome(attrs, None, e)
+                            for attrs in samples]
+            for outcome in outcomes:
+                if outcome.exception is not None:
+                    self.last_error = outcome.exception
+                    if self._on_error is not None:
+                        try:
+                            self._on_error(outcome)
+                        except Exception as e:
+                            # Keep the background thread sending.
+                            self.last_error = e
+
+    def close(self):
+        """Send every buffered sample and stop the thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
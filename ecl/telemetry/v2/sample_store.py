@@ -0,0 +1,287 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+A local store of the samples of meters, kept in SQLite.
+
+Samples are stored per meter and resource together with the time range
+that has been fetched for them, so repeated queries of overlapping ranges
+only have to fetch what lies outside that range.
+"""
+
+import calendar
+import datetime
+import json
+import sqlite3
+import threading
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    meter TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    volume REAL,
+    unit TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_series
+    ON samples (meter, resource_id, time);
+CREATE TABLE IF NOT EXISTS coverage (
+    meter TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    oldest REAL NOT NULL,
+    newest REAL NOT NULL,
+    PRIMARY KEY (meter, resource_id)
+);
+"""
+
+
+def to_seconds(value):
+    """Return a naive UTC datetime as seconds since the epoch"""
+    return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+
+
+def from_seconds(value):
+    """Return seconds since the epoch as a naive UTC datetime"""
+    return _EPOCH + datetime.timedelta(seconds=value)
+
+
+def parse_time(value):
+    """Parse an ISO 8601 timestamp in UTC into a naive datetime"""
+    for suffix in ("Z", "+00:00"):
+        if value.endswith(suffix):
+            value = value[:-len(suffix)]
+    if "." in value:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+    return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+def _field(sample, name):
+    # Samples come in both the plain and the ``counter_*`` key format.
+    return sample.get("counter_" + name, sample.get(name))
+
+
+class SampleStore(object):
+    """Samples of meters by resource, with the ranges fetched for them.
+
+    The range fetched for a meter and resource is always contiguous:
+    :meth:`missing` returns the parts of a query outside of it, and once
+    those are added the range covers the whole query, except for the
+    last ``settle`` before now. Samples can reach the API a while after
+    their timestamp, so that part is fetched again by every query and
+    replaces what was stored for it.
+
+    Samples older than ``retention`` are removed by :meth:`evict`, and
+    nothing older is stored.
+
+    :param str path: The file of the SQLite database. The default keeps
+                     the store in memory.
+    :param datetime.timedelta retention: How long samples are kept.
+    :param datetime.timedelta settle: How long after its timestamp a
+                                      sample is expected to be in the API.
+    :param clock: A callable returning the current time as a naive UTC
+                  datetime.
+    """
+
+    def __init__(self, path=":memory:", retention=datetime.timedelta(days=7),
+                 settle=datetime.timedelta(minutes=5),
+                 clock=datetime.datetime.utcnow):
+        self.retention = retention
+        self.settle = settle
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def coverage(self, meter, resource_id):
+        """Return the range fetched for a resource
+
+        :returns: A ``(oldest, newest)`` tuple of datetimes, or ``None``
+                  if nothing has been fetched.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT oldest, newest FROM coverage "
+                "WHERE meter = ? AND resource_id = ?",
+                (meter, resource_id)).fetchone()
+        if row is None:
+            return None
+        return from_seconds(row[0]), from_seconds(row[1])
+
+    def missing(self, meter, resource_id, start, end):
+        """Return the ranges that have to be fetched to answer a query
+
+        To keep the range fetched contiguous, a query after it is extended
+        back to its newest timestamp and one before it forward to its
+        oldest.
+
+        :param str meter: The name of the meter.
+        :param str resource_id: The ID of the resource.
+        :param datetime.datetime start: The start of the query.
+        :param datetime.datetime end: The end of the query.
+
+        :returns: A list of ``(start, end)`` tuples.
+        """
+        covered = self.coverage(meter, resource_id)
+        if covered is None:
+            return [(start, end)] if start < end else []
+        oldest, newest = covered
+        gaps = []
+        if start < oldest:
+            gaps.append((start, oldest))
+        if end > newest:
+            gaps.append((newest, end))
+        return gaps
+
+    def add(self, meter, resource_id, samples, start, end):
+        """Store the samples fetched for a range
+
+        They replace any samples stored for the range before. The range is
+        only recorded as fetched up to ``settle`` before now, and samples
+        older than the retention are not stored.
+
+        :param str meter: The name of the meter.
+        :param str resource_id: The ID of the resource.
+        :param samples: An iterable of sample dicts, each with a
+                        ``timestamp``.
+        :param datetime.datetime start: The start of the range fetched.
+        :param datetime.datetime end: The end of the range fetched.
+        """
+        now = self.clock()
+        first = max(to_seconds(start), to_seconds(now - self.retention))
+        last = to_seconds(end)
+        settled = min(last, to_seconds(now - self.settle))
+        rows = []
+        for sample in samples:
+            time = to_seconds(parse_time(sample["timestamp"]))
+            if first <= time < last:
+                rows.append((meter, resource_id, time,
+                             _field(sample, "volume"),
+                             _field(sample, "unit"), json.dumps(sample)))
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM samples WHERE meter = ? AND resource_id = ? "
+                "AND time >= ? AND time < ?",
+                (meter, resource_id, first, last))
+            self._db.executemany(
+                "INSERT INTO samples "
+                "(meter, resource_id, time, volume, unit, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            if settled <= first:
+                return
+            row = self._db.execute(
+                "SELECT oldest, newest FROM coverage "
+                "WHERE meter = ? AND resource_id = ?",
+                (meter, resource_id)).fetchone()
+            oldest, newest = first, settled
+            if row is not None:
+                if first > row[1] or settled < row[0]:
+                    # Not adjacent to the range fetched before, which is
+                    # only kept when it is newer.
+                    if row[1] > settled:
+                        return
+                else:
+                    oldest, newest = min(oldest, row[0]), max(newest, row[1])
+            self._db.execute(
+                "INSERT OR REPLACE INTO coverage "
+                "(meter, resource_id, oldest, newest) VALUES (?, ?, ?, ?)",
+                (meter, resource_id, oldest, newest))
+
+    def samples(self, meter, resource_id, start, end):
+        """Return the stored samples of a range, oldest first
+
+        :returns: A list of sample dicts.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM samples WHERE meter = ? AND "
+                "resource_id = ? AND time >= ? AND time < ? ORDER BY time",
+                (meter, resource_id, to_seconds(start),
+                 to_seconds(end))).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def statistics(self, meter, resource_id, start, end, period=None):
+        """Aggregate the stored samples of a range
+
+        :param int period: The length of each period in seconds, counted
+                           from ``start``. The whole range is one period
+                           by default.
+
+        :returns: A list of statistics dicts, as returned by the API, for
+                  the periods that have samples.
+        """
+        first, last = to_seconds(start), to_seconds(end)
+        length = period or (last - first)
+        if length <= 0:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT CAST((time - ?) / ? AS INTEGER) AS bucket, "
+                "AVG(volume), COUNT(*), MIN(time), MAX(time), MAX(volume), "
+                "MIN(volume), SUM(volume), MAX(unit) FROM samples "
+                "WHERE meter = ? AND resource_id = ? AND time >= ? AND "
+                "time < ? GROUP BY bucket ORDER BY bucket",
+                (first, length, meter, resource_id, first,
+                 last)).fetchall()
+        result = []
+        for (bucket, avg, count, oldest, newest, maximum, minimum, total,
+             unit) in rows:
+            bucket_start = first + bucket * length
+            result.append({
+                "avg": avg,
+                "count": count,
+                "duration": newest - oldest,
+                "duration_start": from_seconds(oldest).isoformat(),
+                "duration_end": from_seconds(newest).isoformat(),
+                "max": maximum,
+                "min": minimum,
+                "sum": total,
+                "period": int(length),
+                "period_start": from_seconds(bucket_start).isoformat(),
+                "period_end": from_seconds(bucket_start + length).isoformat(),
+                "unit": unit,
+            })
+        return result
+
+    def cutoff(self):
+        """Return the time samples older than the retention are before"""
+        return self.clock() - self.retention
+
+    def evict(self):
+        """Remove the samples older than the retention
+
+        :returns: The :meth:`cutoff` used.
+        """
+        limit = self.cutoff()
+        cutoff = to_seconds(limit)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM samples WHERE time < ?",
+                             (cutoff,))
+            self._db.execute("DELETE FROM coverage WHERE newest <= ?",
+                             (cutoff,))
+            self._db.execute(
+                "UPDATE coverage SET oldest = ? WHERE oldest < ?",
+                (cutoff, cutoff))
+        return limit
+
+    def clear(self):
+        """Remove every sample"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM samples")
+            self._db.execute("DELETE FROM coverage")
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
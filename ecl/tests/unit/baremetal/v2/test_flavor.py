@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
 import testtools
 
 from ecl.baremetal.v2 import flavor
@@ -59,3 +60,11 @@ class TestFlavor(testtools.TestCase):
         self.assertFalse(sot.allow_update)
         self.assertFalse(sot.allow_delete)
         self.assertTrue(sot.allow_list)
+
+    @mock.patch.object(flavor.Flavor, 'list')
+    def test_find_by_name(self, mock_list):
+        match = flavor.Flavor(**BASIC_EXAMPLE)
+        mock_list.return_value = [match]
+
+        self.assertIs(match, flavor.Flavor.find('session', '3'))
+        mock_list.assert_called_once_with('session', name='3')
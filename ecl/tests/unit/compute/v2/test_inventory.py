@@ -0,0 +1,69 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl.compute.v2 import inventory
+from ecl.compute.v2 import server
+
+
+def _server(id, updated, status="ACTIVE"):
+    return server.ServerDetail.existing(id=id, updated_at=updated,
+                                        status=status)
+
+
+class TestServerInventory(testtools.TestCase):
+
+    def setUp(self):
+        super(TestServerInventory, self).setUp()
+        self.sess = mock.Mock()
+        self.sot = inventory.ServerInventory(self.sess, status="ACTIVE")
+
+    @mock.patch.object(server.ServerDetail, "list")
+    def test_refresh_uses_changes_since(self, mock_list):
+        mock_list.side_effect = [
+            [_server("a", "2017-01-01T00:00:00Z"),
+             _server("b", "2017-01-02T00:00:00Z"),
+             _server("c", "2017-01-02T00:00:00Z", status="BUILD")],
+            [_server("a", "2017-01-03T00:00:00Z", status="DELETED"),
+             _server("b", "2017-01-03T00:00:00Z", status="SHUTOFF"),
+             _server("c", "2017-01-04T00:00:00Z")],
+        ]
+
+        changes = self.sot.refresh()
+        self.assertEqual(["a", "b"], sorted(changes.added))
+        changes = self.sot.refresh()
+
+        self.assertEqual([
+            mock.call(self.sess, paginated=True),
+            mock.call(self.sess, paginated=True,
+                      changes_since="2017-01-02T00:00:00Z"),
+        ], mock_list.call_args_list)
+        self.assertEqual(["a", "b"], sorted(changes.deleted))
+        self.assertEqual(["c"], changes.added)
+        self.assertEqual(["c"], self.sot.keys())
+        self.assertEqual("2017-01-04T00:00:00Z", self.sot.high_water_mark)
+
+    @mock.patch.object(server.ServerDetail, "list")
+    def test_fixed_filters_sent(self, mock_list):
+        mock_list.return_value = []
+        sot = inventory.ServerInventory(self.sess, reservation_id="r")
+
+        sot.refresh()
+
+        mock_list.assert_called_once_with(self.sess, paginated=True,
+                                          reservation_id="r")
+
+    def test_mutable_filters_refused(self):
+        self.assertRaises(ValueError, inventory.ServerInventory, self.sess,
+                          name="web", host="h")
@@ -10,15 +10,25 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+import fixtures
+import mock
+
 from ecl.compute.v2 import _proxy
 from ecl.compute.v2 import availability_zone as az
 from ecl.compute.v2 import extension
 from ecl.compute.v2 import flavor
 from ecl.compute.v2 import image
+from ecl.compute.v2 import inventory
 from ecl.compute.v2 import keypair
 from ecl.compute.v2 import limits
 from ecl.compute.v2 import server
 from ecl.compute.v2 import server_interface
+from ecl.compute.v2 import usage
+from ecl import cache
+from ecl import exceptions
+from ecl import parallel
 from ecl.tests.unit import test_proxy_base2
 
 
@@ -31,6 +41,32 @@ class TestComputeProxy(test_proxy_base2.TestProxyBase):
         self.verify_list_no_kwargs(self.proxy.extensions, extension.Extension,
                                    paginated=False)
 
+    def test_server_inventory(self):
+        sot = self.proxy.server_inventory(status="ACTIVE",
+                                          reservation_id="r")
+
+        self.assertIsInstance(sot, inventory.ServerInventory)
+        self.assertIs(self.session, sot.session)
+        self.assertEqual("ACTIVE", sot.status)
+        self.assertEqual({"reservation_id": "r"}, sot.query)
+
+    @mock.patch.object(usage, "aggregate")
+    def test_aggregate_tenant_usage(self, mock_aggregate):
+        start = datetime.datetime(2017, 1, 1)
+        end = datetime.datetime(2017, 2, 1)
+
+        rv = self.proxy.aggregate_tenant_usage(["t1"], start, end,
+                                               cache_dir="/tmp/usage",
+                                               concurrency=4)
+
+        self.assertIs(mock_aggregate.return_value, rv)
+        args, kwargs = mock_aggregate.call_args
+        self.assertEqual((self.session, ["t1"], start, end), args)
+        self.assertEqual(datetime.timedelta(days=1), kwargs["step"])
+        self.assertEqual(4, kwargs["concurrency"])
+        self.assertIsInstance(kwargs["cache"], cache.DiskCache)
+        self.assertEqual("/tmp/usage", kwargs["cache"].path)
+
     def test_flavor_find(self):
         self.verify_find(self.proxy.find_flavor, flavor.Flavor)
 
@@ -227,3 +263,208 @@ class TestComputeProxy(test_proxy_base2.TestProxyBase):
                       expected_result=None,
                       method_args=["value", "key"],
                       expected_args=[self.session, "key"])
+
+
+class TestComputeBatchAction(test_proxy_base2.TestProxyBase):
+
+    def setUp(self):
+        super(TestComputeBatchAction, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+        self.useFixture(fixtures.MockPatch("time.sleep"))
+        self.listings = []
+        self.useFixture(fixtures.MockPatchObject(
+            _proxy.Proxy, "_list",
+            side_effect=lambda *args, **kwargs: self.listings.pop(0)))
+
+    def _detail(self, id, status, task_state=None):
+        return server.ServerDetail.existing(id=id, status=status,
+                                            task_state=task_state)
+
+    def test_wait_for_servers(self):
+        self.listings = [
+            [self._detail("a", "REBOOT", "rebooting"),
+             self._detail("b", "ERROR"),
+             self._detail("c", "ACTIVE")],
+            [self._detail("a", "ACTIVE")],
+        ]
+
+        outcomes = self.proxy.wait_for_servers(["a", "b", "c", "d"])
+
+        self.assertEqual(["a", "b", "c", "d"], [o.item for o in outcomes])
+        self.assertEqual("ACTIVE", outcomes[0].result.status)
+        self.assertIsNone(outcomes[0].exception)
+        self.assertIsInstance(outcomes[1].exception,
+                              exceptions.ResourceFailure)
+        self.assertIsNone(outcomes[2].exception)
+        self.assertIsInstance(outcomes[3].exception,
+                              exceptions.ResourceNotFound)
+        self.assertEqual([], self.listings)
+
+    def test_wait_for_servers_timeout(self):
+        self.listings = [[self._detail("a", "BUILD")]] * 2
+
+        outcomes = self.proxy.wait_for_servers(["a"], interval=1, wait=1)
+
+        self.assertIsInstance(outcomes[0].exception,
+                              exceptions.ResourceTimeout)
+
+    def test_wait_for_servers_deleted(self):
+        self.listings = [[]]
+
+        outcomes = self.proxy.wait_for_servers(["a"], status=None)
+
+        self.assertEqual(parallel.Outcome("a", None, None), outcomes[0])
+
+    @mock.patch.object(server.Server, "reboot")
+    def test_batch_action(self, mock_reboot):
+        def reboot(session, reboot_type):
+            if mock_reboot.call_count == 2:
+                raise exceptions.HttpException("conflict")
+
+        mock_reboot.side_effect = reboot
+        self.listings = [[self._detail("a", "ACTIVE"),
+                          self._detail("c", "ACTIVE")]]
+
+        outcomes = self.proxy.batch_action(["a", "b", "c"], "reboot",
+                                           concurrency=1,
+                                           reboot_type="SOFT")
+
+        mock_reboot.assert_called_with(self.session, reboot_type="SOFT")
+        self.assertEqual(["a", "b", "c"], [o.item for o in outcomes])
+        self.assertIsNone(outcomes[0].exception)
+        self.assertIsInstance(outcomes[1].exception,
+                              exceptions.HttpException)
+        self.assertIsNone(outcomes[2].exception)
+        self.assertEqual("ACTIVE", outcomes[2].result.status)
+
+    @mock.patch.object(server.Server, "stop")
+    def test_batch_action_no_wait(self, mock_stop):
+        outcomes = self.proxy.batch_action(["a"], "stop", wait=False)
+
+        self.assertEqual("a", outcomes[0].result.id)
+        self.assertEqual([], self.listings)
+
+    def test_batch_action_unknown(self):
+        self.assertRaises(ValueError, self.proxy.batch_action, ["a"], "pause")
+
+
+class TestComputeCreateServers(test_proxy_base2.TestProxyBase):
+
+    def setUp(self):
+        super(TestComputeCreateServers, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+        self.useFixture(fixtures.MockPatch("time.sleep"))
+        self.limits = limits.AbsoluteLimits.existing(
+            instances=10, instances_used=7, cores=-1, ram=8192,
+            ram_used=0)
+        self.useFixture(fixtures.MockPatchObject(
+            _proxy.Proxy, "get_limits",
+            return_value=mock.Mock(absolute=self.limits)))
+        self.useFixture(fixtures.MockPatchObject(
+            _proxy.Proxy, "get_flavor",
+            return_value=flavor.Flavor.existing(id="f", vcpus=2, ram=2048)))
+
+    def test_check_server_quota(self):
+        self.proxy.check_server_quota([{"flavor_id": "f"}] * 3)
+
+        exc = self.assertRaises(exceptions.QuotaExceeded,
+                                self.proxy.check_server_quota,
+                                [{"flavor_id": "f"}] * 5)
+        self.assertIn("instances (5 needed, 3 left)", str(exc))
+        self.assertIn("ram (10240 needed, 8192 left)", str(exc))
+        self.assertNotIn("cores", str(exc))
+
+    @mock.patch.object(_proxy.Proxy, "create_server")
+    def test_create_servers_quota_checked_first(self, mock_create):
+        self.assertRaises(exceptions.QuotaExceeded,
+                          self.proxy.create_servers,
+                          [{"flavor_id": "f", "name": "n"}] * 4)
+        self.assertFalse(mock_create.called)
+
+    @mock.patch.object(_proxy.Proxy, "create_server_volume")
+    @mock.patch.object(_proxy.Proxy, "create_server")
+    @mock.patch.object(_proxy.Proxy, "_list")
+    def test_create_servers(self, mock_list, mock_create, mock_volume):
+        def create_server(**attrs):
+            if "min_count" in attrs:
+                return server.Server.existing(reservation_id="r-1")
+            return server.Server.existing(id="c")
+
+        def list_servers(resource_type, paginated, **query):
+            if query.get("reservation_id") == "r-1":
+                return [server.ServerDetail.existing(id="a"),
+                        server.ServerDetail.existing(id="b")]
+            return [server.ServerDetail.existing(id=id, status="ACTIVE")
+                    for id in ("a", "b", "c")]
+
+        mock_create.side_effect = create_server
+        mock_list.side_effect = list_servers
+        spec = {"flavor_id": "f", "name": "web"}
+        specs = [spec, spec, dict(spec, volumes=["vol"])]
+
+        events = list(self.proxy.create_servers(specs, concurrency=1))
+
+        mock_create.assert_any_call(flavor_id="f", name="web", min_count=2,
+                                    max_count=2, return_reservation_id=True)
+        mock_create.assert_any_call(flavor_id="f", name="web")
+        mock_volume.assert_called_once_with(mock.ANY, volume_id="vol")
+        stages = dict(((event.stage, event.index), event.server.id)
+                      for event in events)
+        self.assertEqual({
+            ("created", 0): "a", ("created", 1): "b", ("created", 2): "c",
+            ("active", 0): "a", ("active", 1): "b", ("active", 2): "c",
+            ("attached", 2): "c",
+        }, stages)
+
+    @mock.patch.object(_proxy.Proxy, "create_server")
+    def test_create_servers_failure(self, mock_create):
+        mock_create.side_effect = exceptions.HttpException("boom")
+
+        events = list(self.proxy.create_servers(
+            [{"flavor_id": "f", "name": "web"}], check_quota=False))
+
+        self.assertEqual(1, len(events))
+        self.assertEqual("failed", events[0].stage)
+        self.assertIsInstance(events[0].error, exceptions.HttpException)
+
+
+class TestComputeInventory(test_proxy_base2.TestProxyBase):
+
+    def setUp(self):
+        super(TestComputeInventory, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    @mock.patch.object(_proxy.Proxy, "server_volumes")
+    @mock.patch.object(_proxy.Proxy, "server_interfaces")
+    @mock.patch.object(_proxy.Proxy, "get_image")
+    @mock.patch.object(_proxy.Proxy, "get_flavor")
+    @mock.patch.object(_proxy.Proxy, "servers")
+    def test_inventory(self, mock_servers, mock_flavor, mock_image,
+                       mock_interfaces, mock_volumes):
+        mock_servers.return_value = [
+            server.ServerDetail.existing(id="a", flavor={"id": "f"},
+                                         image={"id": "i"}),
+            server.ServerDetail.existing(id="b", flavor={"id": "f"},
+                                         image=""),
+        ]
+        mock_flavor.side_effect = lambda id: flavor.Flavor.existing(id=id)
+        mock_image.side_effect = exceptions.ResourceNotFound("gone")
+        mock_interfaces.return_value = ["interface"]
+        mock_volumes.side_effect = [exceptions.HttpException("boom"),
+                                    ["volume"]]
+
+        records = dict((record.server.id, record) for record in
+                       self.proxy.inventory(concurrency=1, status="ACTIVE"))
+
+        mock_servers.assert_called_once_with(details=True, status="ACTIVE")
+        mock_flavor.assert_called_once_with("f")
+        mock_image.assert_called_once_with("i")
+        self.assertEqual("f", records["a"].flavor.id)
+        self.assertIsNone(records["a"].image)
+        self.assertIsNone(records["b"].image)
+        self.assertEqual(["interface"], records["a"].interfaces)
+        self.assertIsNone(records["a"].volumes)
+        self.assertIsInstance(records["a"].errors["volumes"],
+                              exceptions.HttpException)
+        self.assertEqual(["volume"], records["b"].volumes)
+        self.assertEqual({}, records["b"].errors)
@@ -80,6 +80,7 @@ class TestServer(testtools.TestCase):
                               "name": "name",
                               "status": "status",
                               "host": "host",
+                              "reservation_id": "reservation_id",
                               "changes_since": "changes-since"},
                              sot._query_mapping._mapping)
 
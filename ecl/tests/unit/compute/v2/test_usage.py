@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import fixtures
+import mock
+import testtools
+
+from ecl import cache
+from ecl.compute.v2 import quota
+from ecl.compute.v2 import usage
+
+DAY = datetime.timedelta(days=1)
+START = datetime.datetime(2017, 1, 1)
+
+
+def _usage(*servers):
+    return quota.TenantUsage.existing(
+        server_usages=[{"flavor": flavor, "hours": hours}
+                       for flavor, hours in servers])
+
+
+class TestTenantUsage(testtools.TestCase):
+
+    def test_get_period(self):
+        sess = mock.Mock()
+        sess.get.return_value.headers = {}
+        sess.get.return_value.json.return_value = {
+            "tenant_usage": {"tenant_id": "t1"}}
+        sot = quota.TenantUsage.new(id="t1")
+
+        sot.get(sess, start=START, end=START + DAY)
+
+        sess.get.assert_called_once_with(
+            "os-simple-tenant-usage/t1", endpoint_filter=sot.service,
+            params={"start": "2017-01-01T00:00:00",
+                    "end": "2017-01-02T00:00:00"})
+
+
+class TestUsage(testtools.TestCase):
+
+    def test_windows(self):
+        self.assertEqual(
+            [(START, START + DAY), (START + DAY, START + DAY * 2),
+             (START + DAY * 2, START + DAY * 2 + datetime.timedelta(hours=1))],
+            usage.windows(START, START + DAY * 2 + datetime.timedelta(hours=1),
+                          DAY))
+        self.assertEqual([], usage.windows(START, START, DAY))
+        self.assertRaises(ValueError, usage.windows, START, START + DAY,
+                          datetime.timedelta(0))
+
+    def test_hours_by_flavor(self):
+        self.assertEqual(
+            {"a": 3.0, "b": 0.5},
+            usage.hours_by_flavor(_usage(("a", 1), ("b", 0.5), ("a", 2))))
+
+    @mock.patch.object(quota.TenantUsage, "get")
+    def test_aggregate(self, mock_get):
+        periods = {}
+
+        def get(session, start, end):
+            periods[start] = end
+            return _usage(("a", 24), ("b", 1))
+
+        mock_get.side_effect = get
+        cols = usage.aggregate("sess", ["t2", "t1"], START, START + DAY * 2,
+                               concurrency=2)
+
+        self.assertEqual(4, mock_get.call_count)
+        self.assertEqual({START: START + DAY, START + DAY: START + DAY * 2},
+                         periods)
+        self.assertEqual([START] * 4 + [START + DAY] * 4, cols.start)
+        self.assertEqual(["t1", "t1", "t2", "t2"] * 2, cols.tenant_id)
+        self.assertEqual(["a", "b"] * 4, cols.flavor)
+        self.assertEqual([24.0, 1.0] * 4, list(cols.hours))
+
+    @mock.patch.object(quota.TenantUsage, "get")
+    def test_aggregate_caches_closed_windows(self, mock_get):
+        mock_get.return_value = _usage(("a", 2))
+        disk = cache.DiskCache(self.useFixture(fixtures.TempDir()).path)
+        now = START + DAY + datetime.timedelta(hours=12)
+
+        for _ in range(2):
+            cols = usage.aggregate("sess", ["t1"], START, START + DAY * 2,
+                                   cache=disk, now=now)
+            self.assertEqual([2.0, 2.0], list(cols.hours))
+
+        # The first window is fetched once, the open one every time.
+        self.assertEqual(3, mock_get.call_count)
+
+    @mock.patch.object(quota.TenantUsage, "get")
+    def test_aggregate_raises(self, mock_get):
+        mock_get.side_effect = ValueError("boom")
+
+        self.assertRaises(ValueError, usage.aggregate, "sess", ["t1"],
+                          START, START + DAY)
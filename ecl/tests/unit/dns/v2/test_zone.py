@@ -0,0 +1,44 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl.dns.v2 import zone
+
+IDENTIFIER = 'fcc4e4b2-e1b4-4d54-8d7f-6a1cd2b49a6d'
+BASIC_EXAMPLE = {
+    'id': IDENTIFIER,
+    'name': 'example.com.',
+    'email': 'hostmaster@example.com',
+    'ttl': 3600,
+    'status': 'ACTIVE',
+}
+
+
+class TestZone(testtools.TestCase):
+
+    def test_basic(self):
+        sot = zone.Zone()
+        self.assertEqual('zones', sot.resources_key)
+        self.assertEqual('/v2/zones', sot.base_path)
+        self.assertEqual('dns', sot.service.service_type)
+        self.assertTrue(sot.allow_list)
+        self.assertTrue(sot.allow_get)
+
+    @mock.patch.object(zone.Zone, 'list')
+    def test_find_by_name(self, mock_list):
+        match = zone.Zone(**BASIC_EXAMPLE)
+        mock_list.return_value = [match]
+
+        self.assertIs(match, zone.Zone.find('session', 'example.com.'))
+        mock_list.assert_called_once_with('session', name='example.com.')
@@ -10,7 +10,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mmap
+import os
+import tempfile
+
+import fixtures
 import mock
+import six
 import testtools
 
 from ecl import exceptions
@@ -122,3 +128,165 @@ class TestImage(testtools.TestCase):
 
         self.assertRaises(exceptions.InvalidResponse, 
                           sot.download, self.sess, "image-id")
+
+
+class TestImageStreaming(testtools.TestCase):
+
+    def setUp(self):
+        super(TestImageStreaming, self).setUp()
+        self.resp = mock.Mock()
+        self.resp.headers = {}
+        self.sess = mock.Mock()
+        self.sess.put = mock.Mock(return_value=self.resp)
+        self.sess.get = mock.Mock(return_value=self.resp)
+
+    def _sent_data(self):
+        return self.sess.put.call_args[1]["data"]
+
+    def test_upload_bytes_unchanged(self):
+        image.Image().upload(self.sess, IDENTIFIER, b"abc")
+
+        self.assertEqual(b"abc", self._sent_data())
+
+    def test_upload_file_streams(self):
+        data = six.BytesIO(b"abcdefg")
+        progress = mock.Mock()
+
+        image.Image().upload(self.sess, IDENTIFIER, data, chunk_size=3,
+                             progress=progress)
+        chunks = list(self._sent_data())
+
+        self.assertEqual([b"abc", b"def", b"g"], chunks)
+        progress.assert_called_with(7, None)
+
+    def test_upload_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"abcdefg")
+            f.flush()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            image.Image().upload(self.sess, IDENTIFIER, mapped, chunk_size=4)
+            chunks = list(self._sent_data())
+
+            self.assertEqual([b"abcd", b"efg"], chunks)
+            self.assertIsInstance(chunks[0], bytes)
+            mapped.close()
+
+    def _stream(self, content, checksum=None):
+        self.resp.headers = {"Content-Length": str(len(content))}
+        if checksum is not None:
+            self.resp.headers["Content-MD5"] = checksum
+        self.resp.iter_content = mock.Mock(
+            return_value=[content[:2], content[2:]])
+
+    def test_download_bytes(self):
+        self.resp.content = b"abc"
+
+        rv = image.Image().download(self.sess, IDENTIFIER)
+
+        self.assertEqual(b"abc", rv)
+
+    def test_download_stream_checksum_match(self):
+        self._stream(b"abc", "900150983cd24fb0d6963f7d28e17f72")
+        output = six.BytesIO()
+        progress = mock.Mock()
+
+        image.Image().download(self.sess, IDENTIFIER, output=output,
+                               progress=progress)
+
+        self.sess.get.assert_called_with("v2/images/IDENTIFIER/file",
+                                         endpoint_filter=image.Image.service,
+                                         stream=True)
+        self.assertEqual(b"abc", output.getvalue())
+        progress.assert_called_with(3, 3)
+        self.resp.close.assert_called_once_with()
+
+    def test_download_stream_uses_image_checksum(self):
+        self._stream(b"abc", "900150983cd24fb0d6963f7d28e17f72")
+        sot = image.Image(checksum="the wrong checksum")
+
+        self.assertRaises(exceptions.InvalidResponse, sot.download,
+                          self.sess, IDENTIFIER, output=six.BytesIO())
+
+    def test_download_stream_mismatch_removes_file(self):
+        self._stream(b"abc", "the wrong checksum")
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "img")
+
+        self.assertRaises(exceptions.InvalidResponse,
+                          image.Image().download, self.sess, IDENTIFIER,
+                          output=path)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestImageFind(testtools.TestCase):
+
+    UUID = "a2d8f1e2-3b4c-4d5e-8f90-1a2b3c4d5e6f"
+
+    def setUp(self):
+        super(TestImageFind, self).setUp()
+        self.sess = mock.Mock()
+
+    @mock.patch.object(image.Image, "list")
+    @mock.patch.object(image.Image, "get")
+    def test_find_by_id(self, mock_get, mock_list):
+        mock_get.return_value = "image"
+
+        rv = image.Image.find(self.sess, self.UUID)
+
+        mock_get.assert_called_once_with(self.sess, self.UUID)
+        mock_list.assert_not_called()
+        self.assertEqual("image", rv)
+
+    @mock.patch.object(image.Image, "list")
+    @mock.patch.object(image.Image, "get")
+    def test_find_by_name_filters_server_side(self, mock_get, mock_list):
+        found = image.Image(id="id", name="name")
+        mock_list.return_value = iter([found])
+
+        rv = image.Image.find(self.sess, "name")
+
+        mock_get.assert_not_called()
+        mock_list.assert_called_once_with(self.sess, paginated=True,
+                                          name="name")
+        self.assertEqual(found, rv)
+
+    @mock.patch.object(image.Image, "list")
+    @mock.patch.object(image.Image, "get")
+    def test_find_uuid_falls_back_to_name(self, mock_get, mock_list):
+        mock_get.side_effect = exceptions.NotFoundException()
+        found = image.Image(id="id", name=self.UUID)
+        mock_list.return_value = iter([found])
+
+        self.assertEqual(found, image.Image.find(self.sess, self.UUID))
+
+    @mock.patch.object(image.Image, "list")
+    def test_find_filter_ignored_scans(self, mock_list):
+        found = image.Image(id="id", name="name")
+        mock_list.return_value = iter([image.Image(id="x", name="other"),
+                                       found])
+
+        self.assertEqual(found, image.Image.find(self.sess, "name"))
+
+    @mock.patch.object(image.Image, "list")
+    def test_find_duplicate_stops_early(self, mock_list):
+        consumed = []
+
+        def images():
+            for i in range(100):
+                consumed.append(i)
+                yield image.Image(id=str(i), name="name")
+
+        mock_list.return_value = images()
+
+        self.assertRaises(exceptions.DuplicateResource,
+                          image.Image.find, self.sess, "name")
+        self.assertEqual(2, len(consumed))
+
+    @mock.patch.object(image.Image, "list")
+    def test_find_missing(self, mock_list):
+        mock_list.return_value = iter([])
+
+        self.assertIsNone(image.Image.find(self.sess, "name",
+                                           ignore_missing=True))
+        self.assertRaises(exceptions.ResourceNotFound,
+                          image.Image.find, self.sess, "name")
@@ -93,3 +93,56 @@ class TestImageProxy(test_proxy_base2.TestProxyBase):
         self.verify_list(self.proxy.members, member.Member, paginated=False,
                          method_args=('image_1',),
                          expected_kwargs={'image_id': 'image_1'})
+
+    @mock.patch("ecl.image.v2.image.Image.upload")
+    def test_upload_image_path(self, mock_upload):
+        fake_open = mock.mock_open()
+        with mock.patch("ecl.image.v2._proxy.open", fake_open, create=True):
+            self.proxy.upload_image("image_id", path="disk.qcow2",
+                                    progress="progress")
+
+        fake_open.assert_called_once_with("disk.qcow2", "rb")
+        mock_upload.assert_called_once_with(
+            self.session, "image_id", fake_open(),
+            chunk_size=image.DEFAULT_CHUNK_SIZE, progress="progress")
+
+    @mock.patch("ecl.image.v2.image.Image.download")
+    def test_download_image_instance(self, mock_download):
+        img = image.Image(id="image_id", checksum="abc")
+
+        self.proxy.download_image(img, output="out", chunk_size=10)
+
+        mock_download.assert_called_once_with(self.session, "image_id",
+                                              output="out", chunk_size=10,
+                                              progress=None)
+
+    @mock.patch.object(image.Image, "find")
+    def test_find_image_cached(self, mock_find):
+        img = image.Image(id="image_id", name="name")
+        mock_find.return_value = img
+
+        self.assertEqual("image_id", self.proxy.find_image("name").id)
+        self.assertEqual("image_id", self.proxy.find_image("image_id").id)
+
+        mock_find.assert_called_once_with(self.session, "name",
+                                          ignore_missing=False)
+
+    @mock.patch("ecl.image.v2.image.Image.delete")
+    @mock.patch.object(image.Image, "find")
+    def test_find_image_cache_invalidated(self, mock_find, mock_delete):
+        mock_find.return_value = image.Image(id="image_id", name="name")
+
+        self.proxy.find_image("name")
+        self.proxy.delete_image("image_id")
+        self.proxy.find_image("name")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch.object(image.Image, "find")
+    def test_find_image_missing_not_cached(self, mock_find):
+        mock_find.return_value = None
+
+        self.proxy.find_image("name", ignore_missing=True)
+        self.proxy.find_image("name", ignore_missing=True)
+
+        self.assertEqual(2, mock_find.call_count)
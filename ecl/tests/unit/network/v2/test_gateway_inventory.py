@@ -0,0 +1,70 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import testtools
+
+from ecl.network.v2 import aws
+from ecl.network.v2 import gateway_inventory
+from ecl.network.v2 import gw_interface
+from ecl.network.v2 import internet
+
+
+class TestGatewayInventory(testtools.TestCase):
+
+    def setUp(self):
+        super(TestGatewayInventory, self).setUp()
+        self.inet = internet.InternetGateway.existing(
+            id="i1", name="inet", status="ACTIVE", tenant_id="t1",
+            internet_service_id="is1", qos_option_id="q1")
+        self.aws = aws.AWSGateway.existing(
+            id="a1", name="aws", status="ACTIVE", tenant_id="t2",
+            aws_service_id="as1")
+        self.gwifs = [
+            gw_interface.GatewayInterface.existing(
+                id="gi1", service_type="internet", internet_gw_id="i1",
+                network_id="n1"),
+            gw_interface.GatewayInterface.existing(
+                id="gi2", service_type="internet", internet_gw_id="i1",
+                network_id="n2"),
+            gw_interface.GatewayInterface.existing(
+                id="gi3", service_type="aws", aws_gw_id="a1",
+                network_id="n1"),
+        ]
+        self.link = aws.AWSInterface.existing(id="ai1", aws_gw_id="a1")
+        self.sot = gateway_inventory.GatewayInventory(
+            {"internet": [self.inet], "aws": [self.aws]}, self.gwifs,
+            {"aws": [self.link]})
+
+    def test_records(self):
+        record = self.sot.get("internet", "i1")
+
+        self.assertEqual(
+            ("internet", "i1", "inet", "ACTIVE", "t1", "is1", "q1",
+             ["n1", "n2"]), tuple(record[:8]))
+        self.assertEqual(self.gwifs[:2], record.interfaces)
+        self.assertEqual([], record.links)
+        self.assertIs(self.inet, record.gateway)
+        self.assertEqual([self.link], self.sot.get("aws", "a1").links)
+        self.assertEqual("as1", self.sot.get("aws", "a1").service_id)
+        self.assertIsNone(self.sot.get("aws", "i1"))
+        self.assertEqual(2, len(self.sot))
+
+    def test_indexes(self):
+        self.assertEqual(["i1", "a1"],
+                         [record.id for record in self.sot.on_network("n1")])
+        self.assertEqual(["i1"],
+                         [record.id for record in self.sot.on_network("n2")])
+        self.assertEqual(["a1"],
+                         [record.id for record in self.sot.of_tenant("t2")])
+        self.assertEqual(["a1"],
+                         [record.id for record in self.sot.of_type("aws")])
+        self.assertEqual([], self.sot.on_network("n3"))
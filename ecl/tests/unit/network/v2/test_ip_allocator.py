@@ -0,0 +1,115 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl import exceptions
+from ecl.network.v2 import ip_allocator
+
+
+def _subnet(id, cidr, pools=None, gateway_ip=None, ip_version=4):
+    return mock.Mock(id=id, cidr=cidr, allocation_pools=pools,
+                     gateway_ip=gateway_ip, ip_version=ip_version)
+
+
+def _port(id, *fixed_ips):
+    return mock.Mock(id=id, fixed_ips=[{"subnet_id": subnet_id,
+                                        "ip_address": ip_address}
+                                       for subnet_id, ip_address in fixed_ips])
+
+
+class TestSubnetAllocator(testtools.TestCase):
+
+    def test_whole_subnet(self):
+        sot = ip_allocator.SubnetAllocator("10.0.0.0/29",
+                                           gateway_ip="10.0.0.1")
+
+        self.assertEqual(5, sot.free_count)
+        self.assertEqual(["10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.0.5",
+                          "10.0.0.6"],
+                         [sot.allocate() for _ in range(5)])
+        self.assertRaises(exceptions.AddressExhausted, sot.allocate)
+
+    def test_pools(self):
+        sot = ip_allocator.SubnetAllocator(
+            "10.0.0.0/24", [{"start": "10.0.0.10", "end": "10.0.0.11"},
+                            {"start": "10.0.0.100", "end": "10.0.0.100"}])
+
+        self.assertEqual(3, sot.free_count)
+        self.assertFalse(sot.is_free("10.0.0.12"))
+        self.assertTrue(sot.reserve("10.0.0.11"))
+        self.assertFalse(sot.reserve("10.0.0.11"))
+        self.assertEqual(["10.0.0.10", "10.0.0.100"],
+                         [sot.allocate(), sot.allocate()])
+        self.assertNotIn("10.0.1.1", sot)
+
+    def test_release_reuses_address(self):
+        sot = ip_allocator.SubnetAllocator("10.0.0.0/24",
+                                           gateway_ip="10.0.0.1")
+        first = sot.allocate()
+        sot.allocate()
+
+        sot.release(first)
+        # Addresses outside of the pools are never freed.
+        sot.release("10.0.0.1")
+        sot.release("10.0.0.255")
+
+        self.assertEqual(first, sot.allocate())
+        self.assertEqual("10.0.0.4", sot.allocate())
+        self.assertFalse(sot.is_free("10.0.0.1"))
+
+    def test_scan_wraps_around(self):
+        sot = ip_allocator.SubnetAllocator("10.0.0.0/28")
+        addresses = [sot.allocate() for _ in range(14)]
+        sot.release(addresses[2])
+        sot._released = []
+
+        self.assertEqual(addresses[2], sot.allocate())
+        self.assertEqual(0, sot.free_count)
+
+
+class TestIPAllocator(testtools.TestCase):
+
+    def setUp(self):
+        super(TestIPAllocator, self).setUp()
+        self.sot = ip_allocator.IPAllocator(
+            [_subnet("s1", "10.0.0.0/29", gateway_ip="10.0.0.1"),
+             _subnet("s6", "fd00::/64", ip_version=6)],
+            [_port("p1", ("s1", "10.0.0.2"), ("s6", "fd00::2"))],
+            [mock.Mock(subnets=["10.0.0.4/31", "100.64.0.0/10"])])
+
+    def test_existing_ports_and_reserved(self):
+        self.assertEqual(2, self.sot.subnet("s1").free_count)
+        self.assertEqual([{"subnet_id": "s1", "ip_address": "10.0.0.3"}],
+                         self.sot.fixed_ips("s1"))
+        self.assertEqual("10.0.0.6", self.sot.allocate("s1"))
+        self.assertRaises(exceptions.AddressExhausted,
+                          self.sot.allocate, "s1")
+        self.assertRaises(exceptions.ResourceNotFound,
+                          self.sot.allocate, "s6")
+
+    def test_ports_added_and_removed(self):
+        self.sot.add_port(_port("p2", ("s1", "10.0.0.3")))
+        self.assertEqual(1, self.sot.subnet("s1").free_count)
+
+        self.sot.remove_port("p1")
+        self.sot.remove_port("unknown")
+
+        self.assertTrue(self.sot.subnet("s1").is_free("10.0.0.2"))
+        self.assertEqual(2, self.sot.subnet("s1").free_count)
+
+    def test_release(self):
+        address = self.sot.allocate("s1")
+        self.sot.release("s1", address)
+
+        self.assertEqual(address, self.sot.allocate("s1"))
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
 import testtools
 
 from ecl.network.v2 import port
@@ -73,3 +74,18 @@ class TestPort(testtools.TestCase):
         self.assertEqual(EXAMPLE['tags'], sot.tags)
         self.assertEqual(EXAMPLE['tenant_id'], sot.project_id)
         self.assertEqual(EXAMPLE['status'], sot.status)
+
+    def test_bulk_create(self):
+        sess = mock.Mock()
+        sess.post.return_value.json.return_value = {
+            "ports": [{"id": "p1", "name": "a"}, {"id": "p2", "name": "b"}]}
+
+        rv = port.Port.bulk_create(sess, [{"name": "a"},
+                                          {"name": "b", "color": "red"}])
+
+        sess.post.assert_called_once_with(
+            port.Port.base_path, endpoint_filter=port.Port.service,
+            json={"ports": [{"name": "a"},
+                            {"name": "b"}]})
+        self.assertEqual(["p1", "p2"], [p.id for p in rv])
+        self.assertEqual("b", rv[1].name)
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import fixtures
 import mock
 
 from ecl.network.v2 import _proxy
@@ -18,8 +19,13 @@ from ecl.network.v2 import load_balancer
 from ecl.network.v2 import network
 from ecl.network.v2 import port
 from ecl.network.v2 import quota
+from ecl.network.v2 import static_route
 from ecl.network.v2 import subnet
+from ecl.network.v2 import tenant_connection
 from ecl.network.v2 import vpn
+from ecl import cache
+from ecl import exceptions
+from ecl import parallel
 from ecl.tests.unit import test_proxy_base2
 
 
@@ -28,6 +34,199 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
         super(TestNetworkProxy, self).setUp()
         self.proxy = _proxy.Proxy(self.session)
 
+    def test_find_network_indexed(self):
+        response = mock.Mock()
+        response.json.return_value = {
+            'networks': [{'id': 'net_id', 'name': 'net'}]}
+        self.session.get.return_value = response
+        sot = _proxy.Proxy(self.session, cache.ResourceIndex(60))
+
+        self.assertEqual('net_id', sot.find_network('net').id)
+        self.assertEqual('net_id', sot.find_network('net').id)
+
+        self.assertEqual(1, self.session.get.call_count)
+        self.assertEqual({'name': 'net'},
+                         self.session.get.call_args[1]['params'])
+
+    @mock.patch("ecl.network.v2.topology.Topology.refresh")
+    def test_topology(self, mock_refresh):
+        sot = self.proxy.topology(concurrency=3)
+
+        mock_refresh.assert_called_once_with()
+        self.assertEqual(3, sot.concurrency)
+        self.assertEqual(self.proxy.ports, sot._listers["ports"])
+        self.assertEqual(self.proxy.gateway_interfaces,
+                         sot._listers["gateway_interfaces"])
+
+    def test_ip_allocator(self):
+        subnets = [subnet.Subnet(id="s1", cidr="10.0.0.0/29",
+                                 gateway_ip="10.0.0.1")]
+        ports = [port.Port(id="p1", fixed_ips=[{"subnet_id": "s1",
+                                                "ip_address": "10.0.0.2"}])]
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "subnets", return_value=subnets))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "ports", return_value=ports))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "reserved_addresses", return_value=[]))
+
+        sot = self.proxy.ip_allocator(network_id="n1")
+
+        self.proxy.subnets.assert_called_once_with(network_id="n1")
+        self.proxy.ports.assert_called_once_with(network_id="n1")
+        self.assertEqual("10.0.0.3", sot.allocate("s1"))
+
+        created = port.Port(id="p2", fixed_ips=[{"subnet_id": "s1",
+                                                 "ip_address": "10.0.0.4"}])
+        with mock.patch.object(self.proxy, "_create", return_value=created):
+            self.proxy.create_port(network_id="n1")
+        self.assertFalse(sot.subnet("s1").is_free("10.0.0.4"))
+
+        with mock.patch.object(self.proxy, "_delete"):
+            self.proxy.delete_port("p1")
+        self.assertTrue(sot.subnet("s1").is_free("10.0.0.2"))
+
+    def test_firewall_interface_updates(self):
+        sot = self.proxy.firewall_interface_updates(concurrency=2,
+                                                    interval=1, wait=5)
+        self.addCleanup(sot.close)
+
+        self.assertEqual(self.proxy.update_firewall_interface, sot._update)
+        self.assertEqual(self.proxy.get_firewall, sot._get_appliance)
+        self.assertEqual((1, 5), (sot.interval, sot.wait))
+
+    def test_load_balancer_interface_updates(self):
+        sot = self.proxy.load_balancer_interface_updates()
+        self.addCleanup(sot.close)
+
+        self.assertEqual(self.proxy.update_load_balancer_interface,
+                         sot._update)
+        self.assertEqual(self.proxy.get_load_balancer, sot._get_appliance)
+
+    def test_reconcile_static_routes(self):
+        existing = [static_route.StaticRoute.existing(
+            id="old", destination="10.0.1.0/24", nexthop="10.1.0.1",
+            service_type="vpn", vpn_gw_id="gw1", status="ACTIVE")]
+        created = static_route.StaticRoute.existing(
+            id="new", destination="10.0.0.0/24", nexthop="10.1.0.1",
+            service_type="vpn", vpn_gw_id="gw1", status="PENDING_CREATE")
+        active = static_route.StaticRoute.existing(id="new",
+                                                   status="ACTIVE")
+        calls = []
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "static_routes",
+            side_effect=[existing, existing, [], [created], [active]]))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "create_static_route",
+            side_effect=lambda **attrs: calls.append("create") or created))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "delete_static_route",
+            side_effect=lambda *args, **kwargs: calls.append("delete")))
+        self.useFixture(fixtures.MockPatch("time.sleep"))
+
+        rv = self.proxy.reconcile_static_routes(
+            {("vpn", "gw1"): [{"destination": "10.0.0.0/24",
+                               "nexthop": "10.1.0.1"}]})
+
+        self.assertEqual(["delete", "create"], calls)
+        self.proxy.delete_static_route.assert_called_once_with(
+            existing[0], ignore_missing=True)
+        self.proxy.create_static_route.assert_called_once_with(
+            destination="10.0.0.0/24", nexthop="10.1.0.1",
+            service_type="vpn", vpn_gw_id="gw1")
+        self.assertEqual(5, self.proxy.static_routes.call_count)
+        self.assertEqual([(existing[0], existing[0], None)], rv.deleted)
+        self.assertEqual(active, rv.created[0].result)
+        self.assertIsNone(rv.created[0].exception)
+        self.assertEqual([], rv.unchanged)
+
+    def test_reconcile_static_routes_dry_run(self):
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "static_routes", return_value=[]))
+
+        rv = self.proxy.reconcile_static_routes(
+            {("aws", "gw1"): [{"destination": "10.0.0.0/24",
+                               "nexthop": "10.1.0.1"}]}, dry_run=True)
+
+        self.assertEqual(1, len(rv.create))
+        self.assertEqual([], rv.delete)
+
+    def test_gateway_inventory(self):
+        names = ["internet_gateways", "vpn_gateways", "interdc_gateways",
+                 "aws_gateways", "gcp_gateways", "azure_gateways",
+                 "vpn_interfaces", "interdc_interfaces", "aws_interfaces",
+                 "gcp_interfaces", "azure_interfaces", "gateway_interfaces"]
+        for name in names:
+            self.useFixture(fixtures.MockPatchObject(
+                self.proxy, name, return_value=[]))
+        self.proxy.vpn_gateways.return_value = [
+            vpn.VPNGateway.existing(id="v1", tenant_id="t1")]
+
+        sot = self.proxy.gateway_inventory()
+
+        self.assertEqual(["v1"], [record.id for record in sot])
+        self.assertIs(sot, self.proxy.gateway_inventory())
+        self.assertIsNot(sot, self.proxy.gateway_inventory(refresh=True))
+        for name in names:
+            self.assertEqual(2, getattr(self.proxy, name).call_count)
+
+    def test_common_function_inventory(self):
+        names = ["common_function_pools", "common_functions",
+                 "common_function_gateways", "colocation_spaces",
+                 "colocation_physical_links", "colocation_logical_links"]
+        for name in names:
+            self.useFixture(fixtures.MockPatchObject(
+                self.proxy, name, return_value=[]))
+
+        sot = self.proxy.common_function_inventory(background=False)
+
+        self.assertIs(sot, self.proxy.common_function_inventory(
+            interval=60, background=False))
+        self.assertEqual(60, sot.interval)
+        self.assertIsNone(sot._thread)
+        self.assertEqual(sorted(names), sorted(sot.changes))
+        for name in names:
+            getattr(self.proxy, name).assert_called_once_with()
+
+    def test_run_tenant_connections(self):
+        def create(name):
+            if name == "bad":
+                raise exceptions.HttpException("no")
+            return tenant_connection.TenantConnection.existing(
+                id=name, progress="requested")
+
+        def listing(progress):
+            return [tenant_connection.TenantConnection.existing(
+                id=id, progress=value) for id, value in progress.items()]
+
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "create_tenant_connection", side_effect=create))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "execute_tenant_connection"))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "tenant_connections", side_effect=[
+                listing({"a": "running", "b": "running"}),
+                listing({"a": "completed", "b": "error"})]))
+        self.useFixture(fixtures.MockPatch("time.sleep"))
+        approve = mock.Mock()
+
+        rv = self.proxy.run_tenant_connections(
+            [{"name": "a"}, {"name": "bad"}, {"name": "b"}],
+            approve=approve, concurrency=1)
+
+        self.assertEqual(2, approve.call_count)
+        self.assertEqual(2, self.proxy.execute_tenant_connection.call_count)
+        self.assertEqual(2, self.proxy.tenant_connections.call_count)
+
+        self.assertIsNone(rv[0].exception)
+        self.assertEqual("completed", rv[0].connection.progress)
+        self.assertEqual(["create", "approve", "execute", "wait"],
+                         list(rv[0].timings))
+        self.assertEqual(("create", None), (rv[1].stage, rv[1].connection))
+        self.assertIsInstance(rv[1].exception, exceptions.HttpException)
+        self.assertEqual(["create"], list(rv[1].timings))
+        self.assertIsInstance(rv[2].exception, exceptions.ResourceFailure)
+
     def test_load_balancer_create_attrs(self):
         self.verify_create(self.proxy.create_load_balancer,
                            load_balancer.LoadBalancer, 
@@ -80,6 +279,81 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
     def test_network_update(self):
         self.verify_update(self.proxy.update_network, network.Network)
 
+    def test_create_ports_bulk(self):
+        created = [port.Port.existing(id=str(i)) for i in range(3)]
+        self.useFixture(fixtures.MockPatchObject(
+            port.Port, "bulk_create",
+            side_effect=[created[:2], created[2:]]))
+
+        rv = self.proxy.create_ports([{"name": str(i)} for i in range(3)],
+                                     batch_size=2, concurrency=1)
+
+        self.assertEqual(2, port.Port.bulk_create.call_count)
+        self.assertEqual([({"name": str(i)}, created[i], None)
+                          for i in range(3)], rv)
+
+    def test_create_ports_same_attrs_as_create_port(self):
+        self.useFixture(fixtures.MockPatchObject(
+            port.Port, "bulk_create", return_value=["p0"]))
+
+        rv = self.proxy.create_ports([{"name": "a", "description": "",
+                                       "fixed_ips": []},
+                                      {"name": "b", "color": "red"}])
+
+        port.Port.bulk_create.assert_called_once_with(
+            self.session, [{"name": "a", "fixed_ips": []}])
+        self.assertEqual("p0", rv[0].result)
+        self.assertIsInstance(rv[1].exception, TypeError)
+
+    def test_create_ports_fallback_in_one_pool(self):
+        self.useFixture(fixtures.MockPatchObject(
+            port.Port, "bulk_create",
+            side_effect=exceptions.HttpException("no", http_status=500)))
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "create_port", side_effect=lambda **attrs: attrs))
+        run = parallel.run
+        self.useFixture(fixtures.MockPatchObject(parallel, "run",
+                                                 side_effect=run))
+
+        rv = self.proxy.create_ports([{"name": str(i)} for i in range(4)],
+                                     batch_size=2, concurrency=2)
+
+        self.assertEqual([{"name": str(i)} for i in range(4)],
+                         [o.result for o in rv])
+        self.assertEqual(2, parallel.run.call_count)
+        self.assertEqual([0, 1, 2, 3], parallel.run.call_args[0][1])
+        self.assertTrue(self.proxy._bulk_ports)
+
+    def test_create_ports_fallback(self):
+        self.useFixture(fixtures.MockPatchObject(
+            port.Port, "bulk_create",
+            side_effect=exceptions.HttpException("no", http_status=404)))
+        error = exceptions.HttpException("bad", http_status=400)
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "create_port", side_effect=["p0", error, "p2"]))
+
+        rv = self.proxy.create_ports([{"name": str(i)} for i in range(3)],
+                                     batch_size=10, concurrency=1)
+
+        self.assertEqual(["p0", None, "p2"], [o.result for o in rv])
+        self.assertIs(error, rv[1].exception)
+        self.proxy.create_port.assert_any_call(name="1")
+        self.assertFalse(self.proxy._bulk_ports)
+
+        self.proxy.create_port.side_effect = None
+        self.proxy.create_ports([{"name": "x"}])
+        self.assertEqual(1, port.Port.bulk_create.call_count)
+
+    def test_delete_ports(self):
+        error = exceptions.HttpException("bad")
+        self.useFixture(fixtures.MockPatchObject(
+            self.proxy, "delete_port", side_effect=[None, error]))
+
+        rv = self.proxy.delete_ports(["p1", "p2"], concurrency=1)
+
+        self.proxy.delete_port.assert_any_call("p1", ignore_missing=True)
+        self.assertEqual([("p1", None, None), ("p2", None, error)], rv)
+
     def test_port_create_attrs(self):
         self.verify_create(self.proxy.create_port, port.Port, 
                            method_kwargs={"name":"test"})
@@ -0,0 +1,66 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import testtools
+
+from ecl.network.v2 import route_reconciler
+from ecl.network.v2 import static_route
+
+
+def _route(id, destination, nexthop, service_type="vpn", gw_id="gw1"):
+    attrs = {"id": id, "destination": destination, "nexthop": nexthop,
+             "service_type": service_type,
+             route_reconciler.GATEWAY_ATTRS[service_type]: gw_id}
+    return static_route.StaticRoute.existing(**attrs)
+
+
+class TestRouteReconciler(testtools.TestCase):
+
+    def test_gateway_of(self):
+        self.assertEqual(("aws", "a1"), route_reconciler.gateway_of(
+            _route("r1", "10.0.0.0/24", "10.1.0.1", "aws", "a1")))
+
+    def test_plan(self):
+        existing = [
+            _route("keep", "10.0.0.0/24", "10.1.0.1"),
+            _route("dup", "10.0.0.0/24", "10.1.0.1"),
+            _route("old", "10.0.1.0/24", "10.1.0.1"),
+            _route("moved", "10.0.2.0/24", "10.1.0.1"),
+            _route("other", "10.0.9.0/24", "10.1.0.1", gw_id="gw2"),
+        ]
+        desired = {("vpn", "gw1"): [
+            {"destination": "10.0.0.0/24", "nexthop": "10.1.0.1"},
+            {"destination": "10.0.2.0/24", "nexthop": "10.1.0.2",
+             "name": "moved"},
+        ]}
+
+        plan = route_reconciler.plan(desired, existing)
+
+        self.assertEqual(["keep"], [route.id for route in plan.unchanged])
+        self.assertEqual(["dup", "old", "moved"],
+                         [route.id for route in plan.delete])
+        self.assertEqual([{"destination": "10.0.2.0/24",
+                           "nexthop": "10.1.0.2", "name": "moved",
+                           "service_type": "vpn", "vpn_gw_id": "gw1"}],
+                         plan.create)
+
+    def test_plan_empty_gateway(self):
+        existing = [_route("r1", "10.0.0.0/24", "10.1.0.1")]
+
+        plan = route_reconciler.plan({("vpn", "gw1"): []}, existing)
+
+        self.assertEqual(existing, plan.delete)
+        self.assertEqual([], plan.create)
+
+    def test_plan_unknown_service_type(self):
+        self.assertRaises(ValueError, route_reconciler.plan,
+                          {("nope", "gw1"): []}, [])
@@ -0,0 +1,123 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl.network.v2 import topology
+
+
+class FakeResource(object):
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+    def __eq__(self, other):
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def _port(id, network_id, device_id, *fixed_ips):
+    return FakeResource(id=id, network_id=network_id, device_id=device_id,
+                        fixed_ips=[{"subnet_id": subnet_id,
+                                    "ip_address": ip_address}
+                                   for subnet_id, ip_address in fixed_ips])
+
+
+class TestTopology(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTopology, self).setUp()
+        self.listed = {
+            "networks": [FakeResource(id="n1"), FakeResource(id="n2")],
+            "subnets": [FakeResource(id="s1", network_id="n1")],
+            "ports": [_port("p1", "n1", "server1", ("s1", "10.0.0.5")),
+                      _port("p2", "n1", "server2", ("s1", "10.0.0.6")),
+                      _port("p3", "n2", "server1")],
+            "firewall_interfaces": [
+                FakeResource(id="f1", network_id="n1", firewall_id="fw",
+                             ip_address="10.0.0.1",
+                             virtual_ip_address="10.0.0.254")],
+            "load_balancer_interfaces": [],
+            "gateway_interfaces": [
+                FakeResource(id="g1", network_id="n2", vpn_gw_id="vpn",
+                             primary_ipv4="10.1.0.2")],
+        }
+        self.listers = dict(
+            (kind, mock.Mock(side_effect=lambda kind=kind:
+                             self.listed[kind]))
+            for kind in topology.KINDS)
+        self.sot = topology.Topology(self.listers, concurrency=2)
+        self.changes = self.sot.refresh()
+
+    def _ids(self, resources):
+        return [resource.id for resource in resources]
+
+    def test_refresh_lists_everything(self):
+        for kind in topology.KINDS:
+            self.listers[kind].assert_called_once_with()
+            self.assertEqual(sorted(self._ids(self.listed[kind])),
+                             sorted(self.changes[kind].added))
+
+    def test_lookups(self):
+        self.assertEqual(["n1", "s1", "p1", "p2", "f1"],
+                         self._ids(self.sot.on_network("n1")))
+        self.assertEqual(["p1", "p2"],
+                         self._ids(self.sot.on_network("n1", ["ports"])))
+        self.assertEqual(["s1", "p1", "p2"],
+                         self._ids(self.sot.on_subnet("s1")))
+        self.assertEqual(["p1", "p3"],
+                         self._ids(self.sot.of_device("server1")))
+        self.assertEqual(["f1"], self._ids(self.sot.of_device("fw")))
+        self.assertEqual(["g1"], self._ids(self.sot.of_device("vpn")))
+        self.assertEqual(["p2"], self._ids(self.sot.at_ip("10.0.0.6")))
+        self.assertEqual(["f1"], self._ids(self.sot.at_ip("10.0.0.254")))
+        self.assertEqual([], self.sot.at_ip("192.168.0.1"))
+        self.assertEqual("p3", self.sot.get("ports", "p3").id)
+        self.assertIsNone(self.sot.get("ports", "p9"))
+
+    def test_neighbors(self):
+        servers = set(port.device_id for port in
+                      self.sot.neighbors("firewall_interfaces", "f1",
+                                         kinds=["ports"]))
+
+        self.assertEqual(set(["server1", "server2"]), servers)
+        self.assertEqual(["g1"], self._ids(self.sot.neighbors(
+            "ports", "p3", kinds=["gateway_interfaces"])))
+        self.assertEqual([], self.sot.neighbors("ports", "p9"))
+
+    def test_refresh_reindexes_changes(self):
+        self.listed["ports"] = [
+            _port("p1", "n1", "server1", ("s1", "10.0.0.7")),
+            _port("p3", "n2", "server1"),
+            _port("p4", "n2", "server3")]
+
+        changes = self.sot.refresh(["ports"])
+
+        self.assertEqual(["ports"], list(changes))
+        self.assertEqual(1, self.listers["networks"].call_count)
+        self.assertEqual((["p4"], ["p1"], ["p2"]), tuple(changes["ports"]))
+        self.assertEqual([], self.sot.at_ip("10.0.0.5"))
+        self.assertEqual([], self.sot.at_ip("10.0.0.6"))
+        self.assertEqual(["p1"], self._ids(self.sot.at_ip("10.0.0.7")))
+        self.assertEqual([], self.sot.of_device("server2"))
+        self.assertEqual(["p3", "p4"],
+                         self._ids(self.sot.on_network("n2", ["ports"])))
+
+    def test_refresh_failure_changes_nothing(self):
+        self.listed["ports"] = []
+        self.listers["subnets"].side_effect = ValueError("boom")
+
+        self.assertRaises(ValueError, self.sot.refresh)
+        self.assertEqual(3, len(self.sot.resources("ports")))
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mock
+import testtools
+
+from ecl import exceptions
+from ecl.network.v2 import update_queue
+
+
+class FakeAppliances(object):
+    """Appliances that are PENDING_UPDATE for one check after an update"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.calls = []
+        self.busy = set()
+        self.overlaps = 0
+
+    def update(self, appliance_id, interface_id, **attrs):
+        with self.lock:
+            if appliance_id in self.busy or self.pending.get(appliance_id):
+                self.overlaps += 1
+            self.busy.add(appliance_id)
+            self.calls.append((appliance_id, interface_id, attrs))
+        with self.lock:
+            self.busy.discard(appliance_id)
+            self.pending[appliance_id] = True
+        return (appliance_id, interface_id)
+
+    def get(self, appliance_id):
+        with self.lock:
+            status = ("PENDING_UPDATE" if self.pending.get(appliance_id)
+                      else "ACTIVE")
+            self.pending[appliance_id] = False
+        return mock.Mock(status=status)
+
+
+class TestApplianceUpdateQueue(testtools.TestCase):
+
+    def setUp(self):
+        super(TestApplianceUpdateQueue, self).setUp()
+        self.appliances = FakeAppliances()
+        self.sot = update_queue.ApplianceUpdateQueue(
+            self.appliances.update, self.appliances.get, concurrency=4,
+            interval=0)
+
+    def test_serialized_per_appliance(self):
+        with self.sot:
+            results = [self.sot.submit(appliance, interface, name=interface)
+                       for appliance in ("fw1", "fw2", "fw3")
+                       for interface in ("if1", "if2", "if3")]
+
+        self.assertEqual(0, self.appliances.overlaps)
+        self.assertEqual(9, len(self.appliances.calls))
+        self.assertEqual(("fw2", "if3"), results[5].result())
+        for appliance in ("fw1", "fw2", "fw3"):
+            self.assertEqual(
+                ["if1", "if2", "if3"],
+                [call[1] for call in self.appliances.calls
+                 if call[0] == appliance])
+
+    def test_queued_updates_are_merged(self):
+        started = threading.Event()
+        release = threading.Event()
+        update = self.appliances.update
+
+        def blocking_update(appliance_id, interface_id, **attrs):
+            started.set()
+            release.wait()
+            return update(appliance_id, interface_id, **attrs)
+
+        self.sot._update = blocking_update
+        first = self.sot.submit("fw1", "if1", name="a")
+        started.wait()
+        second = self.sot.submit("fw1", "if2", name="b")
+        third = self.sot.submit("fw1", "if2", description="c")
+        release.set()
+        self.sot.close()
+
+        self.assertEqual(
+            [("fw1", "if1", {"name": "a"}),
+             ("fw1", "if2", {"name": "b", "description": "c"})],
+            self.appliances.calls)
+        self.assertEqual(("fw1", "if1"), first.result())
+        self.assertEqual(second.result(), third.result())
+
+    def test_failure(self):
+        self.appliances.get = mock.Mock(return_value=mock.Mock(
+            status="ERROR"))
+        self.sot._get_appliance = self.appliances.get
+
+        future = self.sot.submit("fw1", "if1", name="a")
+        self.sot.close()
+
+        self.assertRaises(exceptions.ResourceFailure, future.result)
+        self.assertEqual([], self.appliances.calls)
+
+    def test_timeout(self):
+        self.sot._get_appliance = mock.Mock(return_value=mock.Mock(
+            status="PENDING_UPDATE"))
+        self.sot.wait = 0
+
+        future = self.sot.submit("fw1", "if1", name="a")
+        self.sot.close()
+
+        self.assertRaises(exceptions.ResourceTimeout, future.result)
@@ -0,0 +1,54 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl.object_store.v1 import info
+
+
+class TestInfo(testtools.TestCase):
+
+    def test_basic(self):
+        sot = info.Info()
+        self.assertEqual("/info", sot.base_path)
+        self.assertEqual("object-store", sot.service.service_type)
+        self.assertTrue(sot.allow_retrieve)
+        self.assertFalse(sot.allow_list)
+
+    def test_info_url(self):
+        self.assertEqual(
+            "https://swift.example.com/info",
+            info.Info._get_info_url(
+                "https://swift.example.com/v1/AUTH_1234"))
+        self.assertEqual(
+            "https://example.com/object/info",
+            info.Info._get_info_url(
+                "https://example.com/object/v1/AUTH_1234"))
+
+    def test_get(self):
+        resp = mock.Mock()
+        resp.json.return_value = {
+            "swift": {"version": "2.7.0"},
+            "bulk_delete": {"max_deletes_per_request": 10000},
+        }
+        sess = mock.Mock()
+        sess.get.return_value = resp
+        sess.get_endpoint.return_value = "https://swift/v1/AUTH_1234"
+
+        sot = info.Info().get(sess)
+
+        sess.get.assert_called_once_with("https://swift/info",
+                                         endpoint_filter=sot.service)
+        self.assertEqual({"max_deletes_per_request": 10000},
+                         sot.bulk_delete)
+        self.assertIsNone(sot.bulk_upload)
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import copy
+
 import mock
 import testtools
 
@@ -135,3 +137,174 @@ class TestObject(testtools.TestCase):
 
     def test_create_no_data(self):
         self._test_create(self.sess.post, None, None)
+
+    def test_bulk_delete(self):
+        self.resp.json = mock.Mock(return_value={
+            "Number Deleted": 1,
+            "Number Not Found": 1,
+            "Response Status": "200 OK",
+            "Response Body": "",
+            "Errors": [["/c/o 2", "409 Conflict"]],
+        })
+
+        rv = obj.Object.bulk_delete(self.sess, ["c/o 1", u"c/\u00e9"])
+
+        self.sess.post.assert_called_with(
+            "/", endpoint_filter=obj.Object.service,
+            params={"bulk-delete": ""}, data="c/o%201\nc/%C3%A9",
+            headers={"Content-Type": "text/plain",
+                     "Accept": "application/json"})
+        self.assertEqual(1, rv["number_deleted"])
+        self.assertEqual(1, rv["number_not_found"])
+        self.assertEqual([("/c/o 2", "409 Conflict")], rv["errors"])
+
+    def test_extract_archive(self):
+        self.resp.json = mock.Mock(return_value={
+            "Number Files Created": 3,
+            "Response Status": "201 Created",
+            "Errors": [],
+        })
+
+        rv = obj.Object.extract_archive(self.sess, CONTAINER_NAME, "data",
+                                        archive_format="tar.gz",
+                                        prefix="dir")
+
+        self.sess.put.assert_called_with(
+            "%s/dir" % CONTAINER_NAME, endpoint_filter=obj.Object.service,
+            params={"extract-archive": "tar.gz"}, data="data",
+            headers={"Accept": "application/json"})
+        self.assertEqual(3, rv["number_files_created"])
+        self.assertEqual([], rv["errors"])
+
+    def _listing_responses(self, *pages):
+        responses = []
+        for page in pages:
+            resp = mock.Mock()
+            resp.content = "content" if page else ""
+            resp.json = mock.Mock(return_value=page)
+            resp.text = "".join("%s\n" % name for name in page)
+            responses.append(resp)
+        self.sess.get = mock.Mock(side_effect=responses)
+
+    def test_list_paginated(self):
+        self._listing_responses([{"name": "a"}, {"name": "b"}],
+                                [{"name": "c"}], [])
+
+        rv = obj.Object.list(self.sess,
+                             path_args={"container": CONTAINER_NAME},
+                             paginated=True, params={"prefix": "p"})
+        names = [o.name for o in rv]
+
+        self.assertEqual(["a", "b", "c"], names)
+        self.assertEqual(3, self.sess.get.call_count)
+        last_params = self.sess.get.call_args[1]["params"]
+        self.assertEqual({"prefix": "p", "format": "json", "marker": "c"},
+                         last_params)
+
+    def test_list_stops_on_short_page(self):
+        self._listing_responses([{"name": "a"}, {"name": "b"}],
+                                [{"name": "c"}])
+
+        rv = list(obj.Object.list(self.sess,
+                                  path_args={"container": CONTAINER_NAME},
+                                  paginated=True, params={"limit": 2}))
+
+        self.assertEqual(3, len(rv))
+        self.assertEqual(2, self.sess.get.call_count)
+        self.assertEqual(CONTAINER_NAME, rv[0].container)
+
+    def test_list_subdir(self):
+        self._listing_responses([{"subdir": "photos/"}, {"name": "readme"}])
+
+        rv = list(obj.Object.list(self.sess,
+                                  path_args={"container": CONTAINER_NAME},
+                                  params={"delimiter": "/"}))
+
+        self.assertEqual("photos/", rv[0].name)
+        self.assertEqual("photos/", rv[0].subdir)
+        self.assertIsNone(rv[1].subdir)
+        self.assertEqual(1, self.sess.get.call_count)
+
+    def test_list_empty(self):
+        self._listing_responses([])
+
+        rv = list(obj.Object.list(self.sess,
+                                  path_args={"container": CONTAINER_NAME},
+                                  paginated=True))
+
+        self.assertEqual([], rv)
+
+    def test_list_names(self):
+        self._listing_responses(["a", "b"], [])
+
+        rv = list(obj.Object.list_names(
+            self.sess, path_args={"container": CONTAINER_NAME},
+            paginated=True))
+
+        self.assertEqual(["a", "b"], rv)
+        self.sess.get.assert_called_with(
+            "/%s" % CONTAINER_NAME, endpoint_filter=obj.Object.service,
+            headers={"Accept": "text/plain"},
+            params={"format": "plain", "marker": "b"})
+
+    def test_set_metadata_refresh(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+        self.sess.head = mock.Mock(return_value=mock.Mock(headers={
+            "X-Object-Meta-Color": "blue",
+            "content-type": "text/plain"}))
+
+        sot.set_metadata(self.sess, {"size": "large"})
+
+        self.assertEqual(1, self.sess.head.call_count)
+        headers = self.sess.post.call_args[1]["headers"]
+        self.assertEqual("blue", headers["X-Object-Meta-color"])
+        self.assertEqual("large", headers["X-Object-Meta-size"])
+        self.assertEqual("text/plain", headers["content-type"])
+
+    def _head_example(self):
+        sot = obj.Object.existing(**copy.deepcopy(DICT_EXAMPLE))
+        headers = dict(DICT_EXAMPLE["headers"])
+        headers["X-Object-Meta-Color"] = "blue"
+        headers["X-Object-Meta-Size"] = "large"
+        self.sess.head = mock.Mock(return_value=mock.Mock(headers=headers))
+        return sot.head(self.sess)
+
+    def test_set_metadata_no_refresh(self):
+        sot = self._head_example()
+
+        sot.set_metadata(self.sess, {"size": "large"}, refresh=False)
+        sot.set_metadata(self.sess, {"shape": "round"}, refresh=False)
+
+        self.assertEqual(1, self.sess.head.call_count)
+        headers = self.sess.post.call_args[1]["headers"]
+        self.assertEqual("blue", headers["X-Object-Meta-color"])
+        self.assertEqual("large", headers["X-Object-Meta-size"])
+        self.assertEqual("round", headers["X-Object-Meta-shape"])
+        self.assertEqual(DICT_EXAMPLE["headers"]["x-delete-at"],
+                         headers["x-delete-at"])
+
+    def test_set_metadata_no_refresh_unknown(self):
+        sot = obj.Object.existing(**copy.deepcopy(DICT_EXAMPLE))
+        self.sess.head = mock.Mock(return_value=mock.Mock(headers={
+            "X-Object-Meta-Color": "blue"}))
+
+        sot.set_metadata(self.sess, {"size": "large"}, refresh=False)
+
+        self.assertEqual(1, self.sess.head.call_count)
+        headers = self.sess.post.call_args[1]["headers"]
+        self.assertEqual("blue", headers["X-Object-Meta-color"])
+        self.assertEqual("large", headers["X-Object-Meta-size"])
+
+    def test_delete_metadata_no_refresh(self):
+        sot = self._head_example()
+
+        sot.delete_metadata(self.sess, ["size", "delete_after"],
+                            refresh=False)
+
+        self.assertEqual(1, self.sess.head.call_count)
+        headers = self.sess.post.call_args[1]["headers"]
+        self.assertEqual("blue", headers["X-Object-Meta-color"])
+        self.assertNotIn("X-Object-Meta-size", headers)
+        self.assertNotIn("x-delete-at", headers)
+        self.assertEqual({"color": "blue"}, sot.metadata)
+        self.assertIsNone(sot.delete_at)
@@ -13,9 +13,11 @@
 import mock
 import six
 
+from ecl import exceptions
 from ecl.object_store.v1 import _proxy
 from ecl.object_store.v1 import account
 from ecl.object_store.v1 import container
+from ecl.object_store.v1 import info
 from ecl.object_store.v1 import obj
 from ecl.tests.unit import test_proxy_base
 
@@ -183,6 +185,28 @@ class Test_objects(TestObjectStoreProxy):
             self.returned_objects.append(ob)
         self.assertEqual(len(self.objects_body), len(self.returned_objects))
 
+    def test_objects(self):
+        self._verify2("ecl.object_store.v1.obj.Object.list",
+                      self.proxy.objects,
+                      method_args=[self.container_name],
+                      method_kwargs={"prefix": "dir/", "delimiter": "/"},
+                      expected_args=[self.session],
+                      expected_kwargs={
+                          "path_args": {"container": self.container_name},
+                          "paginated": True,
+                          "params": {"prefix": "dir/", "delimiter": "/"}})
+
+    def test_objects_names_only(self):
+        self._verify2("ecl.object_store.v1.obj.Object.list_names",
+                      self.proxy.objects,
+                      method_args=[self.container_name],
+                      method_kwargs={"names_only": True},
+                      expected_args=[self.session],
+                      expected_kwargs={
+                          "path_args": {"container": self.container_name},
+                          "paginated": True,
+                          "params": {}})
+
 #    @httpretty.activate
 #    def test_all_objects(self):
 #        self.stub_url(httpretty.GET,
@@ -275,3 +299,118 @@ class Test_copy_object(TestObjectStoreProxy):
 
     def test_copy_object(self):
         self.assertRaises(NotImplementedError, self.proxy.copy_object)
+
+
+class Test_delete_objects(test_proxy_base.TestProxyBase):
+
+    def setUp(self):
+        super(Test_delete_objects, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    def _info(self, bulk_delete):
+        return info.Info.existing(bulk_delete=bulk_delete)
+
+    @mock.patch("ecl.object_store.v1.obj.Object.bulk_delete")
+    @mock.patch("ecl.object_store.v1._proxy.Proxy.get_info")
+    def test_bulk(self, mock_info, mock_bulk):
+        mock_info.return_value = self._info({"max_deletes_per_request": 2})
+        mock_bulk.return_value = {"number_deleted": 1,
+                                  "number_not_found": 1,
+                                  "errors": []}
+
+        rv = self.proxy.delete_objects(["a", "b", "c"], container="tainer")
+
+        self.assertEqual(2, mock_bulk.call_count)
+        batches = sorted(c[0][1] for c in mock_bulk.call_args_list)
+        self.assertEqual([["tainer/a", "tainer/b"], ["tainer/c"]], batches)
+        self.assertEqual(2, rv["number_deleted"])
+        self.assertEqual(2, rv["number_not_found"])
+        self.assertEqual([], rv["errors"])
+
+    @mock.patch("ecl.object_store.v1.obj.Object.delete_by_id")
+    @mock.patch("ecl.object_store.v1._proxy.Proxy.get_info")
+    def test_fallback(self, mock_info, mock_delete):
+        mock_info.return_value = self._info(None)
+
+        def delete(session, name, path_args=None):
+            if name == "missing":
+                raise exceptions.NotFoundException()
+            if name == "broken":
+                raise exceptions.HttpException("conflict")
+
+        mock_delete.side_effect = delete
+        objects = [obj.Object.new(container="other", name="a"),
+                   "missing", "broken"]
+
+        rv = self.proxy.delete_objects(objects, container="tainer")
+
+        mock_delete.assert_any_call(self.session, "a",
+                                    path_args={"container": "other"})
+        self.assertEqual(3, mock_delete.call_count)
+        self.assertEqual(1, rv["number_deleted"])
+        self.assertEqual(1, rv["number_not_found"])
+        self.assertEqual(1, len(rv["errors"]))
+        self.assertEqual("tainer/broken", rv["errors"][0][0])
+        self.assertIn("conflict", rv["errors"][0][1])
+
+    @mock.patch("ecl.object_store.v1.obj.Object.delete_by_id")
+    @mock.patch("ecl.object_store.v1._proxy.Proxy.get_info")
+    def test_no_info(self, mock_info, mock_delete):
+        mock_info.side_effect = exceptions.ResourceNotFound()
+
+        rv = self.proxy.delete_objects(["a"], container="tainer")
+
+        mock_delete.assert_called_once_with(
+            self.session, "a", path_args={"container": "tainer"})
+        self.assertEqual(1, rv["number_deleted"])
+
+    def test_upload_archive(self):
+        self._verify2("ecl.object_store.v1.obj.Object.extract_archive",
+                      self.proxy.upload_archive,
+                      method_args=["data"],
+                      method_kwargs={"container": "tainer"},
+                      expected_args=[self.session, "tainer", "data"],
+                      expected_kwargs={"archive_format": "tar",
+                                       "prefix": None})
+
+
+class Test_object_metadata(test_proxy_base.TestProxyBase):
+
+    def setUp(self):
+        super(Test_object_metadata, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    @mock.patch("ecl.object_store.v1.obj.Object.set_metadata")
+    def test_set_object_metadata_no_refresh(self, mock_set):
+        ob = obj.Object.new(container="tainer", name="ob")
+
+        self.proxy.set_object_metadata(ob, refresh=False, color="blue")
+
+        mock_set.assert_called_once_with(self.session, {"color": "blue"},
+                                         refresh=False)
+
+    @mock.patch("ecl.object_store.v1.obj.Object.delete_metadata")
+    def test_delete_object_metadata_no_refresh(self, mock_delete):
+        self.proxy.delete_object_metadata("ob", container="tainer",
+                                          keys=["color"], refresh=False)
+
+        mock_delete.assert_called_once_with(self.session, ["color"],
+                                            refresh=False)
+
+    @mock.patch("ecl.object_store.v1._proxy.Proxy.set_object_metadata")
+    def test_set_objects_metadata(self, mock_set):
+        def set_metadata(ob, container=None, refresh=True, **metadata):
+            if ob == "bad":
+                raise exceptions.HttpException("boom")
+
+        mock_set.side_effect = set_metadata
+
+        rv = self.proxy.set_objects_metadata(["a", "bad", "c"],
+                                             container="tainer",
+                                             refresh=False, color="blue")
+
+        mock_set.assert_any_call("a", container="tainer", refresh=False,
+                                 color="blue")
+        self.assertEqual(["a", "bad", "c"], [o.item for o in rv])
+        self.assertIsNone(rv[0].exception)
+        self.assertIsInstance(rv[1].exception, exceptions.HttpException)
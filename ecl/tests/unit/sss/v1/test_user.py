@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
 import  testtools
 
 from ecl.sss.v1 import user
@@ -64,3 +65,13 @@ class TestUser(testtools.TestCase):
         self.assertEqual(BASIC_EXAMPLE['new_password'], sot.new_password)
         self.assertEqual(BASIC_EXAMPLE['external_reference_id'], sot.external_reference_id)
         self.assertEqual(BASIC_EXAMPLE['login_integration'], sot.login_integration)
+
+    @mock.patch.object(user.User, 'list')
+    @mock.patch.object(user.User, 'get')
+    def test_find_gets_by_id(self, mock_get, mock_list):
+        match = user.User(**BASIC_EXAMPLE)
+        mock_get.return_value = match
+
+        self.assertIs(match, user.User.find('session', 'ecid1000005297'))
+        mock_get.assert_called_once_with('session')
+        self.assertFalse(mock_list.called)
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
 import testtools
 
 from ecl.storage.v1 import volume_type as vt
@@ -54,3 +55,11 @@ class TestVolumeType(testtools.TestCase):
         self.assertEqual(BASIC_EXAMPLE['id'], sot.id)
         self.assertEqual(BASIC_EXAMPLE['name'], sot.name)
         self.assertEqual(BASIC_EXAMPLE['extra_specs'], sot.extra_specs)
+
+    @mock.patch.object(vt.VolumeType, 'list')
+    def test_find_by_name(self, mock_list):
+        match = vt.VolumeType(**BASIC_EXAMPLE)
+        mock_list.return_value = [match]
+
+        self.assertIs(match, vt.VolumeType.find('session', 'piops_iscsi_na'))
+        mock_list.assert_called_once_with('session', name='piops_iscsi_na')
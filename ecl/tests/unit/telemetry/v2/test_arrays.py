@@ -0,0 +1,117 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import mock
+import testtools
+
+from ecl import exceptions
+from ecl.telemetry.v2 import arrays
+
+SAMPLES = [
+    {'timestamp': '2017-01-01T00:00:10', 'resource_id': 'b',
+     'volume': 1.0},
+    {'timestamp': '2017-01-01T00:00:50Z', 'resource_id': 'a',
+     'counter_volume': '3'},
+    {'timestamp': '2017-01-01T00:01:10.500000+00:00', 'resource_id': 'b',
+     'volume': 5.0},
+    {'timestamp': '2017-01-01T00:01:20', 'resource_id': 'b',
+     'volume': 7.0},
+]
+
+
+@testtools.skipIf(arrays.numpy is None, "NumPy is not installed")
+class TestArrays(testtools.TestCase):
+
+    def setUp(self):
+        super(TestArrays, self).setUp()
+        self.samples = arrays.from_samples(SAMPLES)
+
+    def test_from_samples(self):
+        sot = self.samples
+        self.assertEqual('datetime64[us]', str(sot.timestamp.dtype))
+        self.assertEqual(
+            '2017-01-01T00:01:10.500000', str(sot.timestamp[2]))
+        self.assertEqual('float64', str(sot.volume.dtype))
+        self.assertEqual([1.0, 3.0, 5.0, 7.0], sot.volume.tolist())
+        self.assertEqual(['a', 'b'], sot.resources.tolist())
+        self.assertEqual([1, 0, 1, 1], sot.resource_id.tolist())
+
+    def test_from_samples_empty(self):
+        sot = arrays.from_samples([])
+        self.assertEqual(0, len(sot.timestamp))
+        self.assertEqual(0, len(sot.resources))
+
+    def test_concatenate(self):
+        sot = arrays.concatenate([arrays.from_samples(SAMPLES[:2]),
+                                  arrays.from_samples(SAMPLES[2:])])
+        self.assertEqual(['a', 'b'], sot.resources.tolist())
+        self.assertEqual([1, 0, 1, 1], sot.resource_id.tolist())
+        self.assertEqual([1.0, 3.0, 5.0, 7.0], sot.volume.tolist())
+
+    def test_sort_by_time(self):
+        sot = arrays.sort_by_time(arrays.from_samples(SAMPLES[::-1]))
+        self.assertEqual([1.0, 3.0, 5.0, 7.0], sot.volume.tolist())
+        self.assertEqual(['b', 'a', 'b', 'b'],
+                         sot.resources[sot.resource_id].tolist())
+
+    def test_group_by(self):
+        resources, values = arrays.group_by(self.samples)
+        self.assertEqual(['a', 'b'], resources.tolist())
+        self.assertEqual([3.0, 13.0 / 3], values.tolist())
+        self.assertEqual([3.0, 7.0],
+                         arrays.group_by(self.samples, "max")[1].tolist())
+        self.assertEqual([3.0, 1.0],
+                         arrays.group_by(self.samples, "min")[1].tolist())
+        self.assertEqual([1.0, 3.0],
+                         arrays.group_by(self.samples, "count")[1].tolist())
+
+    def test_group_by_unknown(self):
+        self.assertRaises(ValueError, arrays.group_by, self.samples, "median")
+
+    def test_resample(self):
+        starts, values = arrays.resample(
+            self.samples, datetime.timedelta(minutes=1), "sum")
+        self.assertEqual(['2017-01-01T00:00:00.000000',
+                          '2017-01-01T00:01:00.000000'],
+                         [str(start) for start in starts])
+        self.assertEqual([4.0, 12.0], values.tolist())
+
+    def test_resample_by_resource(self):
+        starts, values, codes = arrays.resample(
+            self.samples, datetime.timedelta(minutes=1), by_resource=True)
+        self.assertEqual(['2017-01-01T00:00:00.000000',
+                          '2017-01-01T00:00:00.000000',
+                          '2017-01-01T00:01:00.000000'],
+                         [str(start) for start in starts])
+        self.assertEqual([3.0, 1.0, 6.0], values.tolist())
+        self.assertEqual(['a', 'b', 'b'],
+                         self.samples.resources[codes].tolist())
+
+    def test_resample_period(self):
+        self.assertRaises(ValueError, arrays.resample, self.samples,
+                          datetime.timedelta(0))
+
+    def test_percentile(self):
+        self.assertEqual(4.0, arrays.percentile(self.samples, 50))
+        self.assertEqual({'a': 3.0, 'b': 5.0},
+                         arrays.percentile(self.samples, 50,
+                                           by_resource=True))
+
+
+class TestWithoutNumpy(testtools.TestCase):
+
+    def test_required(self):
+        with mock.patch.object(arrays, 'numpy', None):
+            self.assertRaises(exceptions.SDKException,
+                              arrays.from_samples, SAMPLES)
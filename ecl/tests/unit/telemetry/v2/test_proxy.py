@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+import mock
+
 from ecl.telemetry.v2 import _proxy
 from ecl.telemetry.v2 import alarm
 from ecl.telemetry.v2 import alarm_change
@@ -84,6 +88,50 @@ class TestTelemetryProxy(test_proxy_base.TestProxyBase):
     def test_sample_create_attrs(self):
         self.verify_create(self.proxy.create_sample, sample.Sample)
 
+    @mock.patch.object(sample.Sample, 'create_many')
+    def test_create_samples(self, mock_create):
+        def create_many(session, meter, samples):
+            if meter == 'bad':
+                raise ValueError("boom")
+            return [s['counter_volume'] * 10 for s in samples]
+        mock_create.side_effect = create_many
+
+        outcomes = self.proxy.create_samples(
+            [{'counter_name': 'a', 'counter_volume': 1},
+             {'meter': 'b', 'counter_volume': 2},
+             {'counter_name': 'a', 'counter_volume': 3},
+             {'counter_name': 'a', 'counter_volume': 4},
+             {'counter_name': 'bad', 'counter_volume': 5},
+             {'counter_volume': 6}],
+            batch_size=2)
+
+        self.assertEqual([10, 20, 30, 40, None, None],
+                         [o.result for o in outcomes])
+        self.assertEqual([1, 2, 3, 4, 5, 6],
+                         [o.item['counter_volume'] for o in outcomes])
+        self.assertIsInstance(outcomes[4].exception, ValueError)
+        self.assertIsInstance(outcomes[5].exception, ValueError)
+        self.assertEqual(4, mock_create.call_count)
+        mock_create.assert_any_call(
+            self.session, 'a', [{'counter_name': 'a', 'counter_volume': 1},
+                                {'counter_name': 'a', 'counter_volume': 3}])
+        mock_create.assert_any_call(
+            self.session, 'a', [{'counter_name': 'a', 'counter_volume': 4}])
+
+    @mock.patch.object(sample.Sample, 'create_many')
+    def test_sample_buffer(self, mock_create):
+        mock_create.side_effect = lambda session, meter, samples: samples
+
+        with self.proxy.sample_buffer(max_batch=2, max_latency=60) as buf:
+            buf.add(counter_name='a', counter_volume=1)
+            buf.add(counter_name='a', counter_volume=2)
+            buf.add(counter_name='a', counter_volume=3)
+
+        self.assertEqual(
+            [1, 2, 3], [s['counter_volume']
+                        for call in mock_create.call_args_list
+                        for s in call[0][2]])
+
     def test_sample_find(self):
         self.verify_find(self.proxy.find_sample, sample.Sample)
 
@@ -94,6 +142,179 @@ class TestTelemetryProxy(test_proxy_base.TestProxyBase):
                          method_args=[met],
                          paginated=False, expected_kwargs=expected_kwargs)
 
+    def test_samples_as_arrays(self):
+        met = meter.Meter.existing(name='meterone')
+        self._verify('ecl.telemetry.v2.sample.Sample.list_arrays',
+                     self.proxy.samples,
+                     method_args=[met],
+                     method_kwargs={'as_arrays': True, 'limit': 5},
+                     expected_kwargs={
+                         'path_args': {'counter_name': 'meterone'},
+                         'limit': 5},
+                     expected_result='arrays')
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_windows(self, mock_list):
+        def list_window(session, path_args, **params):
+            start = params['q.value'][-2]
+            return [sample.Sample.existing(timestamp=start[:10] + 'T12',
+                                           resource_id='r'),
+                    sample.Sample.existing(timestamp=start[:10] + 'T06',
+                                           resource_id='r')]
+        mock_list.side_effect = list_window
+
+        found = list(self.proxy.samples(
+            'meterone', start=datetime.datetime(2017, 1, 1),
+            end=datetime.datetime(2017, 1, 3),
+            window=datetime.timedelta(days=1), concurrency=2,
+            **{'q.field': 'resource_id', 'q.op': 'eq', 'q.value': 'r'}))
+
+        self.assertEqual(['2017-01-01T06', '2017-01-01T12',
+                          '2017-01-02T06', '2017-01-02T12'],
+                         [s.generated_at for s in found])
+        mock_list.assert_any_call(
+            self.session, path_args={'counter_name': 'meterone'},
+            **{'q.field': ['resource_id', 'timestamp', 'timestamp'],
+               'q.op': ['eq', 'ge', 'lt'],
+               'q.value': ['r', '2017-01-02T00:00:00.000000',
+                           '2017-01-03T00:00:00.000000']})
+        self.assertEqual(2, mock_list.call_count)
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_windows_error(self, mock_list):
+        mock_list.side_effect = ValueError("boom")
+        found = self.proxy.samples('meterone',
+                                   end=datetime.datetime(2017, 1, 1))
+        self.assertRaises(ValueError, list, found)
+
+    @mock.patch.object(statistics.Statistics, 'list')
+    def test_statistics_range(self, mock_list):
+        stat = statistics.Statistics.existing(period_start='2017-01-01')
+        mock_list.return_value = [stat]
+
+        found = list(self.proxy.statistics(
+            'meterone', start=datetime.datetime(2017, 1, 1), period=60))
+
+        self.assertEqual([stat], found)
+        mock_list.assert_called_once_with(
+            self.session, path_args={'meter_name': 'meterone'}, period=60,
+            **{'q.field': ['timestamp'], 'q.op': ['ge'],
+               'q.value': ['2017-01-01T00:00:00.000000']})
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_cached(self, mock_list):
+        start = datetime.datetime(2017, 1, 1)
+        mock_list.side_effect = [
+            [sample.Sample.existing(timestamp='2017-01-01T00:30:00',
+                                    counter_volume=1, resource_id='r')],
+            [sample.Sample.existing(timestamp='2017-01-01T01:30:00',
+                                    counter_volume=2, resource_id='r')],
+        ]
+        store = self.proxy.cache_samples(
+            retention=datetime.timedelta(days=36500))
+
+        first = list(self.proxy.samples(
+            'meterone', start=start, end=start + datetime.timedelta(hours=1),
+            resource_id='r'))
+        second = list(self.proxy.samples(
+            'meterone', start=start, end=start + datetime.timedelta(hours=2),
+            resource_id='r'))
+
+        self.assertEqual([1], [s.volume for s in first])
+        self.assertEqual([1, 2], [s.volume for s in second])
+        mock_list.assert_called_with(
+            self.session, path_args={'counter_name': 'meterone'},
+            **{'q.field': ['resource_id', 'timestamp', 'timestamp'],
+               'q.op': ['eq', 'ge', 'lt'],
+               'q.value': ['r', '2017-01-01T01:00:00.000000',
+                           '2017-01-01T02:00:00.000000']})
+        self.assertEqual(2, mock_list.call_count)
+        self.assertEqual((start, start + datetime.timedelta(hours=2)),
+                         store.coverage('meterone', 'r'))
+
+        stats = list(self.proxy.statistics(
+            'meterone', start=start, end=start + datetime.timedelta(hours=2),
+            resource_id='r', period=3600))
+        self.assertEqual([1, 2], [s.sum for s in stats])
+        self.assertEqual(2, mock_list.call_count)
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_cached_before_retention(self, mock_list):
+        start = datetime.datetime(2017, 1, 1)
+        hour = datetime.timedelta(hours=1)
+        samples = [
+            sample.Sample.existing(timestamp='2017-01-01T00:30:00',
+                                   counter_volume=1, resource_id='r'),
+            sample.Sample.existing(timestamp='2017-01-01T01:30:00',
+                                   counter_volume=2, resource_id='r'),
+        ]
+        mock_list.side_effect = lambda session, **kwargs: [
+            s for s in samples
+            if kwargs['q.value'][1] <= s.timestamp < kwargs['q.value'][2]]
+        store = self.proxy.cache_samples(retention=2 * hour)
+        store.clock = lambda: start + 3 * hour
+
+        first = list(self.proxy.samples('meterone', start=start,
+                                        end=start + 2 * hour,
+                                        resource_id='r'))
+        second = list(self.proxy.samples('meterone', start=start,
+                                         end=start + 2 * hour,
+                                         resource_id='r'))
+
+        self.assertEqual([1, 2], [s.volume for s in first])
+        self.assertEqual([1, 2], [s.volume for s in second])
+        self.assertEqual(3, mock_list.call_count)
+        mock_list.assert_called_with(
+            self.session, path_args={'counter_name': 'meterone'},
+            **{'q.field': ['resource_id', 'timestamp', 'timestamp'],
+               'q.op': ['eq', 'ge', 'lt'],
+               'q.value': ['r', '2017-01-01T00:00:00.000000',
+                           '2017-01-01T01:00:00.000000']})
+        self.assertEqual((start + hour, start + 2 * hour),
+                         store.coverage('meterone', 'r'))
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_cached_late(self, mock_list):
+        start = datetime.datetime(2017, 1, 1)
+        late = sample.Sample.existing(timestamp='2017-01-01T00:58:00',
+                                      counter_volume=2, resource_id='r')
+        mock_list.side_effect = [
+            [sample.Sample.existing(timestamp='2017-01-01T00:30:00',
+                                    counter_volume=1, resource_id='r')],
+            [late],
+        ]
+        store = self.proxy.cache_samples(
+            retention=datetime.timedelta(days=1),
+            settle=datetime.timedelta(minutes=5))
+        store.clock = lambda: start + datetime.timedelta(hours=1)
+
+        first = list(self.proxy.samples('meterone', start=start,
+                                        resource_id='r'))
+        second = list(self.proxy.samples('meterone', start=start,
+                                         resource_id='r'))
+
+        self.assertEqual([1], [s.volume for s in first])
+        self.assertEqual([1, 2], [s.volume for s in second])
+        mock_list.assert_called_with(
+            self.session, path_args={'counter_name': 'meterone'},
+            **{'q.field': ['resource_id', 'timestamp', 'timestamp'],
+               'q.op': ['eq', 'ge', 'lt'],
+               'q.value': ['r', '2017-01-01T00:55:00.000000',
+                           '2017-01-01T01:00:00.000000']})
+
+    @mock.patch.object(sample.Sample, 'list')
+    def test_samples_cache_bypassed(self, mock_list):
+        mock_list.return_value = []
+        self.proxy.cache_samples()
+
+        list(self.proxy.samples('meterone', resource_id='r', limit=5))
+
+        mock_list.assert_called_once_with(
+            self.session, path_args={'counter_name': 'meterone'},
+            paginated=False,
+            params={'limit': 5, 'q.field': ['resource_id'], 'q.op': ['eq'],
+                    'q.value': ['r']})
+
     def test_statistics_find(self):
         self.verify_find(self.proxy.find_statistics, statistics.Statistics)
 
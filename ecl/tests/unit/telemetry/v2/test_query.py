@@ -0,0 +1,68 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import testtools
+
+from ecl.telemetry.v2 import query
+
+START = datetime.datetime(2017, 1, 1)
+
+
+class TestQuery(testtools.TestCase):
+
+    def test_windows(self):
+        end = START + datetime.timedelta(hours=5)
+        self.assertEqual(
+            [(START, START + datetime.timedelta(hours=2)),
+             (START + datetime.timedelta(hours=2),
+              START + datetime.timedelta(hours=4)),
+             (START + datetime.timedelta(hours=4), end)],
+            query.windows(START, end, datetime.timedelta(hours=2)))
+
+    def test_windows_invalid_step(self):
+        self.assertRaises(ValueError, query.windows, START, START,
+                          datetime.timedelta(0))
+
+    def test_add_filter(self):
+        params = {'q.field': 'project_id', 'q.op': 'eq', 'q.value': 'p'}
+        result = query.add_filter(params, 'resource_id', 'eq', 'r')
+        self.assertEqual({'q.field': ['project_id', 'resource_id'],
+                          'q.op': ['eq', 'eq'], 'q.value': ['p', 'r']},
+                         result)
+        self.assertEqual('project_id', params['q.field'])
+
+    def test_timestamp_query(self):
+        params = {'limit': 5}
+        result = query.timestamp_query(
+            params, START, START + datetime.timedelta(seconds=1.5))
+        self.assertEqual({'limit': 5,
+                          'q.field': ['timestamp', 'timestamp'],
+                          'q.op': ['ge', 'lt'],
+                          'q.value': ['2017-01-01T00:00:00.000000',
+                                      '2017-01-01T00:00:01.500000']},
+                         result)
+        self.assertEqual({'limit': 5}, params)
+
+    def test_timestamp_query_keeps_filters(self):
+        params = {'q.field': ['resource_id'], 'q.op': ['eq'],
+                  'q.value': ['r']}
+        result = query.timestamp_query(params, end=START)
+        self.assertEqual({'q.field': ['resource_id', 'timestamp'],
+                          'q.op': ['eq', 'lt'],
+                          'q.value': ['r', '2017-01-01T00:00:00.000000']},
+                         result)
+        self.assertEqual(['resource_id'], params['q.field'])
+
+    def test_timestamp_query_unbounded(self):
+        self.assertEqual({}, query.timestamp_query({}))
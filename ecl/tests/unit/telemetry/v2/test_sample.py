@@ -13,6 +13,7 @@
 import mock
 import testtools
 
+from ecl.telemetry.v2 import arrays
 from ecl.telemetry.v2 import sample
 
 SAMPLE = {
@@ -114,6 +115,22 @@ class TestSample(testtools.TestCase):
         second = next(found)
         self.assertEqual(OLD_SAMPLE['counter_name'], second.counter_name)
 
+    @testtools.skipIf(arrays.numpy is None, "NumPy is not installed")
+    def test_list_arrays(self):
+        sess = mock.Mock()
+        sess.get.return_value.json.return_value = [SAMPLE, OLD_SAMPLE]
+        path_args = {'counter_name': 'name_of_meter'}
+
+        result = sample.Sample.list_arrays(sess, path_args=path_args,
+                                           limit=2)
+
+        sess.get.assert_called_once_with(
+            '/meters/name_of_meter', endpoint_filter=sample.Sample.service,
+            params={'limit': 2})
+        self.assertEqual([11.1, 4.0], result.volume.tolist())
+        self.assertEqual(['5', '7'],
+                         result.resources[result.resource_id].tolist())
+
     def test_create(self):
         sess = mock.Mock()
         resp = mock.Mock()
@@ -134,3 +151,19 @@ class TestSample(testtools.TestCase):
         sess.post.assert_called_with(url, endpoint_filter=new_sample.service,
                                      json=[data])
         self.assertIsNone(new_sample.id)
+
+    def test_create_many(self):
+        sess = mock.Mock()
+        sess.post.return_value.json.return_value = [OLD_SAMPLE, OLD_SAMPLE]
+
+        found = sample.Sample.create_many(
+            sess, 'temperature',
+            [{'meter': 'temperature', 'counter_volume': 1},
+             {'counter_name': 'temperature', 'counter_volume': 2}])
+
+        sess.post.assert_called_once_with(
+            '/meters/temperature', endpoint_filter=sample.Sample.service,
+            json=[{'counter_name': 'temperature', 'counter_volume': 1},
+                  {'counter_name': 'temperature', 'counter_volume': 2}])
+        self.assertEqual(2, len(found))
+        self.assertEqual(OLD_SAMPLE['counter_volume'], found[0].volume)
@@ -0,0 +1,113 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import testtools
+
+from ecl import exceptions
+from ecl import parallel
+from ecl.telemetry.v2 import sample_buffer
+
+
+class TestSampleBuffer(testtools.TestCase):
+
+    def setUp(self):
+        super(TestSampleBuffer, self).setUp()
+        self.batches = []
+        self.sent = threading.Event()
+
+    def send(self, samples):
+        self.batches.append([s['counter_volume'] for s in samples])
+        self.sent.set()
+        return [parallel.Outcome(s, s, None) for s in samples]
+
+    def test_max_batch(self):
+        sot = sample_buffer.SampleBuffer(self.send, max_batch=2,
+                                         max_latency=60)
+        self.addCleanup(sot.close)
+        sot.add(counter_volume=1)
+        self.assertFalse(self.sent.wait(0.05))
+        sot.add(counter_volume=2)
+
+        self.assertTrue(self.sent.wait(5))
+        self.assertEqual([[1, 2]], self.batches)
+
+    def test_max_latency(self):
+        sot = sample_buffer.SampleBuffer(self.send, max_batch=100,
+                                         max_latency=0.01)
+        self.addCleanup(sot.close)
+        sot.add(counter_volume=1)
+
+        self.assertTrue(self.sent.wait(5))
+        self.assertEqual([[1]], self.batches)
+        self.assertEqual(0, len(sot))
+
+    def test_flush(self):
+        sot = sample_buffer.SampleBuffer(self.send, max_latency=60)
+        self.addCleanup(sot.close)
+        sot.add(counter_volume=1)
+        self.assertEqual(1, len(sot))
+        sot.flush()
+        self.assertEqual([[1]], self.batches)
+
+    def test_close(self):
+        with sample_buffer.SampleBuffer(self.send, max_latency=60) as sot:
+            sot.add(counter_volume=1)
+            sot.add(counter_volume=2)
+
+        self.assertEqual([[1, 2]], self.batches)
+        self.assertRaises(exceptions.SDKException, sot.add,
+                          counter_volume=3)
+
+    def test_errors(self):
+        errors = []
+        error = ValueError("boom")
+
+        def send(samples):
+            raise error
+
+        with sample_buffer.SampleBuffer(send, max_latency=60,
+                                        on_error=errors.append) as sot:
+            sot.add(counter_volume=1)
+
+        self.assertEqual([parallel.Outcome({'counter_volume': 1}, None,
+                                           error)], errors)
+        self.assertIs(error, sot.last_error)
+
+    def test_on_error_raises(self):
+        sent = []
+        failure = RuntimeError("handler")
+
+        def send(samples):
+            sent.extend(samples)
+            self.sent.set()
+            raise ValueError("boom")
+
+        def on_error(outcome):
+            raise failure
+
+        sot = sample_buffer.SampleBuffer(send, max_latency=0.01,
+                                         on_error=on_error)
+        self.addCleanup(sot.close)
+        sot.add(counter_volume=1)
+        self.assertTrue(self.sent.wait(5))
+        self.sent.clear()
+        sot.add(counter_volume=2)
+
+        self.assertTrue(self.sent.wait(5))
+        self.assertEqual([1, 2], [s['counter_volume'] for s in sent])
+        self.assertIs(failure, sot.last_error)
+
+    def test_invalid_max_batch(self):
+        self.assertRaises(ValueError, sample_buffer.SampleBuffer,
+                          self.send, max_batch=0)
@@ -0,0 +1,161 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import shutil
+import tempfile
+
+import testtools
+
+from ecl.telemetry.v2 import sample_store
+
+START = datetime.datetime(2017, 1, 1)
+HOUR = datetime.timedelta(hours=1)
+
+
+def _sample(minutes, volume):
+    timestamp = START + datetime.timedelta(minutes=minutes)
+    return {'timestamp': timestamp.isoformat(), 'counter_volume': volume,
+            'counter_unit': 'B', 'resource_id': 'r'}
+
+
+class TestSampleStore(testtools.TestCase):
+
+    def setUp(self):
+        super(TestSampleStore, self).setUp()
+        self.now = START + 3 * HOUR
+        self.sot = sample_store.SampleStore(clock=lambda: self.now)
+
+    def test_parse_time(self):
+        self.assertEqual(datetime.datetime(2017, 1, 1, 0, 0, 1, 500000),
+                         sample_store.parse_time('2017-01-01T00:00:01.5Z'))
+        self.assertEqual(START,
+                         sample_store.parse_time('2017-01-01T00:00:00+00:00'))
+        self.assertEqual(
+            START, sample_store.from_seconds(sample_store.to_seconds(START)))
+
+    def test_missing(self):
+        self.assertEqual([(START, START + HOUR)],
+                         self.sot.missing('m', 'r', START, START + HOUR))
+        self.sot.add('m', 'r', [], START + HOUR, START + 2 * HOUR)
+
+        self.assertEqual([], self.sot.missing('m', 'r', START + HOUR,
+                                              START + 2 * HOUR))
+        self.assertEqual([(START + 2 * HOUR, START + 3 * HOUR)],
+                         self.sot.missing('m', 'r', START + HOUR,
+                                          START + 3 * HOUR))
+        self.assertEqual([(START, START + HOUR),
+                          (START + 2 * HOUR, START + 3 * HOUR)],
+                         self.sot.missing('m', 'r', START, START + 3 * HOUR))
+        self.assertEqual([(START, START + HOUR)],
+                         self.sot.missing('m', 'other', START,
+                                          START + HOUR))
+
+    def test_add_and_samples(self):
+        self.sot.add('m', 'r', [_sample(30, 2), _sample(10, 1)],
+                     START, START + HOUR)
+        self.sot.add('m', 'r', [_sample(70, 3)], START + HOUR,
+                     START + 2 * HOUR)
+
+        self.assertEqual((START, START + 2 * HOUR),
+                         self.sot.coverage('m', 'r'))
+        self.assertEqual([1, 2, 3],
+                         [s['counter_volume'] for s in self.sot.samples(
+                             'm', 'r', START, START + 2 * HOUR)])
+        self.assertEqual([2], [s['counter_volume'] for s in self.sot.samples(
+            'm', 'r', START + datetime.timedelta(minutes=30), START + HOUR)])
+        self.assertEqual([], self.sot.samples('other', 'r', START,
+                                              START + HOUR))
+
+    def test_statistics(self):
+        self.sot.add('m', 'r',
+                     [_sample(10, 1), _sample(30, '3'), _sample(70, 5)],
+                     START, START + 2 * HOUR)
+
+        total, = self.sot.statistics('m', 'r', START, START + 2 * HOUR)
+        self.assertEqual(3, total['count'])
+        self.assertEqual(9, total['sum'])
+        self.assertEqual(3, total['avg'])
+        self.assertEqual(1, total['min'])
+        self.assertEqual(5, total['max'])
+        self.assertEqual('B', total['unit'])
+        self.assertEqual(3600, total['duration'])
+        self.assertEqual('2017-01-01T00:10:00', total['duration_start'])
+
+        first, second = self.sot.statistics('m', 'r', START,
+                                            START + 2 * HOUR, period=3600)
+        self.assertEqual((2, 4.0, '2017-01-01T00:00:00',
+                          '2017-01-01T01:00:00'),
+                         (first['count'], first['sum'],
+                          first['period_start'], first['period_end']))
+        self.assertEqual((1, 5.0, '2017-01-01T01:00:00'),
+                         (second['count'], second['sum'],
+                          second['period_start']))
+
+    def test_evict(self):
+        self.sot.retention = 2 * HOUR
+        self.sot.add('m', 'r', [_sample(10, 1), _sample(70, 2)],
+                     START, START + 2 * HOUR)
+
+        self.assertEqual([2], [s['counter_volume'] for s in self.sot.samples(
+            'm', 'r', START, START + 2 * HOUR)])
+        self.assertEqual((START + HOUR, START + 2 * HOUR),
+                         self.sot.coverage('m', 'r'))
+
+        self.now = START + 5 * HOUR
+        self.assertEqual(START + 3 * HOUR, self.sot.evict())
+        self.assertIsNone(self.sot.coverage('m', 'r'))
+        self.assertEqual([], self.sot.samples('m', 'r', START,
+                                              START + 2 * HOUR))
+
+    def test_settle(self):
+        self.sot.settle = datetime.timedelta(minutes=10)
+        self.sot.add('m', 'r', [_sample(160, 1), _sample(175, 2)],
+                     START + 2 * HOUR, START + 3 * HOUR)
+
+        self.assertEqual((START + 2 * HOUR,
+                          START + datetime.timedelta(minutes=170)),
+                         self.sot.coverage('m', 'r'))
+        self.assertEqual([(START + datetime.timedelta(minutes=170),
+                           START + 3 * HOUR)],
+                         self.sot.missing('m', 'r', START + 2 * HOUR,
+                                          START + 3 * HOUR))
+
+        self.now = START + 4 * HOUR
+        self.sot.add('m', 'r', [_sample(175, 2), _sample(178, 3)],
+                     START + datetime.timedelta(minutes=170),
+                     START + 4 * HOUR)
+        self.assertEqual([1, 2, 3],
+                         [s['counter_volume'] for s in self.sot.samples(
+                             'm', 'r', START, START + 4 * HOUR)])
+        self.assertEqual((START + 2 * HOUR,
+                          START + datetime.timedelta(minutes=230)),
+                         self.sot.coverage('m', 'r'))
+
+    def test_clear(self):
+        self.sot.add('m', 'r', [_sample(10, 1)], START, START + HOUR)
+        self.sot.clear()
+        self.assertIsNone(self.sot.coverage('m', 'r'))
+
+    def test_file(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        name = os.path.join(path, 'samples.db')
+        sot = sample_store.SampleStore(name, clock=lambda: self.now)
+        sot.add('m', 'r', [_sample(10, 1)], START, START + HOUR)
+        sot.close()
+
+        sot = sample_store.SampleStore(name, clock=lambda: self.now)
+        self.assertEqual((START, START + HOUR), sot.coverage('m', 'r'))
+        self.assertEqual(1, len(sot.samples('m', 'r', START, START + HOUR)))
+        sot.close()
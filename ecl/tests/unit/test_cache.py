@@ -0,0 +1,178 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import fixtures
+import testtools
+
+from ecl import cache
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTTLCache, self).setUp()
+        self.clock = FakeClock()
+        self.sot = cache.TTLCache(10, clock=self.clock)
+
+    def test_get_set(self):
+        self.sot.set("a", 1)
+
+        self.assertEqual(1, self.sot.get("a"))
+        self.assertIn("a", self.sot)
+        self.assertEqual(1, len(self.sot))
+        self.assertIsNone(self.sot.get("b"))
+
+    def test_expiry(self):
+        self.sot.set("a", 1)
+        self.clock.now = 10
+
+        self.assertEqual("default", self.sot.get("a", "default"))
+        self.assertNotIn("a", self.sot)
+        self.assertEqual(0, len(self.sot))
+
+    def test_set_resets_expiry(self):
+        self.sot.set("a", 1)
+        self.clock.now = 5
+        self.sot.set("a", 2)
+        self.clock.now = 12
+
+        self.assertEqual(2, self.sot.get("a"))
+
+    def test_pop_and_clear(self):
+        self.sot.set("a", 1)
+        self.sot.set("b", 2)
+
+        self.assertEqual(1, self.sot.pop("a"))
+        self.assertIsNone(self.sot.pop("a"))
+        self.sot.clear()
+        self.assertEqual(0, len(self.sot))
+
+
+class TestResourceIndex(testtools.TestCase):
+
+    def setUp(self):
+        super(TestResourceIndex, self).setUp()
+        self.clock = FakeClock()
+        self.sot = cache.ResourceIndex(10, clock=self.clock)
+
+    def test_lookup_by_id_and_name(self):
+        self.sot.add("scope", "id1", "name1", {"id": "id1"})
+
+        self.assertEqual({"id": "id1"}, self.sot.lookup("scope", "id1"))
+        self.assertEqual({"id": "id1"}, self.sot.lookup("scope", "name1"))
+        self.assertIsNone(self.sot.lookup("other", "name1"))
+
+    def test_lookup_returns_copy(self):
+        self.sot.add("scope", "id1", "name1", {"tags": []})
+        self.sot.lookup("scope", "id1")["tags"].append("x")
+
+        self.assertEqual({"tags": []}, self.sot.lookup("scope", "id1"))
+
+    def test_ambiguous_name(self):
+        self.sot.add("scope", "id1", "name", {"id": "id1"})
+        self.sot.add("scope", "id2", "name", {"id": "id2"})
+
+        self.assertIsNone(self.sot.lookup("scope", "name"))
+
+    def test_rename(self):
+        self.sot.add("scope", "id1", "old", {"id": "id1"})
+        self.sot.add("scope", "id1", "new", {"id": "id1"})
+
+        self.assertIsNone(self.sot.lookup("scope", "old"))
+        self.assertEqual({"id": "id1"}, self.sot.lookup("scope", "new"))
+
+    def test_expiry(self):
+        self.sot.add("scope", "id1", "name1", {"id": "id1"})
+        self.clock.now = 5
+        self.sot.add("scope", "id2", "name1", {"id": "id2"})
+        self.clock.now = 10
+
+        self.assertEqual({"id": "id2"}, self.sot.lookup("scope", "name1"))
+        self.assertIsNone(self.sot.lookup("scope", "id1"))
+
+    def test_add_prunes_expired(self):
+        self.sot.add("a", "id1", "name1", {})
+        self.sot.add("b", "id2", "name2", {})
+        self.clock.now = 10
+        self.sot.add("a", "id3", "name3", {})
+
+        self.assertEqual(1, len(self.sot))
+        self.assertEqual(["a"], list(self.sot._scopes))
+
+    def test_max_size(self):
+        sot = cache.ResourceIndex(10, max_size=2, clock=self.clock)
+        sot.add("scope", "id1", "name1", {})
+        sot.add("scope", "id2", "name2", {})
+        sot.add("scope", "id1", "name1", {})
+        sot.add("scope", "id3", "name3", {})
+
+        self.assertEqual(2, len(sot))
+        self.assertIsNone(sot.lookup("scope", "name2"))
+        self.assertEqual({}, sot.lookup("scope", "name1"))
+        self.assertEqual({}, sot.lookup("scope", "id3"))
+
+    def test_invalidate(self):
+        self.sot.add("a", "id1", "name1", {})
+        self.sot.add("b", "id1", "name1", {})
+
+        self.sot.invalidate(lambda scope: scope == "a")
+        self.assertIsNone(self.sot.lookup("a", "id1"))
+        self.assertEqual({}, self.sot.lookup("b", "id1"))
+
+        self.sot.invalidate()
+        self.assertIsNone(self.sot.lookup("b", "id1"))
+
+
+class TestDiskCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestDiskCache, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "usage")
+        self.sot = cache.DiskCache(self.path)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.sot.get("a"))
+        self.assertEqual(0, self.sot.get("a", 0))
+
+    def test_set_creates_directory(self):
+        self.sot.set("a", {"m1.small": 1.5})
+
+        self.assertEqual({"m1.small": 1.5}, self.sot.get("a"))
+        self.assertEqual({"m1.small": 1.5},
+                         cache.DiskCache(self.path).get("a"))
+        self.assertEqual(1, len(os.listdir(self.path)))
+
+    def test_set_replaces(self):
+        self.sot.set("a", 1)
+        self.sot.set("a", 2)
+
+        self.assertEqual(2, self.sot.get("a"))
+        self.assertEqual(1, len(os.listdir(self.path)))
+
+    def test_unreadable_entry_is_missing(self):
+        self.sot.set("a", 1)
+        with open(self.sot._file("a"), "w") as f:
+            f.write("{")
+
+        self.assertIsNone(self.sot.get("a"))
@@ -134,6 +134,23 @@ class TestConnection(base.TestCase):
         self.assertEqual('ecl.sss.v1._proxy',
                          conn.sss.__class__.__module__)
 
+    def test_resource_index_shared(self):
+        conn = connection.Connection(session=mock.Mock(), authenticator='2',
+                                     profile=profile.Profile())
+
+        self.assertEqual(60, conn.resource_index.ttl)
+        self.assertIs(conn.resource_index, conn.compute._resource_index)
+        self.assertIs(conn.resource_index, conn.image._resource_index)
+        self.assertIs(conn.resource_index, conn.dns._resource_index)
+
+    def test_resource_index_off(self):
+        conn = connection.Connection(session=mock.Mock(), authenticator='2',
+                                     profile=profile.Profile(),
+                                     resource_index_ttl=0)
+
+        self.assertIsNone(conn.resource_index)
+        self.assertIsNone(conn.compute._resource_index)
+
     def _prepare_test_config(self):
         # Create a temporary directory where our test config will live
         # and insert it into the search path via OS_CLIENT_CONFIG_FILE.
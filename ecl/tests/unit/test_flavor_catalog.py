@@ -0,0 +1,73 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from ecl.compute.v2 import flavor
+from ecl import flavor_catalog
+
+
+def _flavor(name, vcpus, ram, disk, **attrs):
+    return flavor.Flavor.existing(id=name, name=name, vcpus=vcpus, ram=ram,
+                                  disk=disk, **attrs)
+
+
+class TestFlavorCatalog(testtools.TestCase):
+
+    def setUp(self):
+        super(TestFlavorCatalog, self).setUp()
+        self.now = 0
+        self.list_flavors = mock.Mock(return_value=[
+            _flavor("large", 8, 16384, 100),
+            _flavor("small", 1, 1024, 20),
+            _flavor("medium", 2, 4096, 40),
+            _flavor("medium-mem", 2, 8192, 40),
+            _flavor("off", 1, 8192, 100, is_disabled=True),
+        ])
+        self.sot = flavor_catalog.FlavorCatalog(
+            self.list_flavors, ttl=10, clock=lambda: self.now)
+
+    def test_best_flavor(self):
+        self.assertEqual("small", self.sot.best_flavor().name)
+        self.assertEqual("medium", self.sot.best_flavor(vcpus=2).name)
+        self.assertEqual("medium-mem",
+                         self.sot.best_flavor(ram=6000, disk=30).name)
+        self.assertEqual("large", self.sot.best_flavor(disk=50).name)
+        self.assertIsNone(self.sot.best_flavor(vcpus=16))
+
+    def test_matching(self):
+        self.assertEqual(["medium-mem", "large"],
+                         [f.name for f in self.sot.matching(ram=8192)])
+
+    def test_ttl(self):
+        self.sot.best_flavor()
+        self.sot.best_flavor()
+        self.assertEqual(1, self.list_flavors.call_count)
+
+        self.now = 10
+        self.sot.best_flavor()
+        self.assertEqual(2, self.list_flavors.call_count)
+
+
+class TestFlavorCatalogMixin(testtools.TestCase):
+
+    def test_best_flavor(self):
+        class Proxy(flavor_catalog.FlavorCatalogMixin):
+            flavors = mock.Mock(return_value=[_flavor("small", 1, 1024, 20)])
+
+        sot = Proxy()
+
+        self.assertEqual("small", sot.best_flavor(vcpus=1).name)
+        self.assertIs(sot.flavor_catalog(), sot.flavor_catalog())
+        self.assertIsNone(sot.best_flavor(vcpus=2))
+        self.assertEqual(1, Proxy.flavors.call_count)
@@ -0,0 +1,101 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import time
+
+import testtools
+
+from ecl import parallel
+
+
+class TestParallel(testtools.TestCase):
+
+    def test_run_keeps_input_order(self):
+        outcomes = parallel.run(lambda x: x * 2, range(20), concurrency=4)
+
+        self.assertEqual(list(range(20)), [o.item for o in outcomes])
+        self.assertEqual([x * 2 for x in range(20)],
+                         [o.result for o in outcomes])
+
+    def test_run_collects_exceptions(self):
+        def func(item):
+            if item == 1:
+                raise ValueError("boom")
+            return item
+
+        outcomes = parallel.run(func, [0, 1, 2])
+
+        self.assertIsNone(outcomes[0].exception)
+        self.assertIsInstance(outcomes[1].exception, ValueError)
+        self.assertIsNone(outcomes[1].result)
+        self.assertEqual(2, outcomes[2].result)
+
+    def test_iter_completed_consumes_lazily(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        gen = parallel.iter_completed(lambda x: x, items(), concurrency=2)
+        next(gen)
+
+        self.assertLess(len(consumed), 100)
+        gen.close()
+
+    def test_iter_ordered_keeps_input_order(self):
+        def func(item):
+            time.sleep(0.01 * (5 - item))
+            if item == 3:
+                raise ValueError("boom")
+            return item * 2
+
+        outcomes = list(parallel.iter_ordered(func, range(6), concurrency=3))
+
+        self.assertEqual(list(range(6)), [o.item for o in outcomes])
+        self.assertEqual([0, 2, 4, None, 8, 10],
+                         [o.result for o in outcomes])
+        self.assertIsInstance(outcomes[3].exception, ValueError)
+
+    def test_iter_ordered_consumes_lazily(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        gen = parallel.iter_ordered(lambda x: x, items(), concurrency=2)
+        self.assertEqual(0, next(gen).result)
+
+        self.assertLessEqual(len(consumed), 3)
+        gen.close()
+
+    def test_invalid_concurrency(self):
+        self.assertRaises(ValueError, list,
+                          parallel.iter_completed(lambda x: x, [1], 0))
+
+
+class TestRateLimiter(testtools.TestCase):
+
+    def test_spaces_out_calls(self):
+        slept = []
+        sot = parallel.RateLimiter(4, clock=lambda: 10.0, sleep=slept.append)
+
+        for _ in range(3):
+            sot.wait()
+
+        self.assertEqual([0.25, 0.5], slept)
+
+    def test_rate_must_be_positive(self):
+        self.assertRaises(ValueError, parallel.RateLimiter, 0)
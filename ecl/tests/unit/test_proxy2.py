@@ -335,7 +335,7 @@ class TestProxyList(testtools.TestCase):
     def _test_list(self, paginated):
         rv = self.sot._list(ListableResource, paginated=paginated, **self.args)
 
-        self.assertEqual(self.fake_response, rv)
+        self.assertEqual(self.fake_response, list(rv))
         ListableResource.list.assert_called_once_with(
             self.session, paginated=paginated, **self.args)
 
@@ -346,6 +346,127 @@ class TestProxyList(testtools.TestCase):
         self._test_list(False)
 
 
+class IndexedResource(resource2.Resource):
+    base_path = "/parents/%(parent_id)s/things"
+    allow_create = True
+    allow_get = True
+    allow_update = True
+    allow_delete = True
+    allow_list = True
+
+    parent_id = resource2.URI("parent_id")
+    status = resource2.Body("status")
+
+
+class IndexingProxy(proxy2.BaseProxy):
+
+    resource_index_ttl = 60
+
+
+class TestProxyResourceIndex(testtools.TestCase):
+
+    def setUp(self):
+        super(TestProxyResourceIndex, self).setUp()
+        self.session = mock.Mock()
+        self.sot = IndexingProxy(self.session)
+        self.res = IndexedResource.existing(id="thing_id", name="thing",
+                                            status="ACTIVE")
+
+    @mock.patch.object(IndexedResource, "find")
+    def test_find_remembers_result(self, mock_find):
+        mock_find.return_value = self.res
+
+        self.sot._find(IndexedResource, "thing", parent_id="p")
+        found = self.sot._find(IndexedResource, "thing_id", parent_id="p")
+
+        mock_find.assert_called_once_with(self.session, "thing",
+                                          ignore_missing=False,
+                                          parent_id="p")
+        self.assertIsInstance(found, IndexedResource)
+        self.assertIsNot(self.res, found)
+        self.assertEqual("ACTIVE", found.status)
+        self.assertEqual("p", found.parent_id)
+
+    @mock.patch.object(IndexedResource, "find")
+    def test_find_scoped_by_uri(self, mock_find):
+        mock_find.return_value = self.res
+
+        self.sot._find(IndexedResource, "thing", parent_id="p")
+        self.sot._find(IndexedResource, "thing", parent_id="q")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch.object(IndexedResource, "find")
+    def test_find_with_query_skips_index(self, mock_find):
+        mock_find.return_value = self.res
+
+        self.sot._find(IndexedResource, "thing", parent_id="p")
+        self.sot._find(IndexedResource, "thing", parent_id="p",
+                       status="ACTIVE")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch.object(IndexedResource, "find")
+    @mock.patch.object(IndexedResource, "list")
+    def test_list_fills_index(self, mock_list, mock_find):
+        mock_list.return_value = [self.res]
+
+        list(self.sot._list(IndexedResource, parent_id="p"))
+        found = self.sot._find(IndexedResource, "thing", parent_id="p")
+
+        self.assertEqual("thing_id", found.id)
+        self.assertFalse(mock_find.called)
+
+    @mock.patch.object(IndexedResource, "find")
+    @mock.patch.object(IndexedResource, "get")
+    def test_get_fills_index(self, mock_get, mock_find):
+        mock_get.return_value = self.res
+
+        self.sot._get(IndexedResource, "thing_id")
+        found = self.sot._find(IndexedResource, "thing")
+
+        self.assertEqual("thing_id", found.id)
+        self.assertFalse(mock_find.called)
+
+    @mock.patch.object(IndexedResource, "find")
+    @mock.patch.object(IndexedResource, "list")
+    def test_index_off_by_default(self, mock_list, mock_find):
+        res = mock.Mock(spec=IndexedResource)
+        mock_list.return_value = [res]
+        mock_find.return_value = self.res
+        sot = proxy2.BaseProxy(self.session)
+
+        self.assertEqual([res], list(sot._list(IndexedResource)))
+        sot._find(IndexedResource, "thing")
+        sot._find(IndexedResource, "thing")
+
+        self.assertIsNone(sot._resource_index)
+        self.assertFalse(res.to_dict.called)
+        self.assertEqual(2, mock_find.call_count)
+
+    def _test_invalidated(self, method, *args):
+        with mock.patch.object(IndexedResource, "find") as mock_find:
+            mock_find.return_value = self.res
+            self.sot._find(IndexedResource, "thing")
+            method(IndexedResource, *args)
+            self.sot._find(IndexedResource, "thing")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch.object(IndexedResource, "create")
+    def test_create_invalidates(self, mock_create):
+        self._test_invalidated(self.sot._create)
+
+    @mock.patch.object(IndexedResource, "update")
+    def test_update_invalidates(self, mock_update):
+        self._test_invalidated(self.sot._update, "thing_id")
+
+    @mock.patch.object(IndexedResource, "delete")
+    def test_delete_invalidates(self, mock_delete):
+        mock_delete.side_effect = exceptions.NotFoundException()
+        self._test_invalidated(self.sot._delete, "thing_id", True)
+
+
 class TestProxyHead(testtools.TestCase):
 
     def setUp(self):
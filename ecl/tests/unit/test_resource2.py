@@ -1311,6 +1311,7 @@ class TestResourceFind(base.TestCase):
         value = 1
 
         class Test(resource2.Resource):
+            allow_get = True
 
             @classmethod
             def existing(cls, **kwargs):
@@ -1388,6 +1389,94 @@ class TestResourceFind(base.TestCase):
             resource2.Resource._get_one_match, the_id, [match, match])
 
 
+class TestResourceFindById(base.TestCase):
+
+    UUID = "6f3c5e1e-3d1b-4bb2-9a1a-0a0a8d3f4c11"
+
+    def setUp(self):
+        super(TestResourceFindById, self).setUp()
+        self.session = mock.Mock(spec=session.Session)
+        self.listed = []
+        listed = self.listed
+
+        class Test(resource2.Resource):
+            allow_get = True
+            allow_list = True
+            find_by_id = "uuid"
+            _query_mapping = resource2.QueryParameters("name")
+
+            @classmethod
+            def existing(cls, **kwargs):
+                match = mock.Mock()
+                match.get.side_effect = exceptions.NotFoundException
+                return match
+
+            @classmethod
+            def list(cls, session, **params):
+                listed.append(params)
+                for name in ("a", "b", "b", "c"):
+                    listed.append(name)
+                    yield cls.new(id=name + "-id", name=name)
+
+        self.test_class = Test
+
+    def test_uuid_is_looked_up_directly(self):
+        value = mock.Mock()
+
+        with mock.patch.object(self.test_class, "existing") as existing:
+            existing.return_value.get.return_value = value
+            result = self.test_class.find(self.session, self.UUID)
+
+        self.assertIs(value, result)
+        existing.assert_called_once_with(id=self.UUID)
+        self.assertEqual([], self.listed)
+
+    def test_name_skips_get_and_filters_on_server(self):
+        with mock.patch.object(self.test_class, "existing") as existing:
+            result = self.test_class.find(self.session, "a")
+
+        self.assertEqual("a", result.name)
+        self.assertFalse(existing.called)
+        self.assertEqual({"name": "a"}, self.listed[0])
+
+    def test_missing_uuid_filters_on_server(self):
+        self.assertIsNone(self.test_class.find(self.session, self.UUID,
+                                               ignore_missing=True))
+        self.assertEqual({"name": self.UUID}, self.listed[0])
+
+    def test_stops_at_first_duplicate(self):
+        self.assertRaises(exceptions.DuplicateResource,
+                          self.test_class.find, self.session, "b")
+        self.assertNotIn("c", self.listed)
+
+    def test_without_name_query_lists_everything(self):
+        self.test_class._query_mapping = resource2.QueryParameters()
+
+        result = self.test_class.find(self.session, "c-id")
+
+        self.assertEqual("c", result.name)
+        self.assertEqual({}, self.listed[0])
+
+    def test_find_by_id_disabled(self):
+        self.test_class.find_by_id = False
+
+        with mock.patch.object(self.test_class, "existing") as existing:
+            result = self.test_class.find(self.session, "c-id")
+
+        self.assertEqual("c", result.name)
+        self.assertFalse(existing.called)
+        self.assertEqual({}, self.listed[0])
+
+    def test_get_not_allowed(self):
+        self.test_class.allow_get = False
+
+        with mock.patch.object(self.test_class, "existing") as existing:
+            self.test_class.find(self.session, self.UUID, ignore_missing=True)
+
+        self.assertFalse(existing.called)
+        self.assertEqual({}, self.listed[0])
+
+
 class TestWaitForStatus(base.TestCase):
 
     def test_immediate_status(self):
@@ -0,0 +1,137 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mock
+import testtools
+
+from ecl import sync
+
+
+class TestDeltaSync(testtools.TestCase):
+
+    def setUp(self):
+        super(TestDeltaSync, self).setUp()
+        self.pages = []
+        self.calls = []
+
+        def list_changes(since):
+            self.calls.append(since)
+            return self.pages.pop(0)
+
+        self.sot = sync.DeltaSync(
+            list_changes,
+            key=lambda record: record["id"],
+            changed_at=lambda record: record["updated"],
+            is_deleted=lambda record: record.get("deleted", False))
+
+    def test_full_then_incremental(self):
+        self.pages.append([{"id": "a", "updated": "1"},
+                           {"id": "b", "updated": "3"}])
+        self.pages.append([{"id": "b", "updated": "4"},
+                           {"id": "a", "updated": "5", "deleted": True},
+                           {"id": "c", "updated": "5"}])
+
+        first = self.sot.refresh()
+        second = self.sot.refresh()
+
+        self.assertEqual([None, "3"], self.calls)
+        self.assertEqual(sync.Changes(["a", "b"], [], []), first)
+        self.assertEqual(sync.Changes(["c"], ["b"], ["a"]), second)
+        self.assertEqual("5", self.sot.high_water_mark)
+        self.assertEqual(["b", "c"], sorted(self.sot.keys()))
+        self.assertEqual("4", self.sot.get("b")["updated"])
+
+    def test_no_changes_keeps_mark(self):
+        self.pages.append([{"id": "a", "updated": "1"}])
+        self.pages.append([])
+
+        self.sot.refresh()
+        changes = self.sot.refresh()
+
+        self.assertEqual(sync.Changes([], [], []), changes)
+        self.assertEqual("1", self.sot.high_water_mark)
+        self.assertIn("a", self.sot)
+        self.assertEqual(1, len(self.sot))
+
+    def test_full_refresh_drops_missing(self):
+        self.pages.append([{"id": "a", "updated": "1"},
+                           {"id": "b", "updated": "2"}])
+        self.pages.append([{"id": "b", "updated": "2"}])
+
+        self.sot.refresh()
+        changes = self.sot.refresh(full=True)
+
+        self.assertEqual([None, None], self.calls)
+        # b is listed again unchanged, so it is not reported as updated.
+        self.assertEqual(sync.Changes([], [], ["a"]), changes)
+        self.assertEqual(["b"], [record["id"] for record in self.sot])
+
+
+class TestCollectionCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestCollectionCache, self).setUp()
+        self.pools = [mock.Mock(id="p1")]
+        self.spaces = [mock.Mock(id="s1"), mock.Mock(id="s2")]
+        self.list_pools = mock.Mock(side_effect=lambda: list(self.pools))
+        self.list_spaces = mock.Mock(side_effect=lambda: list(self.spaces))
+        self.sot = sync.CollectionCache({"pools": self.list_pools,
+                                         "spaces": self.list_spaces},
+                                        interval=0.01, concurrency=2)
+        self.addCleanup(self.sot.stop)
+
+    def test_get_lists_once(self):
+        self.assertEqual(self.pools, self.sot.get("pools"))
+        self.assertEqual(self.spaces[1], self.sot.find("spaces", "s2"))
+        self.assertIsNone(self.sot.find("spaces", "s3"))
+
+        self.assertEqual(1, self.list_pools.call_count)
+        self.assertEqual(1, self.list_spaces.call_count)
+        self.assertEqual(sync.Changes(["s1", "s2"], [], []),
+                         self.sot.changes["spaces"])
+
+    def test_refresh_reports_changes(self):
+        self.sot.refresh()
+        self.spaces = [self.spaces[0], mock.Mock(id="s3")]
+        self.pools = []
+
+        changes = self.sot.refresh()
+
+        self.assertEqual(sync.Changes(["s3"], [], ["s2"]), changes["spaces"])
+        self.assertEqual(sync.Changes([], [], ["p1"]), changes["pools"])
+        self.assertIs(changes, self.sot.changes)
+
+    def test_failed_listing_keeps_contents(self):
+        self.sot.refresh()
+        self.list_pools.side_effect = ValueError("boom")
+
+        self.assertRaises(ValueError, self.sot.refresh)
+        self.assertEqual(self.pools, self.sot.get("pools"))
+        self.assertEqual(sync.Changes([], [], []), self.sot.changes["pools"])
+
+    def test_background_refresh(self):
+        refreshed = threading.Event()
+
+        def list_spaces():
+            if self.list_spaces.call_count >= 2:
+                refreshed.set()
+            return list(self.spaces)
+
+        self.list_spaces.side_effect = list_spaces
+        self.sot.start()
+
+        self.assertTrue(refreshed.wait(5))
+        self.sot.stop()
+        self.assertIsNone(self.sot._thread)
+        self.assertIsNone(self.sot.last_error)
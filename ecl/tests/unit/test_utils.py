@@ -88,3 +88,18 @@ class Test_urljoin(testtools.TestCase):
 
         result = utils.urljoin(root, *leaves)
         self.assertEqual(result, "http://www.example.com/foo/")
+
+
+class Test_is_uuid_like(testtools.TestCase):
+
+    def test_uuid(self):
+        self.assertTrue(
+            utils.is_uuid_like("a2d8f1e2-3b4c-4d5e-8f90-1a2b3c4d5e6f"))
+        self.assertTrue(
+            utils.is_uuid_like("A2D8F1E23B4C4D5E8F901A2B3C4D5E6F"))
+
+    def test_not_uuid(self):
+        self.assertFalse(utils.is_uuid_like("my-image"))
+        self.assertFalse(utils.is_uuid_like(None))
+        self.assertFalse(utils.is_uuid_like(
+            "{a2d8f1e2-3b4c-4d5e-8f90-1a2b3c4d5e6f}"))
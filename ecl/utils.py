@@ -11,6 +11,7 @@
 # under the License.
 
 import logging
+import uuid
 
 
 def enable_logging(debug=False, path=None, stream=None):
@@ -68,3 +69,17 @@ def urljoin(*args):
     link. We generally won't care about that in client.
     """
     return '/'.join(str(a or '').strip('/') for a in args)
+
+
+def is_uuid_like(value):
+    """Return True if value looks like a UUID
+
+    Both the hyphenated and the bare 32 hex digit forms are accepted,
+    in any case. This is used to decide whether a ``name_or_id`` is worth
+    a direct GET by ID.
+    """
+    try:
+        value = str(value).lower().replace('-', '')
+        return str(uuid.UUID(value)).replace('-', '') == value
+    except (TypeError, ValueError, UnicodeError):
+        return False